@@ -27,8 +27,17 @@ class TranslatorWithHistory(TypeChatJsonTranslator[T]):
         self._additional_agent_instructions = additional_agent_instructions
 
     @override
-    async def translate(self, input: str, *, prompt_preamble: str | list[PromptSection] | None = None) -> Result[T]:
-        result = await super().translate(input=input, prompt_preamble=prompt_preamble)
+    async def translate(
+        self,
+        input: str,
+        *,
+        prompt_preamble: str | list[PromptSection] | None = None,
+        timeout_seconds: float | None = None,
+        deadline: float | None = None,
+    ) -> Result[T]:
+        result = await super().translate(
+            input=input, prompt_preamble=prompt_preamble, timeout_seconds=timeout_seconds, deadline=deadline
+        )
         if not isinstance(result, Failure):
             self._chat_history.append(ChatMessage(source="assistant", body=result.value))
         return result
@@ -2,24 +2,78 @@
 #
 # SPDX-License-Identifier: MIT
 
-from typechat._internal.model import PromptSection, TypeChatLanguageModel, create_language_model, create_openai_language_model, create_azure_openai_language_model
+from typechat._internal.admission import AdmissionControlledLanguageModel, AdmissionQueue, AdmissionStats, AdmissionTimeoutFailure
+from typechat._internal.cache import CacheStats, LRUTranslationCache, SqliteTranslationCache, TranslationCache
+from typechat._internal.circuit_breaker import CircuitBreakerLanguageModel, CircuitOpenFailure
+from typechat._internal.hedging import HedgedLanguageModel, HedgingStats
+from typechat._internal.http_client import HttpClientOptions, close_shared_clients, get_shared_client
+from typechat._internal.load_balancing import LanguageModelEndpoint, LoadBalancedLanguageModel
+from typechat._internal.local_repair import LenientJsonRepair, LocalRepairStats, LocalRepairStrategy
+from typechat._internal.model import CompletionOptions, HttpStatusFailure, PromptSection, TypeChatLanguageModel, TypeChatMultiChoiceLanguageModel, TypeChatStreamingLanguageModel, create_language_model, create_openai_language_model, create_azure_openai_language_model, current_deadline
+from typechat._internal.rate_limit import TokenBucketRateLimiter
+from typechat._internal.precompiled import compile_schema, load_compiled_schema
 from typechat._internal.result import Failure, Result, Success
+from typechat._internal.retry import ExponentialBackoffRetryPolicy, RetryPolicy
+from typechat._internal.single_flight import SingleFlight
+from typechat._internal.tracing import OpenTelemetryTracer, Span, Tracer, get_tracer, set_tracer
 from typechat._internal.translator import TypeChatJsonTranslator
-from typechat._internal.ts_conversion import python_type_to_typescript_schema
+from typechat._internal.ts_conversion import TypeScriptEmitOptions, python_type_to_typescript_schema
+from typechat._internal.type_cache import clear_type_caches, type_cache_stats
+from typechat._internal.usage import CompletionUsage
 from typechat._internal.validator import TypeChatValidator
 from typechat._internal.interactive import process_requests
 
 __all__ = [
     "TypeChatLanguageModel",
+    "TypeChatStreamingLanguageModel",
+    "TypeChatMultiChoiceLanguageModel",
     "TypeChatJsonTranslator",
     "TypeChatValidator",
     "Success",
     "Failure",
     "Result",
     "python_type_to_typescript_schema",
+    "TypeScriptEmitOptions",
     "PromptSection",
+    "CompletionOptions",
     "create_language_model",
     "create_openai_language_model",
     "create_azure_openai_language_model",
     "process_requests",
+    "TokenBucketRateLimiter",
+    "RetryPolicy",
+    "ExponentialBackoffRetryPolicy",
+    "TranslationCache",
+    "LRUTranslationCache",
+    "SqliteTranslationCache",
+    "CacheStats",
+    "SingleFlight",
+    "clear_type_caches",
+    "type_cache_stats",
+    "compile_schema",
+    "load_compiled_schema",
+    "LocalRepairStrategy",
+    "LenientJsonRepair",
+    "LocalRepairStats",
+    "HedgedLanguageModel",
+    "HedgingStats",
+    "HttpStatusFailure",
+    "LanguageModelEndpoint",
+    "LoadBalancedLanguageModel",
+    "CircuitBreakerLanguageModel",
+    "CircuitOpenFailure",
+    "HttpClientOptions",
+    "get_shared_client",
+    "close_shared_clients",
+    "AdmissionQueue",
+    "AdmissionStats",
+    "AdmissionControlledLanguageModel",
+    "AdmissionTimeoutFailure",
+    "current_deadline",
+    "CompletionUsage",
+    "Tracer",
+    "Span",
+    "set_tracer",
+    "get_tracer",
+    "OpenTelemetryTracer",
 ]
@@ -0,0 +1,149 @@
+import asyncio
+from dataclasses import dataclass
+import heapq
+import itertools
+import time
+from typing_extensions import Iterator, override
+
+from typechat._internal.model import CompletionOptions, PromptSection, TypeChatLanguageModel, complete_with_options
+from typechat._internal.result import Failure, Result
+
+@dataclass
+class AdmissionStats:
+    "Counts the requests that have gone through an `AdmissionQueue`, and how long they waited."
+
+    admitted: int = 0
+    timed_out: int = 0
+    "Requests that gave up after waiting longer than their maximum wait."
+    total_wait_seconds: float = 0.0
+    "The total time admitted requests spent waiting for a slot."
+    max_wait_seconds: float = 0.0
+    "The longest time an admitted request spent waiting for a slot."
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.admitted if self.admitted else 0.0
+
+@dataclass
+class AdmissionTimeoutFailure(Failure):
+    "A failure returned without calling the model, because no slot in an `AdmissionQueue` became free in time."
+    waited_seconds: float
+
+class AdmissionQueue:
+    """
+    Caps the number of requests in flight, queueing the rest by priority.
+
+    A queue is meant to be shared by all the `AdmissionControlledLanguageModel`s wrapping one model (or one provider
+    quota). When a slot frees up, it goes to the waiting request with the lowest priority number, and among requests
+    of equal priority to the one that has waited longest - so interactive requests (e.g. priority 0) overtake a
+    backlog of batch requests (e.g. priority 10), without reordering either.
+    """
+
+    max_concurrency: int
+    stats: AdmissionStats
+    _in_flight: int
+    _waiters: list[tuple[int, int, asyncio.Future[None]]]
+    _sequence: Iterator[int]
+
+    def __init__(self, max_concurrency: int):
+        super().__init__()
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self.stats = AdmissionStats()
+        self._in_flight = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        "The number of requests currently admitted."
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        "The number of requests currently waiting for a slot."
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = 0, max_wait_seconds: float | None = None) -> bool:
+        """
+        Waits for a slot, returning `True` once one is taken, or `False` if none became free within `max_wait_seconds`.
+        Every successful `acquire` must be followed by a `release`.
+        """
+        started_at = time.monotonic()
+        if self._in_flight < self.max_concurrency and self.queued == 0:
+            self._in_flight += 1
+            self._record_wait(0.0)
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            async with asyncio.timeout(max_wait_seconds):
+                await future
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # A slot was handed over just as the wait ended; pass it on.
+                self.release()
+            else:
+                future.cancel()
+            if isinstance(e, TimeoutError):
+                self.stats.timed_out += 1
+                return False
+            raise
+        self._record_wait(time.monotonic() - started_at)
+        return True
+
+    def release(self) -> None:
+        "Frees a slot taken by `acquire`, handing it straight to the next waiting request, if any."
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def _record_wait(self, wait_seconds: float) -> None:
+        self.stats.admitted += 1
+        self.stats.total_wait_seconds += wait_seconds
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, wait_seconds)
+
+class AdmissionControlledLanguageModel(TypeChatLanguageModel):
+    """
+    Wraps a language model so that its completions go through an `AdmissionQueue` at a given priority.
+
+    To let batch and interactive workloads share a model, give each its own wrapper around the same model and queue:
+
+    ```
+    queue = AdmissionQueue(max_concurrency=16)
+    interactive_model = AdmissionControlledLanguageModel(model, queue, priority=0)
+    batch_model = AdmissionControlledLanguageModel(model, queue, priority=10)
+    ```
+    """
+
+    model: TypeChatLanguageModel
+    queue: AdmissionQueue
+    priority: int
+    # Specifies the maximum time in seconds to wait for a slot before failing with an `AdmissionTimeoutFailure`.
+    # If not set, completions wait as long as it takes.
+    max_wait_seconds: float | None = None
+
+    def __init__(self, model: TypeChatLanguageModel, queue: AdmissionQueue, *, priority: int = 0):
+        super().__init__()
+        self.model = model
+        self.queue = queue
+        self.priority = priority
+
+    @override
+    async def complete(self, prompt: str | list[PromptSection], *, options: CompletionOptions | None = None) -> Result[str]:
+        started_at = time.monotonic()
+        if not await self.queue.acquire(self.priority, self.max_wait_seconds):
+            waited_seconds = time.monotonic() - started_at
+            return AdmissionTimeoutFailure(
+                f"No request slot became free within {waited_seconds:.1f}s; the model was not called.",
+                waited_seconds,
+            )
+        try:
+            return await complete_with_options(self.model, prompt, options)
+        finally:
+            self.queue.release()
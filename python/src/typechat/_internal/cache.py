@@ -0,0 +1,166 @@
+from collections import OrderedDict
+import copy
+from dataclasses import dataclass
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from typing_extensions import Any, Protocol, override
+
+from typechat._internal.result import Success
+
+_logger = logging.getLogger("typechat")
+
+# The errors `pickle` raises for values it can't handle, such as instances of classes defined inside a function
+# or created at runtime (e.g. with `dataclasses.make_dataclass`).
+_PICKLING_ERRORS = (pickle.PicklingError, AttributeError, TypeError)
+# The errors raised when loading values whose classes can no longer be found.
+_UNPICKLING_ERRORS = (pickle.UnpicklingError, AttributeError, ImportError)
+
+@dataclass
+class CacheStats:
+    "Counts lookups made against a cache."
+
+    hits: int = 0
+    misses: int = 0
+
+class TranslationCache(Protocol):
+    """
+    Stores validated translation results by key. `TypeChatJsonTranslator` uses a cache (when one is configured)
+    to answer repeated requests without calling the language model or re-validating the response.
+    """
+
+    stats: CacheStats
+
+    def get(self, key: str) -> Success[Any] | None:
+        "Returns the result stored under `key`, or `None` if there is no (unexpired) entry for it."
+        ...
+
+    def set(self, key: str, value: Success[Any]) -> None:
+        "Stores `value` under `key`, replacing any existing entry."
+        ...
+
+class LRUTranslationCache(TranslationCache):
+    """
+    An in-process cache that evicts the least recently used entry once it holds `max_entries` entries.
+    Entries older than `ttl_seconds` are treated as missing.
+
+    If a `backend` cache is given (e.g. a `SqliteTranslationCache`), entries are written through to it,
+    and misses fall back to it, so results survive process restarts while hot entries stay in memory.
+
+    Values are stored as deep copies, and each hit returns a fresh copy, so callers that modify
+    a result they were given don't affect later hits.
+    """
+
+    stats: CacheStats
+    max_entries: int
+    ttl_seconds: float | None
+    backend: TranslationCache | None
+    _entries: OrderedDict[str, tuple[float, Any]]
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float | None = None, backend: TranslationCache | None = None):
+        super().__init__()
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.stats = CacheStats()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self._entries = OrderedDict()
+
+    @override
+    def get(self, key: str) -> Success[Any] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, snapshot = entry
+            if self.ttl_seconds is None or time.monotonic() - stored_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return Success(copy.deepcopy(snapshot))
+            del self._entries[key]
+
+        if self.backend is not None:
+            backend_value = self.backend.get(key)
+            if backend_value is not None:
+                self._store(key, backend_value)
+                self.stats.hits += 1
+                return backend_value
+
+        self.stats.misses += 1
+        return None
+
+    @override
+    def set(self, key: str, value: Success[Any]) -> None:
+        self._store(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def clear(self) -> None:
+        "Removes all in-memory entries. Entries in the backend are kept."
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: str, value: Success[Any]) -> None:
+        self._entries[key] = (time.monotonic(), copy.deepcopy(value.value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+class SqliteTranslationCache(TranslationCache):
+    """
+    A persistent cache stored in a SQLite database file. Entries older than `ttl_seconds` are treated as missing.
+
+    Values are stored with `pickle`, so the database file must only ever be written by trusted code.
+    Values that can't be pickled (such as instances of classes defined inside a function) are not cached,
+    and entries that can no longer be loaded are treated as missing; both are logged to the "typechat" logger.
+    Lookups are synchronous, which is fine for a local file but should not be pointed at slow network storage.
+    """
+
+    stats: CacheStats
+    ttl_seconds: float | None
+    _connection: sqlite3.Connection
+
+    def __init__(self, path: str | os.PathLike[str], ttl_seconds: float | None = None):
+        super().__init__()
+        self.stats = CacheStats()
+        self.ttl_seconds = ttl_seconds
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    @override
+    def get(self, key: str) -> Success[Any] | None:
+        row = self._connection.execute("SELECT value, stored_at FROM translations WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            value, stored_at = row
+            if self.ttl_seconds is None or time.time() - stored_at < self.ttl_seconds:
+                try:
+                    loaded = pickle.loads(value)  # noqa: S301
+                except _UNPICKLING_ERRORS as e:
+                    _logger.warning("Ignoring cached translation %r that can't be loaded: %s", key, e)
+                else:
+                    self.stats.hits += 1
+                    return Success(loaded)
+        self.stats.misses += 1
+        return None
+
+    @override
+    def set(self, key: str, value: Success[Any]) -> None:
+        try:
+            pickled = pickle.dumps(value.value)
+        except _PICKLING_ERRORS as e:
+            _logger.warning("Not caching translation %r, since its value can't be pickled: %s", key, e)
+            return
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO translations (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, pickled, time.time()),
+            )
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,117 @@
+from collections import deque
+from dataclasses import dataclass
+import time
+from typing_extensions import Literal, override
+
+from typechat._internal.model import CompletionOptions, PromptSection, TypeChatLanguageModel, complete_with_options, is_transient_failure
+from typechat._internal.result import Failure, Result
+
+@dataclass
+class CircuitOpenFailure(Failure):
+    "A failure returned without calling the model, because a `CircuitBreakerLanguageModel`'s circuit is open."
+    retry_after_seconds: float
+    "How long until the circuit lets a trial request through."
+
+class CircuitBreakerLanguageModel(TypeChatLanguageModel):
+    """
+    Wraps a language model to fail fast while it is failing.
+
+    The circuit starts out closed, passing every request on to the model. Once at least `minimum_calls` requests
+    have completed within the last `window_seconds`, and at least `failure_rate_threshold` of them failed, the circuit
+    opens: requests fail immediately with a `CircuitOpenFailure` instead of waiting on retries and timeouts. After
+    `open_seconds`, the circuit is half-open: up to `half_open_max_calls` trial requests are let through at a time
+    (others still fail fast). If `half_open_max_calls` trial requests in a row succeed, the circuit closes again;
+    if any fails, it opens again.
+
+    Only failures that say something about the model's health count - not error responses blaming the request (4xx).
+    """
+
+    model: TypeChatLanguageModel
+    # Specifies the fraction of recent requests (between 0 and 1) that must fail for the circuit to open.
+    failure_rate_threshold: float = 0.5
+    # Specifies the number of recent requests needed before the failure rate is acted on.
+    minimum_calls: int = 10
+    # Specifies how far back, in seconds, requests count towards the failure rate.
+    window_seconds: float = 60.0
+    # Specifies how long, in seconds, the circuit stays open before letting trial requests through.
+    open_seconds: float = 30.0
+    # Specifies how many trial requests are let through at a time while half-open, and how many must succeed to close.
+    half_open_max_calls: int = 1
+    _outcomes: deque[tuple[float, bool]]
+    _opened_at: float | None
+    _trial_calls: int
+    _trial_successes: int
+
+    def __init__(self, model: TypeChatLanguageModel):
+        super().__init__()
+        self.model = model
+        self._outcomes = deque()
+        self._opened_at = None
+        self._trial_calls = 0
+        self._trial_successes = 0
+
+    @property
+    def state(self) -> Literal["closed", "open", "half_open"]:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.open_seconds:
+            return "open"
+        return "half_open"
+
+    @override
+    async def complete(self, prompt: str | list[PromptSection], *, options: CompletionOptions | None = None) -> Result[str]:
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_calls >= self.half_open_max_calls):
+            assert self._opened_at is not None
+            retry_after_seconds = max(self._opened_at + self.open_seconds - time.monotonic(), 0.0)
+            return CircuitOpenFailure(
+                f"The circuit is open after repeated failures; the model was not called. Retry in {retry_after_seconds:.1f}s.",
+                retry_after_seconds,
+            )
+
+        is_trial = state == "half_open"
+        if is_trial:
+            self._trial_calls += 1
+        try:
+            result = await complete_with_options(self.model, prompt, options)
+        except BaseException:
+            if is_trial:
+                self._trial_calls -= 1
+            raise
+
+        failed = isinstance(result, Failure) and is_transient_failure(result)
+        if is_trial:
+            self._trial_calls -= 1
+            self._record_trial(failed)
+        elif self._opened_at is None:
+            self._record(failed)
+        return result
+
+    def _record(self, failed: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, failed))
+        while self._outcomes and self._outcomes[0][0] <= now - self.window_seconds:
+            self._outcomes.popleft()
+        if len(self._outcomes) < self.minimum_calls:
+            return
+        failures = sum(1 for _, outcome_failed in self._outcomes if outcome_failed)
+        if failures >= self.failure_rate_threshold * len(self._outcomes):
+            self._open()
+
+    def _record_trial(self, failed: bool) -> None:
+        if self.state != "half_open":
+            # Another trial request has already closed (or reopened) the circuit.
+            return
+        if failed:
+            self._open()
+            return
+        self._trial_successes += 1
+        if self._trial_successes >= self.half_open_max_calls:
+            self._opened_at = None
+            self._outcomes.clear()
+            self._trial_successes = 0
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._trial_successes = 0
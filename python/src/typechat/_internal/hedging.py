@@ -0,0 +1,107 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import math
+import time
+from typing_extensions import override
+
+from typechat._internal.model import CompletionOptions, PromptSection, TypeChatLanguageModel, complete_with_options
+from typechat._internal.result import Failure, Result, Success
+
+@dataclass
+class HedgingStats:
+    "Counts the requests made by a `HedgedLanguageModel`."
+
+    requests: int = 0
+    hedged_requests: int = 0
+    "Requests for which at least one duplicate was sent."
+    hedge_wins: int = 0
+    "Requests answered by a duplicate rather than by the original."
+
+class HedgedLanguageModel(TypeChatLanguageModel):
+    """
+    Wraps a language model to cut down on tail latency. If a completion hasn't finished within the `hedge_percentile`
+    latency of recent completions, a duplicate request is sent, and whichever finishes first with a `Success` is used.
+    Requests still in flight at that point are cancelled.
+
+    Hedging spends extra requests on the slowest few percent of completions: with the default percentile of 95,
+    about one request in twenty is duplicated.
+    """
+
+    model: TypeChatLanguageModel
+    stats: HedgingStats
+    # Specifies the percentile of recent completion latencies after which a duplicate request is sent.
+    hedge_percentile: float = 95.0
+    # Specifies the delay in seconds before sending a duplicate request, until enough latencies have been observed.
+    initial_hedge_delay_seconds: float = 2.0
+    # Specifies the number of latencies to observe before using `hedge_percentile`.
+    min_samples: int = 20
+    # Specifies how many recent latencies are kept.
+    window_size: int = 500
+    # Specifies the maximum number of duplicates sent for a single completion.
+    max_hedges: int = 1
+    _latencies: deque[float]
+    _sorted_latencies: list[float] | None
+
+    def __init__(self, model: TypeChatLanguageModel):
+        super().__init__()
+        self.model = model
+        self.stats = HedgingStats()
+        self._latencies = deque()
+        self._sorted_latencies = None
+
+    @property
+    def hedge_delay_seconds(self) -> float:
+        "The current delay before a duplicate request is sent."
+        if len(self._latencies) < self.min_samples:
+            return self.initial_hedge_delay_seconds
+        if self._sorted_latencies is None:
+            self._sorted_latencies = sorted(self._latencies)
+        rank = math.ceil(self.hedge_percentile / 100 * len(self._sorted_latencies)) - 1
+        return self._sorted_latencies[min(max(rank, 0), len(self._sorted_latencies) - 1)]
+
+    @override
+    async def complete(self, prompt: str | list[PromptSection], *, options: CompletionOptions | None = None) -> Result[str]:
+        self.stats.requests += 1
+        started_at: dict[asyncio.Task[Result[str]], float] = {}
+
+        def send() -> None:
+            task = asyncio.create_task(complete_with_options(self.model, prompt, options))
+            started_at[task] = time.monotonic()
+
+        send()
+        original = next(iter(started_at))
+        pending = set(started_at)
+        first_failure: Failure | None = None
+        try:
+            while pending:
+                hedges_sent = len(started_at) - 1
+                timeout = self.hedge_delay_seconds if hedges_sent < self.max_hedges else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if hedges_sent == 0:
+                        self.stats.hedged_requests += 1
+                    send()
+                    pending = {task for task in started_at if not task.done()}
+                    continue
+                for task in done:
+                    result = task.result()
+                    if isinstance(result, Success):
+                        self._record_latency(time.monotonic() - started_at[task])
+                        if task is not original:
+                            self.stats.hedge_wins += 1
+                        return result
+                    first_failure = first_failure or result
+        finally:
+            for task in started_at:
+                task.cancel()
+            await asyncio.gather(*started_at, return_exceptions=True)
+
+        assert first_failure is not None
+        return first_failure
+
+    def _record_latency(self, latency_seconds: float) -> None:
+        self._latencies.append(latency_seconds)
+        while len(self._latencies) > self.window_size:
+            self._latencies.popleft()
+        self._sorted_latencies = None
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+
+import httpx
+
+@dataclass(frozen=True)
+class HttpClientOptions:
+    """
+    Connection pool settings for the `httpx.AsyncClient` used by `HttpxLanguageModel`. The defaults match httpx's.
+
+    Models built with the same options can share one client (see `get_shared_client`), so that they draw from one
+    pool of warm connections instead of each opening (and TLS-handshaking) their own.
+    """
+
+    max_connections: int | None = 100
+    "The maximum number of concurrent connections, or `None` for no limit."
+
+    max_keepalive_connections: int | None = 20
+    "The maximum number of idle connections kept open for reuse, or `None` for no limit."
+
+    keepalive_expiry_seconds: float | None = 5.0
+    "How long an idle connection is kept open for reuse, or `None` to keep it open indefinitely."
+
+    http2: bool = False
+    """
+    Whether to multiplex requests over HTTP/2 connections where the server supports it.
+    Requires the `h2` package (installed with the `typechat[http2]` extra).
+    """
+
+    def create_client(self) -> httpx.AsyncClient:
+        "Creates a new client with these settings."
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+        return httpx.AsyncClient(limits=limits, http2=self.http2)
+
+DEFAULT_HTTP_CLIENT_OPTIONS = HttpClientOptions()
+
+_shared_clients: dict[HttpClientOptions, httpx.AsyncClient] = {}
+
+def get_shared_client(options: HttpClientOptions = DEFAULT_HTTP_CLIENT_OPTIONS) -> httpx.AsyncClient:
+    """
+    Returns the process-wide client for the given options, creating it on first use.
+
+    Models don't close a client they were given, so shared clients stay open until `close_shared_clients` is called
+    (typically when the application shuts down). Like any `httpx.AsyncClient`, a shared client should only be used
+    from one event loop.
+    """
+    client = _shared_clients.get(options)
+    if client is None or client.is_closed:
+        client = _shared_clients[options] = options.create_client()
+    return client
+
+async def close_shared_clients() -> None:
+    "Closes all clients created by `get_shared_client`."
+    clients = list(_shared_clients.values())
+    _shared_clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,293 @@
+import collections.abc
+from dataclasses import dataclass
+import re
+from typing_extensions import get_origin
+
+# Characters that can change the scanner's state outside of and inside of JSON strings.
+_STRUCTURAL_CHARS = re.compile(r'[{}\[\]"]')
+_STRING_CHARS = re.compile(r'["\\]')
+# Inside the top-level object, and inside arrays directly within it, separators delimit the parts of interest.
+_STRUCTURAL_OR_SEPARATOR_CHARS = re.compile(r'[{}\[\]":,]')
+# A brace only starts a plausible JSON object if it is followed by a key or closes immediately,
+# which rules out things like `{placeholders}` and code in prose.
+_PLAUSIBLE_OBJECT_START = re.compile(r'\{\s*["}]')
+_PLAUSIBLE_ARRAY_START = re.compile(r'\[\s*[-\d"{\[\]tfn]')
+# The same, for JSON5-style values: keys may be single-quoted or unquoted (but must then be followed by a colon),
+# and comments may come first.
+_LENIENT_OBJECT_START = re.compile(r"""\{\s*(?:["'}]|[A-Za-z_$][\w$]*\s*:|//|/\*)""")
+_LENIENT_ARRAY_START = re.compile(r"""\[\s*(?:[-+.\d"'{\[\]]|(?:true|false|null|True|False|None)\b|//|/\*)""")
+_WHITESPACE = re.compile(r"\s*")
+
+@dataclass
+class JsonPropertySpan:
+    """
+    The location of a completed property of the top-level object, or of a completed element of an array that is
+    the value of such a property. Offsets are relative to the start of all text fed to the scanner.
+    """
+
+    key_start: int
+    "The offset of the start of the property's key (possibly preceded by whitespace)."
+
+    key_end: int
+    "The offset of the colon following the property's key."
+
+    value_start: int
+    "The offset of the start of the value or array element (possibly preceded by whitespace)."
+
+    value_end: int
+    "The offset just past the end of the value or array element (possibly followed by whitespace)."
+
+    element_index: int | None = None
+    "For an array element, its index within the array; otherwise `None`."
+
+class IncrementalJsonScanner:
+    """
+    Finds the first complete top-level JSON object (or, if `allow_arrays` is set, object or array) in text that
+    arrives in pieces (e.g. a streamed completion).
+
+    Like `find_json_value`, the scanner skips brackets that can't start a JSON value, such as `{placeholders}` in
+    prose. It tracks string, escape and nesting state, so braces inside strings are ignored and the end of the
+    object is detected as soon as its closing brace arrives. Each piece of text is scanned exactly once, so the
+    total work is linear in the length of the text however it is split. The scanner locates JSON; it does not validate it.
+    Unlike `find_json_value`, it doesn't prefer a value in a fenced code block, since it can't know one will follow.
+
+    As the object arrives, the scanner also records the span of each completed top-level property (and of each
+    completed element of an array that is a top-level property's value) in `completed_spans`, so that they can
+    be checked before the rest of the object has been received.
+    """
+
+    allow_arrays: bool
+    "Whether a top-level array is looked for as well as an object."
+
+    start: int | None
+    "The offset of the value's opening bracket, once one has been seen."
+
+    end: int | None
+    "The offset just past the value's closing bracket, once the value is complete."
+
+    completed_spans: list[JsonPropertySpan]
+    "The spans of properties and array elements completed so far, in the order they were completed."
+
+    _offset: int
+    _pending: str
+    _containers: list[str]
+    _in_string: bool
+    _escaped: bool
+    _key_start: int
+    _key_end: int | None
+    _value_start: int
+    _element_start: int
+    _element_index: int
+
+    def __init__(self, *, allow_arrays: bool = False) -> None:
+        super().__init__()
+        self.allow_arrays = allow_arrays
+        self.start = None
+        self.end = None
+        self.completed_spans = []
+        self._offset = 0
+        self._pending = ""
+        self._containers = []
+        self._in_string = False
+        self._escaped = False
+        self._key_start = 0
+        self._key_end = None
+        self._value_start = 0
+        self._element_start = 0
+        self._element_index = 0
+
+    @property
+    def is_complete(self) -> bool:
+        return self.end is not None
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Scans the next piece of text. Returns `True` once the first top-level value is complete,
+        after which further text is ignored.
+        """
+        if self.end is not None:
+            return True
+        offset = self._offset
+        self._offset += len(chunk)
+        position = 0
+
+        if self.start is None:
+            # A bracket at the end of the text received so far is kept until it can be told whether it starts a value.
+            chunk = self._pending + chunk
+            offset -= len(self._pending)
+            candidate = _find_plausible_start(chunk, 0, len(chunk), self.allow_arrays, partial=True)
+            if candidate is None or _WHITESPACE.fullmatch(chunk, candidate + 1) is not None:
+                self._pending = "" if candidate is None else chunk[candidate:]
+                return False
+            self._pending = ""
+            position = candidate
+            self.start = offset + position
+            self._containers.append(chunk[position])
+            position += 1
+            self._key_start = offset + position
+
+        containers = self._containers
+        while position < len(chunk):
+            if self._escaped:
+                self._escaped = False
+                position += 1
+                continue
+
+            if self._in_string:
+                match = _STRING_CHARS.search(chunk, position)
+                if match is None:
+                    break
+                position = match.end()
+                if match.group() == "\\":
+                    self._escaped = True
+                else:
+                    self._in_string = False
+                continue
+
+            in_top_level_property = len(containers) == 1 and containers[0] == "{"
+            in_top_level_array = len(containers) == 2 and containers[0] == "{" and containers[1] == "["
+            pattern = _STRUCTURAL_OR_SEPARATOR_CHARS if in_top_level_property or in_top_level_array else _STRUCTURAL_CHARS
+            match = pattern.search(chunk, position)
+            if match is None:
+                break
+            char = match.group()
+            char_offset = offset + match.start()
+            position = match.end()
+
+            if char == '"':
+                self._in_string = True
+            elif char == ":":
+                if in_top_level_property and self._key_end is None:
+                    self._key_end = char_offset
+                    self._value_start = char_offset + 1
+            elif char == ",":
+                if in_top_level_property:
+                    self._complete_property(char_offset)
+                    self._key_start = char_offset + 1
+                else:
+                    self._complete_element(char_offset)
+                    self._element_start = char_offset + 1
+            elif char in "{[":
+                containers.append(char)
+                if in_top_level_property and char == "[":
+                    self._element_start = char_offset + 1
+                    self._element_index = 0
+            else:
+                if in_top_level_property:
+                    self._complete_property(char_offset)
+                elif in_top_level_array:
+                    self._complete_element(char_offset)
+                containers.pop()
+                if not containers:
+                    self.end = char_offset + 1
+                    break
+
+        return self.end is not None
+
+    def _complete_property(self, value_end: int) -> None:
+        if self._key_end is not None:
+            self.completed_spans.append(JsonPropertySpan(self._key_start, self._key_end, self._value_start, value_end))
+        self._key_end = None
+
+    def _complete_element(self, element_end: int) -> None:
+        # An empty array doesn't have an element to complete.
+        if self._key_end is not None and element_end > self._element_start:
+            self.completed_spans.append(
+                JsonPropertySpan(self._key_start, self._key_end, self._element_start, element_end, self._element_index)
+            )
+        self._element_index += 1
+
+# An opening fence of a Markdown code block that is marked as (or may be) JSON.
+_JSON_FENCE = re.compile(r"```[ \t]*(?:json5?|JSON)?[ \t]*\r?\n")
+_BRACKET_OR_QUOTE_CHARS = re.compile(r'[{}\[\]"]')
+
+def expects_json_array(target_type: object) -> bool:
+    "Determines whether JSON data for a type is an array, so that responses should be searched for arrays."
+    target_type = getattr(target_type, "__value__", target_type)
+    origin = get_origin(target_type) or target_type
+    return origin in (list, tuple, set, frozenset) or (
+        isinstance(origin, type) and issubclass(origin, collections.abc.Sequence) and not issubclass(origin, str)
+    )
+
+def find_json_value(text: str, *, allow_arrays: bool = False, lenient: bool = False) -> tuple[int, int] | None:
+    """
+    Locates the first complete top-level JSON object (or, if `allow_arrays` is set, object or array) in text such as
+    a language model response. If the text contains a fenced ```json code block with a JSON value in it, that value
+    is preferred.
+
+    Returns the offsets of the start and end of the value, or `None` if the text contains nothing resembling JSON.
+    A value that is never closed extends to the end of the text. The value's offsets are found in a single pass,
+    tracking string and escape state so that brackets inside strings are ignored. The value is not validated.
+
+    If `lenient` is set, values written in JSON5 style (e.g. with unquoted keys) are recognized as well. Their end
+    is found as for JSON, so it can be wrong if a single-quoted string contains brackets.
+    """
+    fence_match = _JSON_FENCE.search(text)
+    if fence_match is not None:
+        fence_end = text.find("```", fence_match.end())
+        if fence_end < 0:
+            fence_end = len(text)
+        span = _find_json_value_in(text, fence_match.end(), fence_end, allow_arrays, lenient)
+        if span is not None:
+            return span
+    return _find_json_value_in(text, 0, len(text), allow_arrays, lenient)
+
+def _find_json_value_in(text: str, start: int, end: int, allow_arrays: bool, lenient: bool) -> tuple[int, int] | None:
+    value_start = _find_plausible_start(text, start, end, allow_arrays, lenient=lenient)
+    if value_start is None:
+        return None
+    return value_start, _find_value_end(text, value_start, end)
+
+def _find_plausible_start(
+    text: str, start: int, end: int, allow_arrays: bool, *, lenient: bool = False, partial: bool = False
+) -> int | None:
+    """
+    Returns the offset of the first bracket between `start` and `end` that plausibly starts a JSON value, or `None`.
+    If `partial` is set, more text may follow, so a bracket followed only by whitespace is returned too.
+    """
+    object_pattern = _LENIENT_OBJECT_START if lenient else _PLAUSIBLE_OBJECT_START
+    array_pattern = _LENIENT_ARRAY_START if lenient else _PLAUSIBLE_ARRAY_START
+    # The next brace and the next bracket are each searched for again only once passed, so the search is linear.
+    object_start = text.find("{", start, end)
+    array_start = text.find("[", start, end) if allow_arrays else -1
+    while object_start >= 0 or array_start >= 0:
+        is_object = array_start < 0 or 0 <= object_start < array_start
+        candidate = object_start if is_object else array_start
+        pattern = object_pattern if is_object else array_pattern
+        if pattern.match(text, candidate, end) is not None:
+            return candidate
+        if partial and _WHITESPACE.fullmatch(text, candidate + 1, end) is not None:
+            return candidate
+        if is_object:
+            object_start = text.find("{", candidate + 1, end)
+        else:
+            array_start = text.find("[", candidate + 1, end)
+    return None
+
+def _find_value_end(text: str, start: int, end: int) -> int:
+    "Returns the offset just past the bracket closing the one at `start`, or `end` if it is never closed."
+    depth = 0
+    position = start
+    while position < end:
+        match = _BRACKET_OR_QUOTE_CHARS.search(text, position, end)
+        if match is None:
+            break
+        char = match.group()
+        position = match.end()
+        if char == '"':
+            # Skip to the end of the string.
+            while True:
+                string_match = _STRING_CHARS.search(text, position, end)
+                if string_match is None:
+                    return end
+                position = string_match.end()
+                if string_match.group() == '"':
+                    break
+                position += 1
+        elif char in "{[":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return position
+    return end
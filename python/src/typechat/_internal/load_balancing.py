@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+import random
+import time
+from typing_extensions import Literal, override
+
+from typechat._internal.model import CompletionOptions, PromptSection, TypeChatLanguageModel, complete_with_options, is_transient_failure
+from typechat._internal.result import Failure, Result
+
+@dataclass
+class LanguageModelEndpoint:
+    "One of the models a `LoadBalancedLanguageModel` routes requests to."
+
+    model: TypeChatLanguageModel
+    weight: float = 1.0
+    "The endpoint's share of traffic relative to the other endpoints, e.g. in proportion to its quota."
+
+    name: str = ""
+    "A name identifying the endpoint in failure messages."
+
+@dataclass
+class _EndpointState:
+    outstanding: int = 0
+    latency_ewma_seconds: float | None = None
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+
+class LoadBalancedLanguageModel(TypeChatLanguageModel):
+    """
+    Spreads completions over several equivalent models (e.g. deployments of a model in different regions),
+    and fails over between them.
+
+    Each completion goes to the healthy endpoint with the least load relative to its weight - either the fewest
+    outstanding requests, or the lowest latency (as an exponentially weighted moving average) times outstanding
+    requests. An attempt that fails with a server error (5xx), a rate limit (429), or a transport error is retried
+    right away on another endpoint. An endpoint that fails `eject_after_failures` times in a row is taken out of
+    rotation for `ejection_cooldown_seconds`.
+
+    Endpoints should not retry failed requests themselves (e.g. use `HttpxLanguageModel` with
+    `max_retry_attempts = 0`), so that a failing endpoint is left immediately.
+    """
+
+    endpoints: list[LanguageModelEndpoint]
+    # Specifies how the load of an endpoint is measured when choosing where to send a completion.
+    routing: Literal["least_outstanding", "latency_ewma"] = "least_outstanding"
+    # Specifies the maximum number of attempts at each completion, each on a different endpoint where possible.
+    # If not set, each endpoint is tried at most once.
+    max_attempts: int | None = None
+    # Specifies the number of consecutive failures after which an endpoint is taken out of rotation.
+    eject_after_failures: int = 3
+    # Specifies how long, in seconds, an ejected endpoint is left out of rotation.
+    ejection_cooldown_seconds: float = 30.0
+    # Specifies the weight of the most recent latency in each endpoint's moving average (between 0 and 1).
+    latency_ewma_alpha: float = 0.3
+    _states: list[_EndpointState]
+    _random: random.Random
+
+    def __init__(self, endpoints: list[LanguageModelEndpoint]):
+        super().__init__()
+        if not endpoints:
+            raise ValueError("At least one endpoint is required.")
+        if any(endpoint.weight <= 0 for endpoint in endpoints):
+            raise ValueError("Endpoint weights must be positive.")
+        self.endpoints = endpoints
+        self._states = [_EndpointState() for _ in endpoints]
+        self._random = random.Random()
+
+    def is_ejected(self, endpoint_index: int) -> bool:
+        "Returns whether the endpoint at the given index is currently out of rotation."
+        return self._states[endpoint_index].ejected_until > time.monotonic()
+
+    @override
+    async def complete(self, prompt: str | list[PromptSection], *, options: CompletionOptions | None = None) -> Result[str]:
+        max_attempts = self.max_attempts if self.max_attempts is not None else len(self.endpoints)
+        tried: set[int] = set()
+        failures: list[str] = []
+        for _ in range(max_attempts):
+            index = self._choose_endpoint(tried)
+            tried.add(index)
+            endpoint, state = self.endpoints[index], self._states[index]
+
+            state.outstanding += 1
+            started_at = time.monotonic()
+            try:
+                result = await complete_with_options(endpoint.model, prompt, options)
+            finally:
+                state.outstanding -= 1
+
+            if not isinstance(result, Failure):
+                self._record_success(state, time.monotonic() - started_at)
+                return result
+            if not is_transient_failure(result):
+                # The request itself is at fault, so other endpoints would reject it too.
+                return result
+            self._record_failure(state)
+            failures.append(f"{endpoint.name or f'Endpoint {index}'}: {result.message}")
+
+        return Failure("All attempts failed.\n" + "\n".join(failures))
+
+    def _choose_endpoint(self, tried: set[int]) -> int:
+        """
+        Chooses the least loaded endpoint among those that are in rotation and haven't been tried yet. Falls back to
+        endpoints that have been tried, and then to the endpoint whose ejection ends soonest.
+        """
+        now = time.monotonic()
+        all_indices = range(len(self.endpoints))
+        healthy = [index for index in all_indices if self._states[index].ejected_until <= now]
+        candidates = [index for index in healthy if index not in tried] or healthy
+        if not candidates:
+            return min(all_indices, key=lambda index: self._states[index].ejected_until)
+
+        loads = {index: self._load(index) for index in candidates}
+        least_load = min(loads.values())
+        least_loaded = [index for index, load in loads.items() if load == least_load]
+        # Break ties by weight, so that idle endpoints still share traffic in proportion to their weights.
+        return self._random.choices(least_loaded, weights=[self.endpoints[index].weight for index in least_loaded])[0]
+
+    def _load(self, index: int) -> float:
+        state = self._states[index]
+        load = float(state.outstanding + 1)
+        if self.routing == "latency_ewma":
+            # Endpoints without a measured latency yet are tried first.
+            load *= state.latency_ewma_seconds or 0.0
+        return load / self.endpoints[index].weight
+
+    def _record_success(self, state: _EndpointState, latency_seconds: float) -> None:
+        state.consecutive_failures = 0
+        if state.latency_ewma_seconds is None:
+            state.latency_ewma_seconds = latency_seconds
+        else:
+            alpha = self.latency_ewma_alpha
+            state.latency_ewma_seconds = alpha * latency_seconds + (1 - alpha) * state.latency_ewma_seconds
+
+    def _record_failure(self, state: _EndpointState) -> None:
+        state.consecutive_failures += 1
+        if state.consecutive_failures >= self.eject_after_failures:
+            state.ejected_until = time.monotonic() + self.ejection_cooldown_seconds
+            state.consecutive_failures = 0
@@ -0,0 +1,276 @@
+from dataclasses import dataclass
+import difflib
+import re
+from typing_extensions import Any, Protocol, cast, override
+
+import pydantic
+
+from typechat._internal.json_scanner import expects_json_array, find_json_value
+from typechat._internal.ts_conversion.python_type_to_ts_nodes import python_type_to_typescript_nodes
+from typechat._internal.ts_conversion.schema_pruning import declaration_types, literal_values
+from typechat._internal.type_cache import TypeCache
+
+@dataclass
+class LocalRepairStats:
+    "Counts the local repairs a translator has tried."
+
+    attempts: int = 0
+    successes: int = 0
+    "Repairs that produced a valid object - each one a round-trip to the language model that wasn't needed."
+
+class LocalRepairStrategy(Protocol):
+    """
+    Repairs a language model response that failed validation without calling the language model again.
+    `TypeChatJsonTranslator` tries its local repair strategy (when one is configured) before sending a repair prompt.
+    """
+
+    def repair(self, response_text: str, target_type: type[Any]) -> object | None:
+        """
+        Returns JSON data (as produced by `json.loads`) that may be a valid version of the object in `response_text`,
+        or `None` if the response can't be repaired. The data is still validated by the translator's validator.
+        """
+        ...
+
+class LenientJsonRepair(LocalRepairStrategy):
+    """
+    Repairs mechanical mistakes in a response:
+
+    - JSON5-style syntax: comments, trailing commas, single-quoted strings, unquoted keys, and Python's `True`,
+      `False` and `None`.
+    - Values of the wrong but convertible type, such as the string `"3"` where a number is expected
+      (using pydantic's lax mode).
+    - String literals differing from one of the schema's literals only in case, or by a small typo.
+    - Missing properties that accept `null`.
+    """
+
+    max_rounds: int
+    "The maximum number of times to fix up literals and missing properties before giving up."
+
+    literal_cutoff: float
+    "How similar (between 0 and 1) a misspelled literal must be to one of the schema's literals to be replaced by it."
+
+    def __init__(self, max_rounds: int = 3, literal_cutoff: float = 0.8) -> None:
+        super().__init__()
+        self.max_rounds = max_rounds
+        self.literal_cutoff = literal_cutoff
+
+    @override
+    def repair(self, response_text: str, target_type: type[Any]) -> object | None:
+        # Look for the value the same way the translator does, so that the value repaired is the one that failed.
+        span = find_json_value(response_text, allow_arrays=expects_json_array(target_type), lenient=True)
+        if span is None:
+            return None
+        try:
+            data, _ = _LenientJsonParser(response_text).parse_value(span[0])
+        except ValueError:
+            return None
+
+        adapter = _lax_adapter_cache.get_or_create(target_type, None, lambda: pydantic.TypeAdapter[Any](target_type))
+        literals: list[str] | None = None
+        for _ in range(self.max_rounds + 1):
+            try:
+                return adapter.dump_python(adapter.validate_python(data), mode="json")
+            except pydantic.ValidationError as validation_error:
+                errors = validation_error.errors(include_url=False)
+
+            if literals is None:
+                literals = _literal_cache.get_or_create(target_type, None, lambda: _collect_string_literals(target_type))
+            # Prefer fixing literals; within a union, a bad literal also makes the other alternatives report
+            # missing properties.
+            changed = False
+            for error in errors:
+                if error["type"] == "literal_error" and isinstance(error["input"], str):
+                    replacement = self._match_literal(error["input"], literals)
+                    if replacement is not None:
+                        changed |= _set_at(data, error["loc"], replacement, expected=error["input"])
+            if not changed:
+                for error in errors:
+                    if error["type"] == "missing":
+                        changed |= _set_at(data, error["loc"], None)
+            if not changed:
+                return None
+        return None
+
+    def _match_literal(self, value: str, literals: list[str]) -> str | None:
+        folded_value = value.casefold()
+        for literal in literals:
+            if literal.casefold() == folded_value:
+                return literal
+        matches = difflib.get_close_matches(value, literals, n=1, cutoff=self.literal_cutoff)
+        return matches[0] if matches else None
+
+
+def _collect_string_literals(target_type: type[Any]) -> list[str]:
+    literals: dict[str, None] = {}
+    for declaration in python_type_to_typescript_nodes(target_type).type_declarations:
+        for type_node in declaration_types(declaration):
+            literals.update(dict.fromkeys(literal_values(type_node, strings_only=True)))
+    return list(literals)
+
+def _set_at(data: object, loc: tuple[str | int, ...], value: object, *, expected: object = None) -> bool:
+    """
+    Sets the value at a validation error's location. Parts of the location that don't name a property or an index
+    (such as the names of union alternatives) are skipped. If `expected` is given, only replaces that value.
+    """
+    if not loc:
+        return False
+    current = data
+    for part in loc[:-1]:
+        if isinstance(current, dict) and part in current:
+            current = cast(dict[str | int, Any], current)[part]
+        elif isinstance(current, list) and isinstance(part, int) and 0 <= part < len(cast(list[Any], current)):
+            current = cast(list[Any], current)[part]
+    last = loc[-1]
+    if isinstance(current, dict) and isinstance(last, str):
+        container = cast(dict[str, Any], current)
+        if expected is None and last in container:
+            return False
+        if expected is not None and container.get(last) != expected:
+            return False
+        container[last] = value
+        return True
+    if isinstance(current, list) and isinstance(last, int) and 0 <= last < len(cast(list[Any], current)):
+        elements = cast(list[Any], current)
+        if expected is not None and elements[last] != expected:
+            return False
+        elements[last] = value
+        return True
+    return False
+
+
+_NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "/": "/", "\\": "\\", '"': '"', "'": "'"}
+_KEYWORDS: dict[str, object] = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+
+# Values nested more deeply than this are rejected rather than risking running out of stack.
+_MAX_DEPTH = 200
+
+class _LenientJsonParser:
+    "Parses a single JSON5-style value, ignoring any text after it."
+
+    _text: str
+    _depth: int
+
+    def __init__(self, text: str) -> None:
+        super().__init__()
+        self._text = text
+        self._depth = 0
+
+    def parse_value(self, position: int) -> tuple[object, int]:
+        self._depth += 1
+        try:
+            if self._depth > _MAX_DEPTH:
+                raise ValueError(f"Value nested too deeply at {position}.")
+            return self._parse_value(position)
+        finally:
+            self._depth -= 1
+
+    def _parse_value(self, position: int) -> tuple[object, int]:
+        text = self._text
+        position = self._skip_whitespace(position)
+        if position >= len(text):
+            raise ValueError("Unexpected end of text.")
+        char = text[position]
+        if char == "{":
+            return self._parse_object(position + 1)
+        if char == "[":
+            return self._parse_array(position + 1)
+        if char in "\"'":
+            return self._parse_string(position)
+        number_match = _NUMBER.match(text, position)
+        if number_match is not None:
+            number_text = number_match.group()
+            if any(c in number_text for c in ".eE"):
+                return float(number_text), number_match.end()
+            return int(number_text), number_match.end()
+        identifier_match = _IDENTIFIER.match(text, position)
+        if identifier_match is not None and identifier_match.group() in _KEYWORDS:
+            return _KEYWORDS[identifier_match.group()], identifier_match.end()
+        raise ValueError(f"Unexpected character at {position}.")
+
+    def _parse_object(self, position: int) -> tuple[object, int]:
+        text = self._text
+        result: dict[str, object] = {}
+        while True:
+            position = self._skip_whitespace(position)
+            if position < len(text) and text[position] == "}":
+                return result, position + 1
+            if position < len(text) and text[position] in "\"'":
+                key, position = self._parse_string(position)
+            else:
+                identifier_match = _IDENTIFIER.match(text, position)
+                if identifier_match is None:
+                    raise ValueError(f"Expected a property name at {position}.")
+                key, position = identifier_match.group(), identifier_match.end()
+            position = self._expect(self._skip_whitespace(position), ":")
+            result[key], position = self.parse_value(position)
+            position = self._skip_whitespace(position)
+            if position < len(text) and text[position] == ",":
+                position += 1
+            elif position >= len(text) or text[position] != "}":
+                raise ValueError(f"Expected ',' or '}}' at {position}.")
+
+    def _parse_array(self, position: int) -> tuple[object, int]:
+        text = self._text
+        result: list[object] = []
+        while True:
+            position = self._skip_whitespace(position)
+            if position < len(text) and text[position] == "]":
+                return result, position + 1
+            element, position = self.parse_value(position)
+            result.append(element)
+            position = self._skip_whitespace(position)
+            if position < len(text) and text[position] == ",":
+                position += 1
+            elif position >= len(text) or text[position] != "]":
+                raise ValueError(f"Expected ',' or ']' at {position}.")
+
+    def _parse_string(self, position: int) -> tuple[str, int]:
+        text = self._text
+        quote = text[position]
+        position += 1
+        chars: list[str] = []
+        while position < len(text):
+            char = text[position]
+            if char == quote:
+                return "".join(chars), position + 1
+            if char == "\\":
+                position += 1
+                if position >= len(text):
+                    break
+                escape = text[position]
+                if escape == "u":
+                    chars.append(chr(int(text[position + 1:position + 5], 16)))
+                    position += 5
+                    continue
+                chars.append(_ESCAPES.get(escape, escape))
+            else:
+                chars.append(char)
+            position += 1
+        raise ValueError("Unterminated string.")
+
+    def _skip_whitespace(self, position: int) -> int:
+        "Skips whitespace and comments."
+        text = self._text
+        while position < len(text):
+            if text[position].isspace():
+                position += 1
+            elif text.startswith("//", position):
+                end = text.find("\n", position)
+                position = len(text) if end < 0 else end + 1
+            elif text.startswith("/*", position):
+                end = text.find("*/", position + 2)
+                position = len(text) if end < 0 else end + 2
+            else:
+                break
+        return position
+
+    def _expect(self, position: int, char: str) -> int:
+        if position >= len(self._text) or self._text[position] != char:
+            raise ValueError(f"Expected '{char}' at {position}.")
+        return position + 1
+
+
+_lax_adapter_cache = TypeCache[pydantic.TypeAdapter[Any]]("lax_validators")
+_literal_cache = TypeCache[list[str]]("schema_literals")
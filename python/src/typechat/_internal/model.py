@@ -1,9 +1,17 @@
 import asyncio
+from contextvars import ContextVar
+from dataclasses import dataclass
 import json
+import time
 from types import TracebackType
-from typing_extensions import AsyncContextManager, Literal, Protocol, Self, TypedDict, cast, override
+from typing_extensions import Any, AsyncContextManager, AsyncGenerator, Literal, Protocol, Self, TypedDict, cast, override, runtime_checkable
 
+from typechat._internal.rate_limit import TokenBucketRateLimiter
 from typechat._internal.result import Failure, Result, Success
+from typechat._internal.retry import RetryPolicy
+from typechat._internal.token_estimation import estimate_token_count
+from typechat._internal.tracing import start_span
+from typechat._internal.usage import CompletionUsage
 
 import httpx
 
@@ -11,11 +19,50 @@ class PromptSection(TypedDict):
     """
     Represents a section of an LLM prompt with an associated role. TypeChat uses the "user" role for
     prompts it generates and the "assistant" role for previous LLM responses (which will be part of
-    the prompt in repair attempts). TypeChat currently doesn't use the "system" role.
+    the prompt in repair attempts). TypeChat only uses the "system" role for the leading
+    instructions of the "prefix" prompt layout (see `TypeChatJsonTranslator.prompt_layout`).
     """
     role: Literal["system", "user", "assistant"]
     content: str
 
+@dataclass
+class HttpStatusFailure(Failure):
+    "A failure caused by an error response from a model endpoint."
+    status_code: int
+
+def is_transient_failure(failure: Failure) -> bool:
+    """
+    Determines whether a failure of a model may not recur if the request is made again (possibly elsewhere):
+    anything but an error response blaming the request itself (a 4xx status other than 429).
+    """
+    if isinstance(failure, HttpStatusFailure):
+        return failure.status_code == 429 or failure.status_code >= 500
+    return True
+
+# The deadline of the translation being performed; set by `TypeChatJsonTranslator.translate`.
+current_deadline_var = ContextVar[float | None]("typechat_deadline", default=None)
+
+def current_deadline() -> float | None:
+    """
+    Returns the deadline (as a `time.monotonic()` value) of the translation being performed, if it has one
+    (see the `deadline` and `timeout_seconds` arguments of `TypeChatJsonTranslator.translate`).
+
+    Language models can use it to bound each request by the time that remains, and to skip retries that could
+    not finish in time. `HttpxLanguageModel` does both.
+    """
+    return current_deadline_var.get()
+
+class CompletionOptions(TypedDict, total=False):
+    """
+    Per-request options for models that accept them (such as `HttpxLanguageModel`).
+    Options that aren't given are left to the model's defaults.
+    """
+    response_format: dict[str, Any]
+    "An OpenAI-style `response_format`, e.g. `{\"type\": \"json_object\"}`."
+
+    temperature: float
+    "The sampling temperature."
+
 class TypeChatLanguageModel(Protocol):
     async def complete(self, prompt: str | list[PromptSection]) -> Result[str]:
         """
@@ -28,6 +75,68 @@ class TypeChatLanguageModel(Protocol):
         """
         ...
 
+@runtime_checkable
+class TypeChatStreamingLanguageModel(TypeChatLanguageModel, Protocol):
+    def complete_stream(self, prompt: str | list[PromptSection]) -> AsyncGenerator[Result[str], None]:
+        """
+        Completes a prompt incrementally, yielding a `Success` with each piece of text as it is generated.
+        If the completion fails, a single `Failure` is yielded and the stream ends.
+
+        Closing the generator early (with `aclose()`) stops the completion, so a caller that has
+        already received everything it needs doesn't have to wait for (or pay for) the rest.
+        """
+        ...
+
+@runtime_checkable
+class TypeChatMultiChoiceLanguageModel(TypeChatLanguageModel, Protocol):
+    async def complete_choices(
+        self,
+        prompt: str | list[PromptSection],
+        n: int,
+        *,
+        options: CompletionOptions | None = None,
+    ) -> Result[list[str]]:
+        """
+        Completes a prompt `n` times independently in a single request, returning the `n` completions
+        (which may differ, since they are sampled at a non-zero temperature unless `options` say otherwise).
+        """
+        ...
+
+class _OptionsLanguageModel(Protocol):
+    async def complete(self, prompt: str | list[PromptSection], *, options: CompletionOptions | None = None) -> Result[str]:
+        ...
+
+    def complete_stream(
+        self,
+        prompt: str | list[PromptSection],
+        *,
+        options: CompletionOptions | None = None,
+    ) -> AsyncGenerator[Result[str], None]:
+        ...
+
+async def complete_with_options(
+    model: TypeChatLanguageModel,
+    prompt: str | list[PromptSection],
+    options: CompletionOptions | None,
+) -> Result[str]:
+    """
+    Completes a prompt, passing `options` along as the `options` keyword argument if there are any.
+    A model only needs to accept the argument if it is given options.
+    """
+    if not options:
+        return await model.complete(prompt)
+    return await cast(_OptionsLanguageModel, model).complete(prompt, options=options)
+
+def complete_stream_with_options(
+    model: TypeChatStreamingLanguageModel,
+    prompt: str | list[PromptSection],
+    options: CompletionOptions | None,
+) -> AsyncGenerator[Result[str], None]:
+    "Like `complete_with_options`, for `complete_stream`."
+    if not options:
+        return model.complete_stream(prompt)
+    return cast(_OptionsLanguageModel, model).complete_stream(prompt, options=options)
+
 _TRANSIENT_ERROR_CODES = [
     429,
     500,
@@ -41,7 +150,37 @@ class _ResponseTooLargeError(Exception):
     def __init__(self, max_bytes: int):
         super().__init__(f"REST API response exceeded the maximum allowed size of {max_bytes} bytes")
 
-class HttpxLanguageModel(TypeChatLanguageModel, AsyncContextManager):
+def _parse_usage(usage: object, latency_seconds: float) -> CompletionUsage:
+    "Reads the `usage` block of a chat completion response, which some endpoints leave out."
+    counts = cast(dict[str, Any], usage) if isinstance(usage, dict) else {}
+    prompt_details = counts.get("prompt_tokens_details")
+    prompt_details = cast(dict[str, Any], prompt_details) if isinstance(prompt_details, dict) else {}
+    return CompletionUsage(
+        prompt_tokens=counts.get("prompt_tokens") or 0,
+        completion_tokens=counts.get("completion_tokens") or 0,
+        cached_prompt_tokens=prompt_details.get("cached_tokens") or 0,
+        latency_seconds=latency_seconds,
+        completions=1,
+    )
+
+def _parse_event_line(line: bytes) -> tuple[bool, str | None]:
+    """
+    Parses one line of a server-sent event stream of chat completion chunks.
+    Returns whether the line ends the stream (`data: [DONE]`), along with the text of the chunk's delta, if any.
+    """
+    line = line.strip()
+    if not line.startswith(b"data:"):
+        return False, None
+    data = line[len(b"data:"):].strip()
+    if data == b"[DONE]":
+        return True, None
+    event = cast(dict[str, list[dict[str, dict[str, str | None]]]], json.loads(data))
+    choices = event.get("choices") or []
+    if not choices:
+        return False, None
+    return False, choices[0].get("delta", {}).get("content")
+
+class HttpxLanguageModel(TypeChatStreamingLanguageModel, TypeChatMultiChoiceLanguageModel, AsyncContextManager):
     url: str
     headers: dict[str, str]
     default_params: dict[str, str]
@@ -49,6 +188,9 @@ class HttpxLanguageModel(TypeChatLanguageModel, AsyncContextManager):
     max_retry_attempts: int = 3
     # Specifies the delay before retrying in milliseconds.
     retry_pause_seconds: float = 1.0
+    # Specifies an optional policy deciding whether and when to retry a failed request.
+    # When set, it replaces `max_retry_attempts` and `retry_pause_seconds`.
+    retry_policy: RetryPolicy | None = None
     # Specifies how long a request should wait in seconds
     # before timing out with a Failure.
     timeout_seconds = 10
@@ -57,17 +199,181 @@ class HttpxLanguageModel(TypeChatLanguageModel, AsyncContextManager):
     # buffered in memory, preventing a malicious or malfunctioning endpoint from exhausting memory.
     # Set to 0 or a negative value to disable the limit.
     max_response_bytes: int = 100 * 1024 * 1024
+    # Specifies an optional client-side rate limiter consulted before every request attempt (including retries).
+    # A limiter can be shared between models that draw from the same provider quota.
+    rate_limiter: TokenBucketRateLimiter | None = None
     _async_client: httpx.AsyncClient
+    _owns_client: bool
 
-    def __init__(self, url: str, headers: dict[str, str], default_params: dict[str, str]):
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str],
+        default_params: dict[str, str],
+        *,
+        client: httpx.AsyncClient | None = None,
+    ):
+        """
+        Args:
+            url: The chat completions endpoint.
+            headers: Headers sent with every request.
+            default_params: Parameters added to the body of every request.
+            client: The client to send requests with, e.g. one configured with `HttpClientOptions` or shared through
+                `get_shared_client`. A client that is passed in is left open when the model is closed.
+                If not given, the model creates (and closes) a client of its own.
+        """
         super().__init__()
         self.url = url
         self.headers = headers
         self.default_params = default_params
-        self._async_client = httpx.AsyncClient()
+        self._owns_client = client is None
+        self._async_client = client if client is not None else httpx.AsyncClient()
+
+    async def warm_up(self) -> Result[None]:
+        """
+        Opens a connection to the endpoint ahead of the first completion, so that its DNS lookup and TLS handshake
+        don't add to that completion's latency. Any response from the server counts as success; the connection
+        is kept in the client's pool for later requests.
+        """
+        try:
+            await self._async_client.head(self.url, headers=self.headers, timeout=self.timeout_seconds)
+        except Exception as e:
+            return Failure(str(e) or f"{repr(e)} raised while warming up the connection.")
+        return Success(None)
+
+    @override
+    async def complete(self, prompt: str | list[PromptSection], *, options: CompletionOptions | None = None) -> Success[str] | Failure:
+        result = await self.complete_choices(prompt, 1, options=options)
+        if isinstance(result, Failure):
+            return result
+        return Success(result.value[0], usage=result.usage)
 
     @override
-    async def complete(self, prompt: str | list[PromptSection]) -> Success[str] | Failure:
+    async def complete_choices(
+        self,
+        prompt: str | list[PromptSection],
+        n: int,
+        *,
+        options: CompletionOptions | None = None,
+    ) -> Success[list[str]] | Failure:
+        if n < 1:
+            raise ValueError("n must be at least 1.")
+        headers, body = self._create_request(prompt, options)
+        if n > 1:
+            body["n"] = n
+            # Identical samples would be wasted, so sample at the API's default temperature unless told otherwise.
+            if options is None or "temperature" not in options:
+                body["temperature"] = 1.0
+        estimated_tokens = estimate_token_count(json.dumps(body["messages"])) if self.rate_limiter is not None else 0
+        started_at = time.monotonic()
+        retry_count = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(estimated_tokens)
+            with start_span("typechat.model.complete", {"typechat.attempt": retry_count + 1}) as span:
+                status_code: int | None = None
+                response_headers: httpx.Headers | None = None
+                failure: Failure
+                try:
+                    async with self._async_client.stream(
+                        "POST",
+                        self.url,
+                        headers=headers,
+                        json=body,
+                        timeout=self._attempt_timeout_seconds(),
+                    ) as response:
+                        span.set_attribute("http.status_code", response.status_code)
+                        if response.is_success:
+                            raw = await self._read_capped(response)
+                            span.set_attribute("typechat.response_bytes", len(raw))
+                            json_result = cast(dict[str, Any], json.loads(raw))
+                            choices = cast(list[dict[Literal["message"], PromptSection]], json_result["choices"])
+                            return Success(
+                                [choice["message"]["content"] or "" for choice in choices],
+                                usage=_parse_usage(json_result.get("usage"), time.monotonic() - started_at),
+                            )
+
+                        failure = HttpStatusFailure(f"REST API error {response.status_code}: {response.reason_phrase}", response.status_code)
+                        if response.status_code not in _TRANSIENT_ERROR_CODES:
+                            return failure
+                        status_code = response.status_code
+                        response_headers = response.headers
+                except _ResponseTooLargeError as e:
+                    return Failure(str(e))
+                except Exception as e:
+                    failure = Failure(str(e) or f"{repr(e)} raised from within internal TypeChat language model.")
+
+                retry_count += 1
+                delay = self._retry_delay(retry_count, time.monotonic() - started_at, status_code, response_headers)
+                if delay is None:
+                    return failure
+                span.add_event("typechat.retry", {"typechat.delay_seconds": delay})
+            await asyncio.sleep(delay)
+
+    @override
+    async def complete_stream(
+        self,
+        prompt: str | list[PromptSection],
+        *,
+        options: CompletionOptions | None = None,
+    ) -> AsyncGenerator[Success[str] | Failure, None]:
+        headers, body = self._create_request(prompt, options)
+        body["stream"] = True
+        estimated_tokens = estimate_token_count(json.dumps(body["messages"])) if self.rate_limiter is not None else 0
+        started_at = time.monotonic()
+        retry_count = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(estimated_tokens)
+            with start_span("typechat.model.complete", {"typechat.attempt": retry_count + 1}) as span:
+                status_code: int | None = None
+                response_headers: httpx.Headers | None = None
+                received_any = False
+                failure: Failure
+                try:
+                    async with self._async_client.stream(
+                        "POST",
+                        self.url,
+                        headers=headers,
+                        json=body,
+                        timeout=self._attempt_timeout_seconds(),
+                    ) as response:
+                        span.set_attribute("http.status_code", response.status_code)
+                        if response.is_success:
+                            async for delta in self._read_event_stream(response):
+                                received_any = True
+                                yield Success(delta)
+                            return
+
+                        failure = HttpStatusFailure(f"REST API error {response.status_code}: {response.reason_phrase}", response.status_code)
+                        if response.status_code not in _TRANSIENT_ERROR_CODES:
+                            yield failure
+                            return
+                        status_code = response.status_code
+                        response_headers = response.headers
+                except _ResponseTooLargeError as e:
+                    yield Failure(str(e))
+                    return
+                except Exception as e:
+                    failure = Failure(str(e) or f"{repr(e)} raised from within internal TypeChat language model.")
+                    # Part of the completion has already been handed out, so the request can't be transparently retried.
+                    if received_any:
+                        yield failure
+                        return
+
+                retry_count += 1
+                delay = self._retry_delay(retry_count, time.monotonic() - started_at, status_code, response_headers)
+                if delay is None:
+                    yield failure
+                    return
+                span.add_event("typechat.retry", {"typechat.delay_seconds": delay})
+            await asyncio.sleep(delay)
+
+    def _create_request(
+        self,
+        prompt: str | list[PromptSection],
+        options: CompletionOptions | None = None,
+    ) -> tuple[dict[str, str], dict[str, Any]]:
         headers = {
             "Content-Type": "application/json",
             **self.headers,
@@ -76,40 +382,45 @@ class HttpxLanguageModel(TypeChatLanguageModel, AsyncContextManager):
         if isinstance(prompt, str):
             prompt = [{"role": "user", "content": prompt}]
 
-        body = {
+        body: dict[str, Any] = {
             **self.default_params,
             "messages": prompt,
             "temperature": 0.0,
             "n": 1,
         }
-        retry_count = 0
-        while True:
-            try:
-                async with self._async_client.stream(
-                    "POST",
-                    self.url,
-                    headers=headers,
-                    json=body,
-                    timeout=self.timeout_seconds,
-                ) as response:
-                    if response.is_success:
-                        raw = await self._read_capped(response)
-                        json_result = cast(
-                            dict[Literal["choices"], list[dict[Literal["message"], PromptSection]]],
-                            json.loads(raw)
-                        )
-                        return Success(json_result["choices"][0]["message"]["content"] or "")
-
-                    if response.status_code not in _TRANSIENT_ERROR_CODES or retry_count >= self.max_retry_attempts:
-                        return Failure(f"REST API error {response.status_code}: {response.reason_phrase}")
-            except _ResponseTooLargeError as e:
-                return Failure(str(e))
-            except Exception as e:
-                if retry_count >= self.max_retry_attempts:
-                    return Failure(str(e) or f"{repr(e)} raised from within internal TypeChat language model.")
-
-            await asyncio.sleep(self.retry_pause_seconds)
-            retry_count += 1
+        if options is not None:
+            if "response_format" in options:
+                body["response_format"] = options["response_format"]
+            if "temperature" in options:
+                body["temperature"] = options["temperature"]
+        return headers, body
+
+    def _attempt_timeout_seconds(self) -> float:
+        "Returns the timeout for a single request: `timeout_seconds`, or less if the current deadline is sooner."
+        deadline = current_deadline()
+        if deadline is None:
+            return self.timeout_seconds
+        return max(min(self.timeout_seconds, deadline - time.monotonic()), 0.0)
+
+    def _retry_delay(self, attempt: int, elapsed_seconds: float, status_code: int | None, headers: httpx.Headers | None) -> float | None:
+        """
+        Returns how long to wait before retry number `attempt`, or `None` if the request should not be retried.
+        Without a `retry_policy`, retries happen after a fixed `retry_pause_seconds` up to `max_retry_attempts` times.
+        A retry that couldn't start before the current deadline (see `current_deadline`) isn't made.
+        """
+        if self.retry_policy is None:
+            delay = self.retry_pause_seconds if attempt <= self.max_retry_attempts else None
+        else:
+            delay = self.retry_policy.next_delay(
+                attempt=attempt,
+                elapsed_seconds=elapsed_seconds,
+                status_code=status_code,
+                headers=headers,
+            )
+        deadline = current_deadline()
+        if delay is not None and deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        return delay
 
     async def _read_capped(self, response: httpx.Response) -> bytes:
         """
@@ -138,15 +449,41 @@ class HttpxLanguageModel(TypeChatLanguageModel, AsyncContextManager):
                 raise _ResponseTooLargeError(max_bytes)
         return bytes(buffer)
 
+    async def _read_event_stream(self, response: httpx.Response) -> AsyncGenerator[str, None]:
+        """
+        Reads a `text/event-stream` chat completion response, yielding the text content of each delta.
+        Like `_read_capped`, the read is aborted once more than `max_response_bytes` have been received.
+        """
+        max_bytes = self.max_response_bytes
+        bytes_read = 0
+        pending = b""
+        async for chunk in response.aiter_bytes():
+            bytes_read += len(chunk)
+            if 0 < max_bytes < bytes_read:
+                raise _ResponseTooLargeError(max_bytes)
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                done, delta = _parse_event_line(line)
+                if done:
+                    return
+                if delta:
+                    yield delta
+        _, delta = _parse_event_line(pending)
+        if delta:
+            yield delta
+
     @override
     async def __aenter__(self) -> Self:
         return self
 
     @override
     async def __aexit__(self, __exc_type: type[BaseException] | None, __exc_value: BaseException | None, __traceback: TracebackType | None) -> bool | None:
-        await self._async_client.aclose()
+        if self._owns_client:
+            await self._async_client.aclose()
 
     def __del__(self):
+        if not getattr(self, "_owns_client", False):
+            return
         try:
             asyncio.get_running_loop().create_task(self._async_client.aclose())
         except Exception:
@@ -190,7 +527,14 @@ def create_language_model(vals: dict[str, str | None]) -> HttpxLanguageModel:
     else:
         raise ValueError("Missing environment variables for OPENAI_API_KEY or AZURE_OPENAI_API_KEY.")
 
-def create_openai_language_model(api_key: str, model: str, endpoint: str = "https://api.openai.com/v1/chat/completions", org: str = "") -> HttpxLanguageModel:
+def create_openai_language_model(
+    api_key: str,
+    model: str,
+    endpoint: str = "https://api.openai.com/v1/chat/completions",
+    org: str = "",
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> HttpxLanguageModel:
     """
     Creates a language model encapsulation of an OpenAI REST API endpoint.
 
@@ -199,6 +543,7 @@ def create_openai_language_model(api_key: str, model: str, endpoint: str = "http
         model: The OpenAI model name.
         endpoint: The OpenAI REST API endpoint.
         org: The OpenAI organization.
+        client: An optional client to send requests with (see `HttpxLanguageModel`).
     """
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -207,15 +552,21 @@ def create_openai_language_model(api_key: str, model: str, endpoint: str = "http
     default_params = {
         "model": model,
     }
-    return HttpxLanguageModel(url=endpoint, headers=headers, default_params=default_params)
+    return HttpxLanguageModel(url=endpoint, headers=headers, default_params=default_params, client=client)
 
-def create_azure_openai_language_model(api_key: str, endpoint: str) -> HttpxLanguageModel:
+def create_azure_openai_language_model(
+    api_key: str,
+    endpoint: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> HttpxLanguageModel:
     """
     Creates a language model encapsulation of an Azure OpenAI REST API endpoint.
 
     Args:
         api_key: The Azure OpenAI API key.
         endpoint: The Azure OpenAI REST API endpoint.
+        client: An optional client to send requests with (see `HttpxLanguageModel`).
     """
     headers = {
         # Needed when using managed identity
@@ -223,4 +574,4 @@ def create_azure_openai_language_model(api_key: str, endpoint: str) -> HttpxLang
         # Needed when using regular API key
         "api-key": api_key,
     }
-    return HttpxLanguageModel(url=endpoint, headers=headers, default_params={})
+    return HttpxLanguageModel(url=endpoint, headers=headers, default_params={}, client=client)
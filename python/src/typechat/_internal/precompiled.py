@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+from typing_extensions import Any, TypeAliasType
+
+from typechat.__about__ import __version__
+from typechat._internal.ts_conversion import TypeScriptSchemaConversionResult, typescript_nodes_to_schema
+from typechat._internal.ts_conversion.python_type_to_ts_nodes import python_type_to_typescript_nodes
+
+# Bump this whenever the layout of an artifact changes.
+_ARTIFACT_FORMAT_VERSION = 1
+
+SCHEMA_CACHE_DIR_ENV_VAR = "TYPECHAT_SCHEMA_CACHE_DIR"
+
+def default_schema_cache_dir() -> Path:
+    """
+    Returns the directory that precompiled schemas are written to and loaded from by default:
+    the `TYPECHAT_SCHEMA_CACHE_DIR` environment variable if it is set, and `~/.cache/typechat/schemas` otherwise.
+    """
+    configured_dir = os.environ.get(SCHEMA_CACHE_DIR_ENV_VAR)
+    if configured_dir:
+        return Path(configured_dir)
+    return Path.home() / ".cache" / "typechat" / "schemas"
+
+def compile_schema(py_type: type | TypeAliasType, cache_dir: str | os.PathLike[str] | None = None) -> Path:
+    """
+    Converts a Python type to a TypeScript schema and saves the result as an artifact in `cache_dir`,
+    so that later processes can load it with `load_compiled_schema` instead of converting the type again.
+
+    The artifact is only considered fresh while the source files of every module declaring a type in the
+    schema are unchanged. Returns the path of the artifact.
+    """
+    node_conversion_result = python_type_to_typescript_nodes(py_type)
+    conversion_result = typescript_nodes_to_schema(py_type, node_conversion_result)
+
+    dependencies: dict[str, str] = {}
+    for declared_type in [py_type, *node_conversion_result.declared_py_types]:
+        source_path = _source_path(declared_type)
+        if source_path is None:
+            raise ValueError(f"Cannot precompile a schema for '{py_type}': '{declared_type}' is not declared in a source file.")
+        dependencies[str(source_path)] = _hash_file(source_path)
+
+    artifact_path = _artifact_path(py_type, _resolve_cache_dir(cache_dir))
+    assert artifact_path is not None
+    artifact = {
+        "format_version": _ARTIFACT_FORMAT_VERSION,
+        "typescript_schema_str": conversion_result.typescript_schema_str,
+        "typescript_type_reference": conversion_result.typescript_type_reference,
+        "errors": conversion_result.errors,
+        "dependencies": dependencies,
+    }
+    artifact_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write atomically so that a concurrently starting process never reads a partial artifact.
+    temp_path = artifact_path.with_name(f"{artifact_path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(artifact, indent=2), encoding="utf-8")
+    os.replace(temp_path, artifact_path)
+    return artifact_path
+
+def load_compiled_schema(
+    py_type: type | TypeAliasType,
+    cache_dir: str | os.PathLike[str] | None = None,
+) -> TypeScriptSchemaConversionResult | None:
+    """
+    Loads the TypeScript schema previously saved for `py_type` by `compile_schema`.
+    Returns `None` if there is no artifact for the type, or if it is stale.
+    """
+    directory = _resolve_cache_dir(cache_dir)
+    # Avoid hashing any source files when nothing has been precompiled.
+    if not directory.is_dir():
+        return None
+    artifact_path = _artifact_path(py_type, directory)
+    if artifact_path is None:
+        return None
+    try:
+        artifact: dict[str, Any] = json.loads(artifact_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if artifact.get("format_version") != _ARTIFACT_FORMAT_VERSION:
+        return None
+    dependencies: dict[str, str] = artifact["dependencies"]
+    for source_path, expected_hash in dependencies.items():
+        try:
+            if _hash_file(Path(source_path)) != expected_hash:
+                return None
+        except OSError:
+            return None
+
+    return TypeScriptSchemaConversionResult(
+        typescript_schema_str=artifact["typescript_schema_str"],
+        typescript_type_reference=artifact["typescript_type_reference"],
+        errors=artifact["errors"],
+    )
+
+def _resolve_cache_dir(cache_dir: str | os.PathLike[str] | None) -> Path:
+    return Path(cache_dir) if cache_dir is not None else default_schema_cache_dir()
+
+def _artifact_path(py_type: object, directory: Path) -> Path | None:
+    """
+    Artifacts live in a directory per TypeChat version (since conversion may change between versions),
+    and are named after the type and the hash of the module that declares it.
+    """
+    source_path = _source_path(py_type)
+    if source_path is None:
+        return None
+    try:
+        source_hash = _hash_file(source_path)
+    except OSError:
+        return None
+    qualified_name = f"{getattr(py_type, '__module__')}.{getattr(py_type, '__qualname__', getattr(py_type, '__name__'))}"
+    return directory / __version__ / f"{qualified_name}.{source_hash[:16]}.json"
+
+def _source_path(py_type: object) -> Path | None:
+    module = sys.modules.get(getattr(py_type, "__module__", None) or "")
+    module_file = getattr(module, "__file__", None)
+    if not module_file:
+        return None
+    return Path(module_file).resolve()
+
+def _hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+class _TokenBucket:
+    capacity: float
+    refill_per_second: float
+    level: float
+    updated_at: float
+
+    def __init__(self, per_minute: float, now: float):
+        super().__init__()
+        self.capacity = per_minute
+        self.refill_per_second = per_minute / 60.0
+        self.level = per_minute
+        self.updated_at = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def seconds_until_available(self, amount: float) -> float:
+        # Never wait for more than a full bucket, or an oversized request could wait forever.
+        shortfall = min(amount, self.capacity) - self.level
+        return max(0.0, shortfall / self.refill_per_second)
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+class TokenBucketRateLimiter:
+    """
+    A client-side rate limiter that keeps the requests sent to a model endpoint under a
+    requests-per-minute and/or tokens-per-minute quota.
+
+    Each quota is tracked with a token bucket that holds up to a minute's worth of budget and refills continuously.
+    Callers wait in FIFO order, so concurrent requests are spread out evenly instead of bursting and then all
+    backing off at once. A single limiter can be shared by several models drawing from the same quota.
+    """
+
+    _requests: _TokenBucket | None
+    _tokens: _TokenBucket | None
+    _lock: asyncio.Lock
+
+    def __init__(self, *, requests_per_minute: float | None = None, tokens_per_minute: float | None = None):
+        """
+        Args:
+            requests_per_minute: The maximum number of requests per minute, or `None` for no request limit.
+            tokens_per_minute: The maximum number of (estimated) prompt tokens per minute, or `None` for no token limit.
+        """
+        super().__init__()
+        for name, value in (("requests_per_minute", requests_per_minute), ("tokens_per_minute", tokens_per_minute)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive.")
+        now = time.monotonic()
+        self._requests = _TokenBucket(requests_per_minute, now) if requests_per_minute is not None else None
+        self._tokens = _TokenBucket(tokens_per_minute, now) if tokens_per_minute is not None else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Waits until a request costing `tokens` tokens can be sent without exceeding the configured quotas,
+        then deducts it from the budget.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait_seconds = 0.0
+                if self._requests is not None:
+                    self._requests.refill(now)
+                    wait_seconds = max(wait_seconds, self._requests.seconds_until_available(1))
+                if self._tokens is not None:
+                    self._tokens.refill(now)
+                    wait_seconds = max(wait_seconds, self._tokens.seconds_until_available(tokens))
+                if wait_seconds <= 0:
+                    break
+                await asyncio.sleep(wait_seconds)
+
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(tokens)
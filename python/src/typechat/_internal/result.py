@@ -1,12 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing_extensions import Generic, TypeAlias, TypeVar
 
+from typechat._internal.usage import CompletionUsage
+
 T = TypeVar("T", covariant=True)
 
 @dataclass
 class Success(Generic[T]):
     "An object representing a successful operation with a result of type `T`."
     value: T
+    usage: CompletionUsage | None = field(default=None, kw_only=True, compare=False, repr=False)
+    "The token usage of the completions that produced the result, when known. Not considered by `==`."
 
 
 @dataclass
@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import re
+from typing_extensions import Mapping, Protocol, override
+
+class RetryPolicy(Protocol):
+    def next_delay(
+        self,
+        *,
+        attempt: int,
+        elapsed_seconds: float,
+        status_code: int | None,
+        headers: Mapping[str, str] | None,
+    ) -> float | None:
+        """
+        Decides whether a failed request should be retried, and how long to wait before doing so.
+
+        Args:
+            attempt: The number of the retry being considered (1 for the first retry).
+            elapsed_seconds: The time since the first attempt was started.
+            status_code: The HTTP status of the failed attempt, or `None` if no response was received.
+            headers: The response headers of the failed attempt, or `None` if no response was received.
+
+        Returns the number of seconds to wait before retrying, or `None` to give up.
+        """
+        ...
+
+_SERVER_HINT_STATUS_CODES = (429, 503)
+
+_RATE_LIMIT_RESET_HEADERS = (
+    "x-ratelimit-reset-requests",
+    "x-ratelimit-reset-tokens",
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNIT_SECONDS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+@dataclass
+class ExponentialBackoffRetryPolicy(RetryPolicy):
+    """
+    Retries with exponential backoff and full jitter: the wait before retry `n` is drawn uniformly from
+    `[0, min(max_delay_seconds, base_delay_seconds * 2 ** (n - 1))]`, which keeps concurrent clients from
+    retrying in lockstep.
+
+    When a 429 or 503 response carries a `Retry-After` or `x-ratelimit-reset-*` header, that server hint
+    is used as the delay instead. No retry is scheduled that would end after `deadline_seconds`.
+    """
+
+    max_attempts: int = 3
+    "The maximum number of retries."
+
+    base_delay_seconds: float = 0.5
+    "The upper bound of the delay before the first retry; it doubles with each further retry."
+
+    max_delay_seconds: float = 30.0
+    "The cap on the computed (jittered) delay."
+
+    deadline_seconds: float | None = None
+    "The total time budget for the initial attempt and all retries, or `None` for no deadline."
+
+    honor_server_hints: bool = True
+    "Whether to wait as long as the server asks via `Retry-After` or `x-ratelimit-reset-*` headers."
+
+    @override
+    def next_delay(
+        self,
+        *,
+        attempt: int,
+        elapsed_seconds: float,
+        status_code: int | None,
+        headers: Mapping[str, str] | None,
+    ) -> float | None:
+        if attempt > self.max_attempts:
+            return None
+
+        delay: float | None = None
+        if self.honor_server_hints and headers is not None and status_code in _SERVER_HINT_STATUS_CODES:
+            delay = server_retry_delay(headers)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1)))
+
+        if self.deadline_seconds is not None and elapsed_seconds + delay >= self.deadline_seconds:
+            return None
+        return delay
+
+def server_retry_delay(headers: Mapping[str, str]) -> float | None:
+    """
+    Returns the delay in seconds requested by a `Retry-After` header (in seconds or as an HTTP date),
+    or otherwise the longest `x-ratelimit-reset-*` duration (e.g. `"1s"`, `"6m0s"`, `"20ms"`).
+    Returns `None` if no usable hint is present.
+    """
+    retry_after = headers.get("retry-after")
+    if retry_after is not None:
+        retry_after = retry_after.strip()
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            pass
+        else:
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    reset_delays = [
+        delay
+        for name in _RATE_LIMIT_RESET_HEADERS
+        if (value := headers.get(name)) is not None and (delay := _parse_duration(value)) is not None
+    ]
+    return max(reset_delays) if reset_delays else None
+
+def _parse_duration(value: str) -> float | None:
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNIT_SECONDS[unit] for number, unit in parts)
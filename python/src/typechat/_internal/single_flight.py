@@ -0,0 +1,52 @@
+import asyncio
+import copy
+from typing_extensions import Any, Awaitable, Callable, TypeVar
+
+from typechat._internal.model import current_deadline_var
+
+R = TypeVar("R")
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key, so that only the first one does the work and the others
+    wait for (and share) its outcome. Nothing is remembered once a call completes; see `TranslationCache`
+    for keeping results around.
+
+    A `SingleFlight` can be shared between several `TypeChatJsonTranslator` instances.
+    """
+
+    coalesced_calls: int
+    "The number of calls that waited on another call instead of doing the work themselves."
+
+    _in_flight: dict[str, asyncio.Task[Any]]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.coalesced_calls = 0
+        self._in_flight = {}
+
+    async def run(self, key: str, work: Callable[[], Awaitable[R]]) -> R:
+        """
+        Runs `work` unless a call with the same `key` is already in flight, in which case that call's result
+        (or exception) is returned instead. Cancelling one caller does not cancel the shared work.
+
+        The shared work runs without a deadline (see `current_deadline`), since callers may have different ones;
+        each caller's own time limit only applies to its wait for the result.
+
+        Each caller gets its own deep copy of the result, so a caller that modifies it doesn't affect the others.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            async def run_work() -> R:
+                # The task runs in a copy of the first caller's context, so this doesn't affect the caller.
+                current_deadline_var.set(None)
+                return await work()
+            task = asyncio.ensure_future(run_work())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced_calls += 1
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
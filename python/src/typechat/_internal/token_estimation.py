@@ -0,0 +1,13 @@
+import math
+
+# A common rule of thumb for GPT-style tokenizers on English text and JSON.
+_CHARACTERS_PER_TOKEN = 4
+
+def estimate_token_count(text: str) -> int:
+    """
+    Estimates the number of tokens a language model will see for the given text.
+
+    This is a cheap character-based approximation, not an exact tokenization.
+    It is intended for budgeting (e.g. rate limiting and prompt sizing), where being fast matters more than being exact.
+    """
+    return math.ceil(len(text) / _CHARACTERS_PER_TOKEN)
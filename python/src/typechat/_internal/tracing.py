@@ -0,0 +1,106 @@
+import importlib
+from types import TracebackType
+from typing_extensions import Any, ContextManager, Mapping, Protocol, Self, TypeAlias, override
+
+AttributeValue: TypeAlias = str | bool | int | float
+"A value of a span or event attribute. These are the scalar attribute types OpenTelemetry accepts."
+
+class Span(Protocol):
+    "A timed operation reported to a `Tracer`."
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        ...
+
+    def add_event(self, name: str, attributes: Mapping[str, AttributeValue] | None = None) -> None:
+        "Records something that happened at a point in time during the span."
+        ...
+
+class Tracer(Protocol):
+    """
+    Receives the spans TypeChat emits while it works, for tracing or metrics (see `set_tracer`).
+    `OpenTelemetryTracer` reports them to OpenTelemetry.
+
+    Spans emitted (with their attributes):
+
+    - `typechat.schema_conversion` (`typechat.type_name`): converting a Python type to a TypeScript schema.
+    - `typechat.translate` (`typechat.type_name`, `typechat.schema_hash`): a whole translation.
+    - `typechat.translate.attempt` (`typechat.attempt`): one completion and its validation; attempts after the first
+      are repairs. Local repairs are recorded as a `typechat.local_repair` event.
+    - `typechat.model.complete` (`typechat.attempt`, `http.status_code`, `typechat.response_bytes`): one request by
+      `HttpxLanguageModel`. A retry is recorded as a `typechat.retry` event on the failed request's span.
+    - `typechat.extract_json`: finding the JSON value in a response.
+    - `typechat.validate_json` and `typechat.validate_object` (`typechat.valid`): validating JSON text or data
+      with `TypeChatValidator`.
+    """
+
+    def start_span(self, name: str, attributes: Mapping[str, AttributeValue] | None = None) -> ContextManager[Span]:
+        """
+        Returns a context manager that starts a span on entry and ends it on exit. A span started while another one
+        is open (in the same task) is its child.
+        """
+        ...
+
+class _NoOpSpan(Span):
+    "The span used while no tracer is set, doing nothing as cheaply as possible."
+
+    @override
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+    @override
+    def add_event(self, name: str, attributes: Mapping[str, AttributeValue] | None = None) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, __exc_type: type[BaseException] | None, __exc_value: BaseException | None, __traceback: TracebackType | None) -> None:
+        pass
+
+_NO_OP_SPAN = _NoOpSpan()
+
+_tracer: Tracer | None = None
+
+def set_tracer(tracer: Tracer | None) -> None:
+    "Sets the tracer that receives TypeChat's spans, or stops tracing if `None` (the default)."
+    global _tracer
+    _tracer = tracer
+
+def get_tracer() -> Tracer | None:
+    "Returns the tracer set by `set_tracer`, if any."
+    return _tracer
+
+def start_span(name: str, attributes: Mapping[str, AttributeValue] | None = None) -> ContextManager[Span]:
+    "Starts a span with the current tracer, if one is set."
+    if _tracer is None:
+        return _NO_OP_SPAN
+    return _tracer.start_span(name, attributes)
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Reports TypeChat's spans to OpenTelemetry. Requires the `opentelemetry-api` package
+    (installed with the `typechat[opentelemetry]` extra).
+    """
+
+    _tracer: Any
+
+    def __init__(self, tracer: Any = None):
+        """
+        Args:
+            tracer: An OpenTelemetry `Tracer` to create spans with.\
+                    If not given, one named "typechat" is obtained from the global tracer provider.
+        """
+        super().__init__()
+        if tracer is None:
+            try:
+                trace = importlib.import_module("opentelemetry.trace")
+            except ImportError as e:
+                raise ImportError(
+                    "OpenTelemetryTracer requires the opentelemetry-api package (pip install typechat[opentelemetry])."
+                ) from e
+            tracer = trace.get_tracer("typechat")
+        self._tracer = tracer
+
+    @override
+    def start_span(self, name: str, attributes: Mapping[str, AttributeValue] | None = None) -> ContextManager[Span]:
+        return self._tracer.start_as_current_span(name, attributes=attributes)
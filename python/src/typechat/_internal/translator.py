@@ -1,14 +1,75 @@
-from typing_extensions import Generic, TypeVar
+import asyncio
+import hashlib
+import json
+import time
+from typing_extensions import Any, AsyncIterator, Generic, Iterable, Literal, TypeVar, cast
 
-import pydantic_core
-
-from typechat._internal.model import PromptSection, TypeChatLanguageModel
+from typechat._internal.cache import TranslationCache
+from typechat._internal.local_repair import LocalRepairStats, LocalRepairStrategy
+from typechat._internal.json_scanner import IncrementalJsonScanner, JsonPropertySpan, expects_json_array, find_json_value
+from typechat._internal.model import (
+    CompletionOptions,
+    PromptSection,
+    TypeChatLanguageModel,
+    TypeChatMultiChoiceLanguageModel,
+    TypeChatStreamingLanguageModel,
+    current_deadline_var,
+    complete_stream_with_options,
+    complete_with_options,
+)
+from typechat._internal.precompiled import load_compiled_schema
 from typechat._internal.result import Failure, Result, Success
-from typechat._internal.ts_conversion import python_type_to_typescript_schema
+from typechat._internal.single_flight import SingleFlight
+from typechat._internal.ts_conversion import TypeScriptEmitOptions, TypeScriptSchemaConversionResult, python_type_to_typescript_schema
+from typechat._internal.ts_conversion.python_type_to_ts_nodes import python_type_to_typescript_nodes
+from typechat._internal.ts_conversion.schema_pruning import SchemaPruner
+from typechat._internal.tracing import start_span
+from typechat._internal.type_cache import TypeCache
+from typechat._internal.usage import CompletionUsage
 from typechat._internal.validator import TypeChatValidator
 
 T = TypeVar("T", covariant=True)
 
+_schema_cache = TypeCache[TypeScriptSchemaConversionResult]("typescript_schemas")
+_schema_pruner_cache = TypeCache[SchemaPruner]("schema_pruners")
+
+def _convert_target_type(target_type: type, schema_options: TypeScriptEmitOptions | None) -> TypeScriptSchemaConversionResult:
+    """
+    Converts a type to a TypeScript schema. Schemas written with the default options
+    prefer a fresh precompiled schema (see `compile_schema`) if there is one.
+    """
+    with start_span("typechat.schema_conversion", {"typechat.type_name": getattr(target_type, "__name__", repr(target_type))}):
+        if schema_options is None:
+            return load_compiled_schema(target_type) or python_type_to_typescript_schema(target_type)
+        return python_type_to_typescript_schema(target_type, schema_options)
+
+def _to_response_json_schema(json_schema: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+    """
+    Adapts a JSON Schema for use as a structured output response format: objects don't allow additional properties.
+    Returns the schema along with whether it can be enforced strictly, which requires every object to have a fixed
+    set of properties (so not a `dict` with arbitrary keys), all of which are required.
+    """
+    strict = True
+
+    def adapt(node: object) -> object:
+        nonlocal strict
+        if isinstance(node, list):
+            return [adapt(item) for item in cast(list[object], node)]
+        if not isinstance(node, dict):
+            return node
+        result = {key: adapt(value) for key, value in cast(dict[str, object], node).items()}
+        if result.get("type") == "object":
+            properties = result.get("properties")
+            if isinstance(properties, dict):
+                result.setdefault("additionalProperties", False)
+                if set(cast(dict[str, object], properties)) != set(cast(list[str], result.get("required", []))):
+                    strict = False
+            if not isinstance(properties, dict) or result.get("additionalProperties") is not False:
+                strict = False
+        return result
+
+    return cast(dict[str, Any], adapt(json_schema)), strict
+
 class TypeChatJsonTranslator(Generic[T]):
     """
     Represents an object that can translate natural language requests in JSON objects of the given type.
@@ -19,7 +80,49 @@ class TypeChatJsonTranslator(Generic[T]):
     target_type: type[T]
     type_name: str
     schema_str: str
+    _schema_hash: str
+    _schema_pruner: SchemaPruner | None
+    _json_schema_options: CompletionOptions | None
+    _expects_array: bool
+    local_repair_stats: LocalRepairStats
+    usage_stats: CompletionUsage
+    "The total usage of the completions made by this translator, for models that report it (see `CompletionUsage`)."
     _max_repair_attempts = 1
+    # Specifies whether to stream completions from models that support it (see `TypeChatStreamingLanguageModel`).
+    # A streamed completion is cut off as soon as the JSON object in it is complete, instead of waiting for
+    # (and paying for) any text the model generates after it.
+    stream_completions: bool = False
+    # Specifies whether streamed completions are validated property-by-property while they arrive. A completion
+    # that has already produced an invalid property is abandoned early, and the repair prompt is sent right away.
+    validate_streamed_properties: bool = True
+    # Specifies an optional cache of validated results. A request whose prompt, schema and model parameters
+    # exactly match an earlier successful one is answered from the cache without calling the model.
+    cache: TranslationCache | None = None
+    # Specifies an optional registry of in-flight requests. Concurrent requests identical to one already in flight
+    # (by the same key as `cache`) wait for its result instead of calling the model themselves.
+    single_flight: SingleFlight | None = None
+    # Specifies how prompts are laid out. With "default", the instructions, the schema and the request share a single
+    # user message, after any preamble. With "prefix", the instructions and the schema come first, in a system message
+    # that is identical for every request (see `prompt_prefix_hash`), followed by any preamble, and the request itself
+    # comes last. Providers that cache the processing of repeated prompt prefixes can then reuse it across requests.
+    # A pruned schema (see `prune_schema`) varies between requests, which defeats such caching.
+    prompt_layout: Literal["default", "prefix"] = "default"
+    # Specifies an optional strategy for repairing invalid responses locally (e.g. `LenientJsonRepair`). It is tried
+    # before each repair prompt is sent, and a successful local repair saves a round-trip to the model.
+    # See `local_repair_stats`.
+    local_repair: LocalRepairStrategy | None = None
+    # Specifies whether to ask the model to respond with JSON natively, using an OpenAI-style `response_format`.
+    # With "json_object", the model is asked for any JSON object. With "json_schema", it is sent a JSON Schema derived
+    # from the validator's type (strict, where the schema allows it), and the TypeScript schema is left out of the
+    # prompt. Anything other than "text" requires a model that accepts `options` (see `CompletionOptions`).
+    response_format: Literal["text", "json_object", "json_schema"] = "text"
+    # Specifies how many completions to sample for each attempt. With more than one, the first completion that
+    # passes validation is used and the rest are abandoned, spending tokens to save repair round-trips. A model that
+    # implements `TypeChatMultiChoiceLanguageModel` is asked for all of them in one request. Otherwise, requests are
+    # made in parallel, the i-th at a temperature of `i * speculative_temperature_step` (which requires a model that
+    # accepts `options`, unless the step is 0). Sampled completions are never streamed.
+    speculative_samples: int = 1
+    speculative_temperature_step: float = 0.3
 
     def __init__(
         self,
@@ -27,6 +130,8 @@ class TypeChatJsonTranslator(Generic[T]):
         validator: TypeChatValidator[T],
         target_type: type[T],
         *, # keyword-only parameters follow
+        schema_options: TypeScriptEmitOptions | None = None,
+        prune_schema: bool = False,
         _raise_on_schema_errors: bool = True,
     ):
         """
@@ -34,13 +139,19 @@ class TypeChatJsonTranslator(Generic[T]):
             model: The associated `TypeChatLanguageModel`.
             validator: The associated `TypeChatValidator[T]`.
             target_type: A runtime type object describing `T` - the expected shape of JSON data.
+            schema_options: How the TypeScript schema sent to the model is written out,
+                e.g. `TypeScriptEmitOptions.compact()` to spend fewer prompt tokens on it.
+            prune_schema: Whether to send each request only the parts of the schema that appear relevant to it\
+                          (see `SchemaPruner`). Repair attempts always get the full schema.
         """
         super().__init__()
         self.model = model
         self.validator = validator
         self.target_type = target_type
 
-        conversion_result = python_type_to_typescript_schema(target_type)
+        conversion_result = _schema_cache.get_or_create(
+            target_type, schema_options, lambda: _convert_target_type(target_type, schema_options)
+        )
 
         if _raise_on_schema_errors and conversion_result.errors:
             error_text = "".join(f"\n- {error}" for error in conversion_result.errors)
@@ -48,8 +159,30 @@ class TypeChatJsonTranslator(Generic[T]):
 
         self.type_name = conversion_result.typescript_type_reference
         self.schema_str = conversion_result.typescript_schema_str
+        self._schema_hash = hashlib.sha256(self.schema_str.encode()).hexdigest()[:16]
+        self._expects_array = expects_json_array(target_type)
+        self.local_repair_stats = LocalRepairStats()
+        self.usage_stats = CompletionUsage()
+        self._schema_pruner = None
+        self._json_schema_options = None
+        if prune_schema:
+            self._schema_pruner = _schema_pruner_cache.get_or_create(
+                target_type,
+                schema_options,
+                lambda: SchemaPruner(
+                    python_type_to_typescript_nodes(target_type).type_declarations,
+                    schema_options or TypeScriptEmitOptions(),
+                ),
+            )
 
-    async def translate(self, input: str, *, prompt_preamble: str | list[PromptSection] | None = None) -> Result[T]:
+    async def translate(
+        self,
+        input: str,
+        *,
+        prompt_preamble: str | list[PromptSection] | None = None,
+        timeout_seconds: float | None = None,
+        deadline: float | None = None,
+    ) -> Result[T]:
         """
         Translates a natural language request into an object of type `T`. If the JSON object returned by
         the language model fails to validate, repair attempts will be made up until `_max_repair_attempts`.
@@ -58,59 +191,439 @@ class TypeChatJsonTranslator(Generic[T]):
 
         Args:
             input: A natural language request.
-            prompt_preamble: An optional string or list of prompt sections to prepend to the generated prompt.\
+            prompt_preamble: An optional string or list of prompt sections to prepend to the generated prompt\
+                             (following the leading system message if `prompt_layout` is "prefix").\
                              If a string is given, it is converted to a single "user" role prompt section.
+            timeout_seconds: An optional limit on the time taken by the whole translation, including retries\
+                             and repair attempts.
+            deadline: An optional time (as a `time.monotonic()` value) by which the whole translation must finish.\
+                      If both this and `timeout_seconds` are given, the sooner one applies.
+
+        With a time limit, the remaining time is made available to the model (see `current_deadline`), and a
+        translation that runs out of time is cancelled - including any request to the model in progress -
+        and returns a `Failure`.
         """
+        if timeout_seconds is not None:
+            timeout_deadline = time.monotonic() + timeout_seconds
+            deadline = timeout_deadline if deadline is None else min(deadline, timeout_deadline)
+        with start_span("typechat.translate", {"typechat.type_name": self.type_name, "typechat.schema_hash": self._schema_hash}):
+            outer_deadline = current_deadline_var.get()
+            if deadline is None or (outer_deadline is not None and outer_deadline <= deadline):
+                return await self._translate(input, prompt_preamble)
+
+            token = current_deadline_var.set(deadline)
+            try:
+                async with asyncio.timeout(max(deadline - time.monotonic(), 0.0)):
+                    return await self._translate(input, prompt_preamble)
+            except TimeoutError:
+                return Failure("The translation did not finish before its deadline.")
+            finally:
+                current_deadline_var.reset(token)
+
+    async def _translate(self, input: str, prompt_preamble: str | list[PromptSection] | None) -> Result[T]:
+        # A request given a pruned schema is widened to the full schema if it needs repairing.
+        full_messages: list[PromptSection] | None = None
+        request_schema_str = self.schema_str
+        if self._schema_pruner is not None and self.response_format != "json_schema":
+            request_schema_str = self._schema_pruner.prune(input)
+        messages = self._create_messages(input, prompt_preamble, request_schema_str)
+        if request_schema_str != self.schema_str:
+            full_messages = self._create_messages(input, prompt_preamble, self.schema_str)
+
+        if self.cache is None and self.single_flight is None:
+            return await self._translate_messages(messages, full_messages)
+
+        request_key = self._create_cache_key(messages)
+        if self.cache is not None:
+            cached_result = self.cache.get(request_key)
+            if cached_result is not None:
+                return cached_result
+
+        if self.single_flight is not None:
+            result = await self.single_flight.run(request_key, lambda: self._translate_messages(messages, full_messages))
+        else:
+            result = await self._translate_messages(messages, full_messages)
 
+        if self.cache is not None and isinstance(result, Success):
+            # A cached result costs nothing when it's reused.
+            self.cache.set(request_key, Success(result.value))
+        return result
+
+    def _create_messages(
+        self,
+        input: str,
+        prompt_preamble: str | list[PromptSection] | None,
+        schema_str: str,
+    ) -> list[PromptSection]:
         messages: list[PromptSection] = []
+        if self.prompt_layout == "prefix":
+            messages.append({"role": "system", "content": self._create_prefix_prompt(schema_str)})
 
         if prompt_preamble:
             if isinstance(prompt_preamble, str):
                 prompt_preamble = [{"role": "user", "content": prompt_preamble}]
             messages.extend(prompt_preamble)
 
-        messages.append({"role": "user", "content": self._create_request_prompt(input)})
+        if self.prompt_layout == "prefix":
+            messages.append({"role": "user", "content": self._create_suffix_prompt(input)})
+        elif type(self)._create_request_prompt is not TypeChatJsonTranslator[Any]._create_request_prompt:
+            # A subclass's own request prompt is used as is, with whatever schema it includes.
+            messages.append({"role": "user", "content": self._create_request_prompt(input)})
+        else:
+            messages.append({"role": "user", "content": self._create_schema_request_prompt(input, schema_str)})
+        return messages
+
+    @property
+    def prompt_prefix_hash(self) -> str:
+        """
+        A hash of the leading system message sent with every request when `prompt_layout` is "prefix".
+        Requests sent with equal hashes share a prompt prefix that providers can cache.
+        """
+        return hashlib.sha256(self._create_prefix_prompt(self.schema_str).encode()).hexdigest()
 
+    async def _translate_messages(self, messages: list[PromptSection], full_messages: list[PromptSection] | None = None) -> Result[T]:
+        """
+        Runs the completion and repair loop. A successful result carries the usage of all the completions made for it
+        (if the model reports usage).
+        """
         num_repairs_attempted = 0
+        usage = CompletionUsage()
         while True:
-            completion_response = await self.model.complete(messages)
-            if isinstance(completion_response, Failure):
-                return completion_response
-
-            text_response = completion_response.value
-            first_curly = text_response.find("{")
-            last_curly = text_response.rfind("}") + 1
-            error_message: str
-            if 0 <= first_curly < last_curly:
-                trimmed_response = text_response[first_curly:last_curly]
-                try:
-                    parsed_response = pydantic_core.from_json(trimmed_response, allow_inf_nan=False, cache_strings=False)
-                except ValueError as e:
-                    error_message = f"Error: {e}\n\nAttempted to parse:\n\n{trimmed_response}"
+            with start_span("typechat.translate.attempt", {"typechat.attempt": num_repairs_attempted + 1}) as span:
+                validation_result: Result[T] | None = None
+                if self.speculative_samples > 1:
+                    completion_response, validation_result = await self._complete_speculatively(messages, usage)
+                    early_failure = None
                 else:
-                    result = self.validator.validate_object(parsed_response)
-                    if isinstance(result, Success):
-                        return result
-                    error_message = result.message
-            else:
-                error_message = f"Response did not contain any text resembling JSON.\nResponse was\n\n{text_response}"
-            if num_repairs_attempted >= self._max_repair_attempts:
-                return Failure(error_message)
-            num_repairs_attempted += 1
-            messages.append({"role": "assistant", "content": text_response})
-            messages.append({"role": "user", "content": self._create_repair_prompt(error_message)})
+                    completion_response, early_failure = await self._complete(messages)
+                    self._record_usage(completion_response, usage)
+                if isinstance(completion_response, Failure):
+                    return completion_response
+
+                text_response = completion_response.value
+                result = early_failure or validation_result or self._validate_response(text_response)
+                # A completion cut short by streamed validation is incomplete, so it can't be repaired locally.
+                if isinstance(result, Failure) and early_failure is None and self.local_repair is not None:
+                    result = self._repair_locally(self.local_repair, text_response) or result
+                    span.add_event("typechat.local_repair", {"typechat.success": isinstance(result, Success)})
+                if isinstance(result, Success):
+                    if usage.completions:
+                        result.usage = usage
+                    return result
+                error_message = result.message
+                if num_repairs_attempted >= self._max_repair_attempts:
+                    return Failure(error_message)
+                num_repairs_attempted += 1
+                if full_messages is not None:
+                    messages[:len(full_messages)] = full_messages
+                    full_messages = None
+                messages.append({"role": "assistant", "content": text_response})
+                messages.append({"role": "user", "content": self._create_repair_prompt(error_message)})
+
+    def _record_usage(self, completion: Result[Any], usage: CompletionUsage) -> None:
+        "Adds the usage reported with a completion to the usage of the current translation and to `usage_stats`."
+        if isinstance(completion, Success) and completion.usage is not None:
+            usage.add(completion.usage)
+            self.usage_stats.add(completion.usage)
+
+    def _validate_response(self, text_response: str) -> Result[T]:
+        """
+        Extracts the JSON object from a model response and validates it.
+        On failure, the message describes the problem in a form suitable for a repair prompt.
+        """
+        with start_span("typechat.extract_json"):
+            span = find_json_value(text_response, allow_arrays=self._expects_array)
+        if span is None:
+            return Failure(f"Response did not contain any text resembling JSON.\nResponse was\n\n{text_response}")
+
+        start, end = span
+        return self.validator.validate_json_text(text_response[start:end])
+
+    def _repair_locally(self, local_repair: LocalRepairStrategy, text_response: str) -> Success[T] | None:
+        self.local_repair_stats.attempts += 1
+        repaired_data = local_repair.repair(text_response, self.target_type)
+        if repaired_data is None:
+            return None
+        result = self.validator.validate_object(repaired_data)
+        if isinstance(result, Failure):
+            return None
+        self.local_repair_stats.successes += 1
+        return result
+
+    async def translate_many(
+        self,
+        inputs: Iterable[str],
+        *,
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        prompt_preamble: str | list[PromptSection] | None = None,
+        timeout_seconds: float | None = None,
+    ) -> AsyncIterator[tuple[int, Result[T]]]:
+        """
+        Translates a batch of natural language requests concurrently, yielding an `(index, result)` pair as each
+        translation completes. `index` is the position of the request in `inputs`, so results can be placed back
+        in input order as they arrive. Each request runs its own repair loop independently of the others.
+
+        Requests are drawn from `inputs` lazily, and at most `max_concurrency` translations are in flight at once.
+        If iteration stops early, any translations still in flight are cancelled.
+
+        Args:
+            inputs: The natural language requests to translate.
+            max_concurrency: The maximum number of translations in flight at any one time.
+            return_exceptions: If `True`, an exception raised while translating a request is yielded as a `Failure`\
+                               for that request. Otherwise the exception propagates and pending translations are cancelled.
+            prompt_preamble: An optional preamble passed along to each call to `translate`.
+            timeout_seconds: An optional limit on the time taken by each translation, counted from when it starts.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+
+        numbered_inputs = iter(enumerate(inputs))
+        pending: dict[asyncio.Task[Result[T]], int] = {}
+        inputs_exhausted = False
+        try:
+            while True:
+                while not inputs_exhausted and len(pending) < max_concurrency:
+                    next_input = next(numbered_inputs, None)
+                    if next_input is None:
+                        inputs_exhausted = True
+                        break
+                    index, input = next_input
+                    # Subclasses that override `translate` may not accept `timeout_seconds`, so it's only passed if set.
+                    if timeout_seconds is None:
+                        translation = self.translate(input, prompt_preamble=prompt_preamble)
+                    else:
+                        translation = self.translate(input, prompt_preamble=prompt_preamble, timeout_seconds=timeout_seconds)
+                    task = asyncio.create_task(translation)
+                    pending[task] = index
+
+                if not pending:
+                    return
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        if not return_exceptions:
+                            raise
+                        result = Failure(str(e) or f"{repr(e)} raised while translating request {index}.")
+                    yield index, result
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def _create_cache_key(self, messages: list[PromptSection]) -> str:
+        """
+        Creates a stable key identifying a request: the schema, the rendered prompt, and the parameters of the
+        model endpoint (when the model exposes them, as `HttpxLanguageModel` does).
+        """
+        key_material = {
+            "schema": self.schema_str,
+            "type_name": self.type_name,
+            "messages": messages,
+            "model": type(self.model).__qualname__,
+            "url": getattr(self.model, "url", None),
+            "params": getattr(self.model, "default_params", None),
+            "response_format": self.response_format,
+        }
+        key_json = json.dumps(key_material, sort_keys=True, default=repr)
+        return hashlib.sha256(key_json.encode()).hexdigest()
+
+    async def _complete(self, messages: list[PromptSection]) -> tuple[Result[str], Failure | None]:
+        """
+        Gets a completion for the given messages. When streaming, also returns any validation failure
+        detected before the completion finished (in which case the completion was cut short).
+        """
+        options = self._create_completion_options()
+        if self.stream_completions and isinstance(self.model, TypeChatStreamingLanguageModel):
+            return await self._complete_streaming(self.model, messages, options)
+        return await complete_with_options(self.model, messages, options), None
+
+    async def _complete_speculatively(
+        self,
+        messages: list[PromptSection],
+        usage: CompletionUsage,
+    ) -> tuple[Result[str], Result[T] | None]:
+        """
+        Samples `speculative_samples` completions, validating each one as it arrives. Returns the first valid completion
+        along with its validation result; or if there is none, the first completion received and its validation failure.
+        The usage of every completion received is added to `usage`.
+        """
+        options = self._create_completion_options()
+        if isinstance(self.model, TypeChatMultiChoiceLanguageModel):
+            choices = await self.model.complete_choices(messages, self.speculative_samples, options=options)
+            self._record_usage(choices, usage)
+            if isinstance(choices, Failure):
+                return choices, None
+            if not choices.value:
+                return Failure("The language model returned no choices."), None
+            first_invalid: tuple[Result[str], Result[T]] | None = None
+            for text_response in choices.value:
+                result = self._validate_response(text_response)
+                if isinstance(result, Success):
+                    return Success(text_response), result
+                first_invalid = first_invalid or (Success(text_response), result)
+            return first_invalid or (Failure("The language model returned no choices."), None)
+
+        async def sample(index: int) -> Result[str]:
+            sample_options: CompletionOptions | None = options
+            if index > 0 and self.speculative_temperature_step:
+                sample_options = {**(options or {}), "temperature": index * self.speculative_temperature_step}
+            return await complete_with_options(self.model, messages, sample_options)
+
+        tasks = [asyncio.create_task(sample(index)) for index in range(self.speculative_samples)]
+        first_invalid = None
+        first_failure: Failure | None = None
+        try:
+            for next_completion in asyncio.as_completed(tasks):
+                completion = await next_completion
+                self._record_usage(completion, usage)
+                if isinstance(completion, Failure):
+                    first_failure = first_failure or completion
+                    continue
+                result = self._validate_response(completion.value)
+                if isinstance(result, Success):
+                    return completion, result
+                first_invalid = first_invalid or (completion, result)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if first_invalid is not None:
+            return first_invalid
+        assert first_failure is not None
+        return first_failure, None
+
+    def _create_completion_options(self) -> CompletionOptions | None:
+        match self.response_format:
+            case "text":
+                return None
+            case "json_object":
+                return {"response_format": {"type": "json_object"}}
+            case "json_schema":
+                # Building the schema walks the whole type, so it's only done once per translator.
+                if self._json_schema_options is None:
+                    schema, strict = _to_response_json_schema(self.validator.json_schema())
+                    self._json_schema_options = {
+                        "response_format": {
+                            "type": "json_schema",
+                            "json_schema": {"name": self.type_name, "schema": schema, "strict": strict},
+                        }
+                    }
+                return self._json_schema_options
+
+    async def _complete_streaming(
+        self,
+        model: TypeChatStreamingLanguageModel,
+        messages: list[PromptSection],
+        options: CompletionOptions | None = None,
+    ) -> tuple[Result[str], Failure | None]:
+        """
+        Streams a completion, closing the stream as soon as the first JSON value in it is complete.
+        The returned text ends with that value's closing bracket.
+
+        If `validate_streamed_properties` is set, each top-level property (and each element of an array that is
+        a top-level property's value) is validated as soon as it has been received, and the stream is abandoned
+        at the first invalid one.
+        """
+        scanner = IncrementalJsonScanner(allow_arrays=self._expects_array)
+        # The text is accumulated in one string, so that each completed span can be sliced out of it
+        # without rebuilding the whole response.
+        text = ""
+        checked_spans = 0
+        early_failure: Failure | None = None
+        stream = complete_stream_with_options(model, messages, options)
+        try:
+            async for chunk in stream:
+                if isinstance(chunk, Failure):
+                    return chunk, None
+                text += chunk.value
+                is_complete = scanner.feed(chunk.value)
+                if self.validate_streamed_properties and checked_spans < len(scanner.completed_spans):
+                    early_failure = self._validate_spans(text, scanner.completed_spans[checked_spans:])
+                    checked_spans = len(scanner.completed_spans)
+                if is_complete or early_failure is not None:
+                    break
+        finally:
+            await stream.aclose()
+
+        if scanner.end is not None:
+            text = text[:scanner.end]
+        return Success(text), early_failure
+
+    def _validate_spans(self, text: str, spans: list[JsonPropertySpan]) -> Failure | None:
+        for span in spans:
+            value_json = text[span.value_start:span.value_end].strip()
+            if not value_json:
+                continue
+            try:
+                name = json.loads(text[span.key_start:span.key_end])
+            except ValueError:
+                # Malformed JSON will be reported once the whole object has been parsed.
+                continue
+            if not isinstance(name, str):
+                continue
+            failure = self.validator.validate_property_json(name, value_json, span.element_index)
+            if failure is not None:
+                return failure
+        return None
 
     def _create_request_prompt(self, intent: str) -> str:
+        return self._create_schema_request_prompt(intent, self.schema_str)
+
+    def _create_schema_request_prompt(self, intent: str, schema_str: str) -> str:
+        "Creates the request prompt, including `schema_str` (which may be pruned for this request) as the schema."
+        if self.response_format == "json_schema":
+            # The model is given the schema as its response format instead.
+            prompt = f"""
+You are a service that translates user requests into JSON objects of type "{self.type_name}".
+The following is a user request:
+'''
+{intent}
+'''
+The following is the user request translated into a JSON object with 2 spaces of indentation and no properties with the value undefined:
+"""
+            return prompt
         prompt = f"""
 You are a service that translates user requests into JSON objects of type "{self.type_name}" according to the following TypeScript definitions:
 ```
-{self.schema_str}
+{schema_str}
 ```
 The following is a user request:
 '''
 {intent}
 '''
 The following is the user request translated into a JSON object with 2 spaces of indentation and no properties with the value undefined:
+"""
+        return prompt
+
+    def _create_prefix_prompt(self, schema_str: str) -> str:
+        if self.response_format == "json_schema":
+            prompt = f"""
+You are a service that translates user requests into JSON objects of type "{self.type_name}".
+You will be given a user request. Respond with the user request translated into a JSON object with 2 spaces of indentation and no properties with the value undefined.
+"""
+            return prompt
+        prompt = f"""
+You are a service that translates user requests into JSON objects of type "{self.type_name}" according to the following TypeScript definitions:
+```
+{schema_str}
+```
+You will be given a user request. Respond with the user request translated into a JSON object with 2 spaces of indentation and no properties with the value undefined.
+"""
+        return prompt
+
+    def _create_suffix_prompt(self, intent: str) -> str:
+        prompt = f"""
+The following is a user request:
+'''
+{intent}
+'''
+The following is the user request translated into a JSON object with 2 spaces of indentation and no properties with the value undefined:
 """
         return prompt
 
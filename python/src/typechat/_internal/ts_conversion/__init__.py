@@ -1,12 +1,14 @@
 from dataclasses import dataclass
 from typing_extensions import TypeAliasType
 
-from typechat._internal.ts_conversion.python_type_to_ts_nodes import python_type_to_typescript_nodes
-from typechat._internal.ts_conversion.ts_node_to_string import ts_declaration_to_str
+from typechat._internal.ts_conversion.python_type_to_ts_nodes import TypeScriptNodeTranslationResult, python_type_to_typescript_nodes
+from typechat._internal.token_estimation import estimate_token_count
+from typechat._internal.ts_conversion.ts_node_to_string import DEFAULT_EMIT_OPTIONS, TypeScriptEmitOptions, ts_declarations_to_str
 
 __all__ = [
     "python_type_to_typescript_schema",
     "TypeScriptSchemaConversionResult",
+    "TypeScriptEmitOptions",
 ]
 
 @dataclass
@@ -20,13 +22,31 @@ class TypeScriptSchemaConversionResult:
     errors: list[str]
     """Any errors that occurred during conversion."""
 
-def python_type_to_typescript_schema(py_type: type | TypeAliasType) -> TypeScriptSchemaConversionResult:
-    """Converts a Python type to a TypeScript schema."""
+    @property
+    def estimated_token_count(self) -> int:
+        """An estimate of the number of tokens the schema takes up in a prompt."""
+        return estimate_token_count(self.typescript_schema_str)
+
+def python_type_to_typescript_schema(
+    py_type: type | TypeAliasType,
+    options: TypeScriptEmitOptions = DEFAULT_EMIT_OPTIONS,
+) -> TypeScriptSchemaConversionResult:
+    """
+    Converts a Python type to a TypeScript schema.
+    Pass `TypeScriptEmitOptions.compact()` as `options` for a schema that takes up fewer tokens in a prompt.
+    """
 
     node_conversion_result = python_type_to_typescript_nodes(py_type)
+    return typescript_nodes_to_schema(py_type, node_conversion_result, options)
+
+def typescript_nodes_to_schema(
+    py_type: type | TypeAliasType,
+    node_conversion_result: TypeScriptNodeTranslationResult,
+    options: TypeScriptEmitOptions = DEFAULT_EMIT_OPTIONS,
+) -> TypeScriptSchemaConversionResult:
+    """Converts the TypeScript declarations produced for a Python type to a TypeScript schema."""
 
-    decl_strs = map(ts_declaration_to_str, node_conversion_result.type_declarations)
-    schema_str = "\n".join(decl_strs)
+    schema_str = ts_declarations_to_str(node_conversion_result.type_declarations, options)
 
     return TypeScriptSchemaConversionResult(
         typescript_schema_str=schema_str,
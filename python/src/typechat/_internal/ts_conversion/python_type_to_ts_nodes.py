@@ -6,7 +6,7 @@ import inspect
 import sys
 import typing
 import typing_extensions
-from dataclasses import MISSING, Field, dataclass
+from dataclasses import MISSING, Field, dataclass, field
 from types import NoneType, UnionType
 from typing_extensions import (
     Annotated,
@@ -131,6 +131,8 @@ _KNOWN_SPECIAL_BASES: frozenset[Any] = frozenset([
 class TypeScriptNodeTranslationResult:
     type_declarations: list[TopLevelDeclarationNode]
     errors: list[str]
+    declared_py_types: list[object] = field(default_factory=list[object])
+    """The Python types that `type_declarations` were generated from, in the same order."""
 
 
 _LIST_TYPES: set[object] = {
@@ -445,4 +447,4 @@ def python_type_to_typescript_nodes(root_py_type: object) -> TypeScriptNodeTrans
     type_declarations = cast(list[TopLevelDeclarationNode], list(declared_types.values()))
     assert None not in type_declarations
 
-    return TypeScriptNodeTranslationResult(type_declarations, errors)
+    return TypeScriptNodeTranslationResult(type_declarations, errors, list(declared_types.keys()))
@@ -0,0 +1,254 @@
+from collections import Counter
+import math
+import re
+
+from typechat._internal.ts_conversion.ts_node_to_string import DEFAULT_EMIT_OPTIONS, TypeScriptEmitOptions, ts_declarations_to_str
+from typechat._internal.ts_conversion.ts_type_nodes import (
+    ArrayTypeNode,
+    IdentifierNode,
+    IndexSignatureDeclarationNode,
+    InterfaceDeclarationNode,
+    LiteralTypeNode,
+    PropertyDeclarationNode,
+    TopLevelDeclarationNode,
+    TupleTypeNode,
+    TypeAliasDeclarationNode,
+    TypeNode,
+    TypeReferenceNode,
+    UnionTypeNode,
+)
+
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+# Words that say nothing about which part of a schema a request is about.
+_STOP_WORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from", "has", "have", "if", "in", "into", "is",
+    "it", "its", "me", "my", "no", "not", "of", "on", "or", "so", "that", "the", "their", "them", "then", "there",
+    "these", "this", "to", "too", "was", "we", "what", "when", "which", "will", "with", "you", "your",
+])
+
+def _tokenize(text: str) -> set[str]:
+    tokens: set[str] = set()
+    for word in _WORD.findall(text):
+        word = word.lower()
+        if word in _STOP_WORDS:
+            continue
+        # A crude stemmer, applied alike to schemas and requests: "lattes" matches "latte".
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.add(word)
+    return tokens
+
+def _referenced_names(type_node: TypeNode) -> list[str]:
+    match type_node:
+        case TypeReferenceNode(name, type_arguments):
+            names = [name.text] if isinstance(name, IdentifierNode) else []
+            for arg in type_arguments or []:
+                names.extend(_referenced_names(arg))
+            return names
+        case ArrayTypeNode(element_type):
+            return _referenced_names(element_type)
+        case TupleTypeNode(element_types) | UnionTypeNode(element_types):
+            return [name for element_type in element_types for name in _referenced_names(element_type)]
+        case LiteralTypeNode():
+            return []
+
+def literal_values(type_node: TypeNode, strings_only: bool = False) -> list[str]:
+    match type_node:
+        case LiteralTypeNode(value):
+            return [value] if isinstance(value, str) else [] if strings_only else [str(value)]
+        case TypeReferenceNode(_, type_arguments):
+            return [value for arg in type_arguments or [] for value in literal_values(arg, strings_only)]
+        case ArrayTypeNode(element_type):
+            return literal_values(element_type, strings_only)
+        case TupleTypeNode(element_types) | UnionTypeNode(element_types):
+            return [value for element_type in element_types for value in literal_values(element_type, strings_only)]
+
+def declaration_types(declaration: TopLevelDeclarationNode) -> list[TypeNode]:
+    match declaration:
+        case InterfaceDeclarationNode(_, _, _, base_types, members):
+            type_nodes = list(base_types or [])
+            for member in members:
+                match member:
+                    case PropertyDeclarationNode(_, _, _, annotation):
+                        type_nodes.append(annotation)
+                    case IndexSignatureDeclarationNode(key_type, value_type):
+                        type_nodes.extend([key_type, value_type])
+            return type_nodes
+        case TypeAliasDeclarationNode(_, _, _, target):
+            return [target]
+
+def _declaration_text(declaration: TopLevelDeclarationNode) -> str:
+    "The words of a declaration that a request might mention: its name, comments, property names and literal values."
+    parts = [declaration.name, declaration.comment]
+    if isinstance(declaration, InterfaceDeclarationNode):
+        for member in declaration.members:
+            if isinstance(member, PropertyDeclarationNode):
+                parts.extend([member.name, member.comment])
+    for type_node in declaration_types(declaration):
+        parts.extend(literal_values(type_node))
+    return " ".join(parts)
+
+class SchemaPruner:
+    """
+    Writes out the parts of a schema that are relevant to a particular request.
+
+    Schemas are often built around unions of many alternatives (kinds of products, kinds of actions, ...), of which a
+    single request only mentions a few. Each interface that is an alternative of such a union is indexed once by the
+    words of its declaration and of the declarations only it leads to. For a given request, union alternatives that
+    share no distinctive words with the request are dropped, and only declarations still reachable from the root are
+    written out. A union none of whose alternatives match is kept whole.
+    """
+
+    full_schema_str: str
+    "The complete schema, written with the same options as pruned schemas."
+
+    min_relative_score: float
+    "Alternatives scoring less than this fraction of the best-scoring alternative of their union are dropped."
+
+    _declarations: dict[str, TopLevelDeclarationNode]
+    _root_name: str
+    _options: TypeScriptEmitOptions
+    _union_alternatives: set[str]
+    _alternative_tokens: dict[str, set[str]]
+    _token_weights: dict[str, float]
+
+    def __init__(
+        self,
+        declarations: list[TopLevelDeclarationNode],
+        options: TypeScriptEmitOptions = DEFAULT_EMIT_OPTIONS,
+        min_relative_score: float = 0.25,
+    ) -> None:
+        super().__init__()
+        self._declarations = {declaration.name: declaration for declaration in declarations}
+        self._root_name = declarations[0].name
+        self._options = options
+        self.min_relative_score = min_relative_score
+        self.full_schema_str = ts_declarations_to_str(declarations, options)
+
+        self._union_alternatives = set()
+        for declaration in declarations:
+            for type_node in declaration_types(declaration):
+                self._find_union_alternatives(type_node)
+
+        self._alternative_tokens = {
+            name: self._collect_tokens(name, set()) for name in self._union_alternatives
+        }
+        document_frequencies = Counter(token for tokens in self._alternative_tokens.values() for token in tokens)
+        alternative_count = len(self._alternative_tokens)
+        # Words shared by every alternative don't help to tell them apart, and get no weight.
+        self._token_weights = {
+            token: math.log(alternative_count / frequency) for token, frequency in document_frequencies.items()
+        }
+
+    def prune(self, request: str) -> str:
+        "Returns the schema for `request`, which is `full_schema_str` if nothing could be dropped."
+        if not self._union_alternatives:
+            return self.full_schema_str
+        request_tokens = _tokenize(request)
+        scores = {
+            name: sum(self._token_weights[token] for token in tokens & request_tokens)
+            for name, tokens in self._alternative_tokens.items()
+        }
+
+        pruned: dict[str, TopLevelDeclarationNode] = {}
+        pending = [self._root_name]
+        while pending:
+            name = pending.pop()
+            if name in pruned or name not in self._declarations:
+                continue
+            declaration = self._prune_declaration(self._declarations[name], scores)
+            pruned[name] = declaration
+            for type_node in declaration_types(declaration):
+                pending.extend(_referenced_names(type_node))
+
+        if len(pruned) == len(self._declarations):
+            return self.full_schema_str
+        # Keep the original declaration order, so that equally relevant requests produce identical schemas.
+        kept_declarations = [pruned[name] for name in self._declarations if name in pruned]
+        return ts_declarations_to_str(kept_declarations, self._options)
+
+    def _find_union_alternatives(self, type_node: TypeNode) -> None:
+        match type_node:
+            case UnionTypeNode(types):
+                alternatives = self._interface_alternatives(types)
+                if len(alternatives) > 1:
+                    self._union_alternatives.update(alternatives)
+                for member in types:
+                    self._find_union_alternatives(member)
+            case TypeReferenceNode(_, type_arguments):
+                for arg in type_arguments or []:
+                    self._find_union_alternatives(arg)
+            case ArrayTypeNode(element_type):
+                self._find_union_alternatives(element_type)
+            case TupleTypeNode(element_types):
+                for element_type in element_types:
+                    self._find_union_alternatives(element_type)
+            case LiteralTypeNode():
+                pass
+
+    def _interface_alternatives(self, types: list[TypeNode]) -> list[str]:
+        return [
+            type_node.name.text
+            for type_node in types
+            if isinstance(type_node, TypeReferenceNode)
+            and type_node.type_arguments is None
+            and isinstance(type_node.name, IdentifierNode)
+            and isinstance(self._declarations.get(type_node.name.text), InterfaceDeclarationNode)
+        ]
+
+    def _collect_tokens(self, name: str, visited: set[str]) -> set[str]:
+        "Collects the words of a declaration, and of the declarations it leads to that aren't alternatives themselves."
+        visited.add(name)
+        declaration = self._declarations[name]
+        tokens = _tokenize(_declaration_text(declaration))
+        for type_node in declaration_types(declaration):
+            for referenced_name in _referenced_names(type_node):
+                if (
+                    referenced_name in self._declarations
+                    and referenced_name not in visited
+                    and referenced_name not in self._union_alternatives
+                ):
+                    tokens |= self._collect_tokens(referenced_name, visited)
+        return tokens
+
+    def _prune_declaration(self, declaration: TopLevelDeclarationNode, scores: dict[str, float]) -> TopLevelDeclarationNode:
+        match declaration:
+            case InterfaceDeclarationNode(name, type_parameters, comment, base_types, members):
+                pruned_members: list[PropertyDeclarationNode | IndexSignatureDeclarationNode] = []
+                for member in members:
+                    match member:
+                        case PropertyDeclarationNode(member_name, is_optional, member_comment, annotation):
+                            pruned_members.append(
+                                PropertyDeclarationNode(member_name, is_optional, member_comment, self._prune_type(annotation, scores))
+                            )
+                        case IndexSignatureDeclarationNode(key_type, value_type):
+                            pruned_members.append(IndexSignatureDeclarationNode(key_type, self._prune_type(value_type, scores)))
+                return InterfaceDeclarationNode(name, type_parameters, comment, base_types, pruned_members)
+            case TypeAliasDeclarationNode(name, type_parameters, comment, target):
+                return TypeAliasDeclarationNode(name, type_parameters, comment, self._prune_type(target, scores))
+
+    def _prune_type(self, type_node: TypeNode, scores: dict[str, float]) -> TypeNode:
+        match type_node:
+            case UnionTypeNode(types):
+                alternatives = self._interface_alternatives(types)
+                best_score = max((scores[name] for name in alternatives), default=0.0)
+                if len(alternatives) > 1 and best_score > 0:
+                    dropped = {name for name in alternatives if scores[name] < best_score * self.min_relative_score or scores[name] == 0}
+                    types = [
+                        member
+                        for member in types
+                        if not (isinstance(member, TypeReferenceNode) and isinstance(member.name, IdentifierNode) and member.name.text in dropped)
+                    ]
+                pruned_types = [self._prune_type(member, scores) for member in types]
+                return pruned_types[0] if len(pruned_types) == 1 else UnionTypeNode(pruned_types)
+            case TypeReferenceNode(name, type_arguments):
+                if type_arguments is None:
+                    return type_node
+                return TypeReferenceNode(name, [self._prune_type(arg, scores) for arg in type_arguments])
+            case ArrayTypeNode(element_type):
+                return ArrayTypeNode(self._prune_type(element_type, scores))
+            case TupleTypeNode(element_types):
+                return TupleTypeNode([self._prune_type(element_type, scores) for element_type in element_types])
+            case LiteralTypeNode():
+                return type_node
@@ -1,5 +1,7 @@
+from collections import Counter
+from dataclasses import dataclass, replace
 import json
-from typing_extensions import assert_never
+from typing_extensions import Literal, assert_never
 
 from typechat._internal.ts_conversion.ts_type_nodes import (
     ArrayTypeNode,
@@ -18,29 +20,72 @@ from typechat._internal.ts_conversion.ts_type_nodes import (
 )
 
 
-def comment_to_str(comment_text: str, indentation: str) -> str:
-    comment_text = comment_text.strip()
-    if not comment_text:
+@dataclass(frozen=True)
+class TypeScriptEmitOptions:
+    """
+    Controls how TypeScript declarations are written out. The defaults produce readable, indented declarations;
+    `TypeScriptEmitOptions.compact()` produces a schema that spends as few tokens as possible on layout.
+    """
+
+    minify: bool = False
+    "Drop indentation and optional whitespace, writing each declaration on a single line."
+
+    comments: Literal["all", "first_line", "none"] = "all"
+    "Keep every comment, only the first line of each comment, or no comments at all."
+
+    inline_single_use_interfaces: bool = False
+    "Write interfaces that are referenced exactly once as object literal types at the point of use."
+
+    @classmethod
+    def compact(cls, comments: Literal["all", "first_line", "none"] = "first_line") -> "TypeScriptEmitOptions":
+        return cls(minify=True, comments=comments, inline_single_use_interfaces=True)
+
+DEFAULT_EMIT_OPTIONS = TypeScriptEmitOptions()
+
+
+def comment_to_str(comment_text: str, indentation: str, options: TypeScriptEmitOptions = DEFAULT_EMIT_OPTIONS) -> str:
+    lines = _comment_lines(comment_text, options)
+    if not lines:
         return ""
+    if options.minify:
+        return _block_comment_to_str(lines, "")
+    return "\n".join([f"{indentation}// {line}" for line in lines]) + "\n"
+
+
+def _comment_lines(comment_text: str, options: TypeScriptEmitOptions) -> list[str]:
+    comment_text = comment_text.strip()
+    if not comment_text or options.comments == "none":
+        return []
     lines = [line.strip() for line in comment_text.splitlines()]
+    return lines[:1] if options.comments == "first_line" else lines
 
-    return "\n".join([f"{indentation}// {line}" for line in lines]) + "\n"
+
+def _block_comment_to_str(lines: list[str], padding: str) -> str:
+    # Block comments can sit in the middle of a line; `*/` would end one early.
+    return "".join([f"/*{padding}{line.replace('*/', '* /')}{padding}*/{padding}" for line in lines])
 
 
-def ts_type_to_str(type_node: TypeNode) -> str:
+def ts_type_to_str(
+    type_node: TypeNode,
+    options: TypeScriptEmitOptions = DEFAULT_EMIT_OPTIONS,
+    inlined_interfaces: dict[str, InterfaceDeclarationNode] | None = None,
+) -> str:
+    separator = "," if options.minify else ", "
     match type_node:
         case TypeReferenceNode(name, type_arguments):
             assert isinstance(name, IdentifierNode)
             if type_arguments is None:
+                if inlined_interfaces and name.text in inlined_interfaces:
+                    return _object_literal_to_str(inlined_interfaces[name.text], options, inlined_interfaces)
                 return name.text
-            return f"{name.text}<{', '.join([ts_type_to_str(arg) for arg in type_arguments])}>"
+            return f"{name.text}<{separator.join([ts_type_to_str(arg, options, inlined_interfaces) for arg in type_arguments])}>"
         case ArrayTypeNode(element_type):
             assert type(element_type) is not UnionTypeNode
             # if type(element_type) is UnionTypeNode:
             #     return f"Array<{ts_type_to_str(element_type)}>"
-            return f"{ts_type_to_str(element_type)}[]"
+            return f"{ts_type_to_str(element_type, options, inlined_interfaces)}[]"
         case TupleTypeNode(element_types):
-            return f"[{', '.join([ts_type_to_str(element_type) for element_type in element_types])}]"
+            return f"[{separator.join([ts_type_to_str(element_type, options, inlined_interfaces) for element_type in element_types])}]"
         case UnionTypeNode(types):
             # Remove duplicates, but try to preserve order of types,
             # and put null at the end if it's present.
@@ -51,46 +96,144 @@ def ts_type_to_str(type_node: TypeNode) -> str:
                 if type_node is NullTypeReferenceNode:
                     nullable = True
                     continue
-                type_str = ts_type_to_str(type_node)
+                type_str = ts_type_to_str(type_node, options, inlined_interfaces)
                 if type_str not in str_set:
                     str_set.add(type_str)
                     type_strs.append(type_str)
             if nullable:
                 type_strs.append("null")
-            return " | ".join(type_strs)
+            return ("|" if options.minify else " | ").join(type_strs)
         case LiteralTypeNode(value):
             return json.dumps(value)
         # case _:
         #     raise NotImplementedError(f"Unhandled type {type(type_node)}")
     assert_never(type_node)
 
-def object_member_to_str(member: PropertyDeclarationNode | IndexSignatureDeclarationNode) -> str:
+def object_member_to_str(
+    member: PropertyDeclarationNode | IndexSignatureDeclarationNode,
+    options: TypeScriptEmitOptions = DEFAULT_EMIT_OPTIONS,
+    inlined_interfaces: dict[str, InterfaceDeclarationNode] | None = None,
+) -> str:
+    indentation = "" if options.minify else "    "
+    colon = ":" if options.minify else ": "
     match member:
         case PropertyDeclarationNode(name, is_optional, comment, annotation):
-            comment = comment_to_str(comment, "    ")
+            comment = comment_to_str(comment, indentation, options)
             if not name.isidentifier():
                 name = json.dumps(name)
-            return f"{comment}    {name}{'?' if is_optional else ''}: {ts_type_to_str(annotation)};"
+            return f"{comment}{indentation}{name}{'?' if is_optional else ''}{colon}{ts_type_to_str(annotation, options, inlined_interfaces)};"
         case IndexSignatureDeclarationNode(key_type, value_type):
-            return f"[key: {ts_type_to_str(key_type)}]: {ts_type_to_str(value_type)};"
+            return f"[key{colon}{ts_type_to_str(key_type, options, inlined_interfaces)}]{colon}{ts_type_to_str(value_type, options, inlined_interfaces)};"
         # case _:
         #     raise NotImplementedError(f"Unhandled member type {type(member)}")
     assert_never(member)
 
 
-def ts_declaration_to_str(declaration: TopLevelDeclarationNode) -> str:
+def ts_declaration_to_str(
+    declaration: TopLevelDeclarationNode,
+    options: TypeScriptEmitOptions = DEFAULT_EMIT_OPTIONS,
+    inlined_interfaces: dict[str, InterfaceDeclarationNode] | None = None,
+) -> str:
+    separator = "," if options.minify else ", "
     match declaration:
         case InterfaceDeclarationNode(name, type_parameters, comment, base_types, members):
-            comment = comment_to_str(comment, "")
-            type_param_str = f"<{', '.join([param.name for param in type_parameters])}>" if type_parameters else ""
+            comment = comment_to_str(comment, "", options)
+            type_param_str = f"<{separator.join([param.name for param in type_parameters])}>" if type_parameters else ""
             base_type_str = (
-                f" extends {', '.join([ts_type_to_str(base_type) for base_type in base_types])}" if base_types else ""
+                f" extends {separator.join([ts_type_to_str(base_type, options, inlined_interfaces) for base_type in base_types])}" if base_types else ""
             )
-            members_str = "\n".join([f"{object_member_to_str(member)}" for member in members]) + "\n" if members else ""
+            if options.minify:
+                members_str = "".join([object_member_to_str(member, options, inlined_interfaces) for member in members])
+                return f"{comment}interface {name}{type_param_str}{base_type_str}{{{members_str}}}\n"
+            members_str = "\n".join([f"{object_member_to_str(member, options, inlined_interfaces)}" for member in members]) + "\n" if members else ""
             return f"{comment}interface {name}{type_param_str}{base_type_str} {{\n{members_str}}}\n"
         case TypeAliasDeclarationNode(name, type_parameters, comment, target):
-            type_param_str = f"<{', '.join([param.name for param in type_parameters])}>" if type_parameters else ""
-            return f"type {name}{type_param_str} = {ts_type_to_str(target)}\n"
+            type_param_str = f"<{separator.join([param.name for param in type_parameters])}>" if type_parameters else ""
+            equals = "=" if options.minify else " = "
+            return f"type {name}{type_param_str}{equals}{ts_type_to_str(target, options, inlined_interfaces)}\n"
         # case _:
         #     raise NotImplementedError(f"Unhandled declaration type {type(declaration)}")
     assert_never(declaration)
+
+
+def ts_declarations_to_str(
+    declarations: list[TopLevelDeclarationNode],
+    options: TypeScriptEmitOptions = DEFAULT_EMIT_OPTIONS,
+) -> str:
+    """
+    Writes out all declarations of a schema. The first declaration is the schema's entry point,
+    so it is never inlined into another declaration.
+    """
+    inlined_interfaces = _find_single_use_interfaces(declarations) if options.inline_single_use_interfaces else {}
+    decl_strs = [
+        ts_declaration_to_str(declaration, options, inlined_interfaces)
+        for declaration in declarations
+        if declaration.name not in inlined_interfaces
+    ]
+    return ("" if options.minify else "\n").join(decl_strs)
+
+
+def _object_literal_to_str(
+    interface: InterfaceDeclarationNode,
+    options: TypeScriptEmitOptions,
+    inlined_interfaces: dict[str, InterfaceDeclarationNode],
+) -> str:
+    if options.minify:
+        comment = comment_to_str(interface.comment, "", options)
+        members_str = "".join([object_member_to_str(member, options, inlined_interfaces) for member in interface.members])
+        return f"{comment}{{{members_str}}}"
+
+    # An object literal type is written on one line, so its members' comments become block comments.
+    member_strs: list[str] = []
+    for member in interface.members:
+        comment = ""
+        if isinstance(member, PropertyDeclarationNode):
+            comment = _block_comment_to_str(_comment_lines(member.comment, options), " ")
+            member = replace(member, comment="")
+        member_strs.append(comment + object_member_to_str(member, options, inlined_interfaces).strip())
+    return f"{{ {' '.join(member_strs)} }}" if member_strs else "{}"
+
+
+def _find_single_use_interfaces(declarations: list[TopLevelDeclarationNode]) -> dict[str, InterfaceDeclarationNode]:
+    reference_counts = Counter[str]()
+
+    def count_references(type_node: TypeNode) -> None:
+        match type_node:
+            case TypeReferenceNode(name, type_arguments):
+                if isinstance(name, IdentifierNode):
+                    reference_counts[name.text] += 1
+                for arg in type_arguments or []:
+                    count_references(arg)
+            case ArrayTypeNode(element_type):
+                count_references(element_type)
+            case TupleTypeNode(element_types) | UnionTypeNode(element_types):
+                for element_type in element_types:
+                    count_references(element_type)
+            case LiteralTypeNode():
+                pass
+
+    for declaration in declarations:
+        match declaration:
+            case InterfaceDeclarationNode(_, _, _, base_types, members):
+                for base_type in base_types or []:
+                    # Base types must stay declared, so count them as an extra use.
+                    count_references(base_type)
+                    count_references(base_type)
+                for member in members:
+                    match member:
+                        case PropertyDeclarationNode(_, _, _, annotation):
+                            count_references(annotation)
+                        case IndexSignatureDeclarationNode(key_type, value_type):
+                            count_references(key_type)
+                            count_references(value_type)
+            case TypeAliasDeclarationNode(_, _, _, target):
+                count_references(target)
+
+    return {
+        declaration.name: declaration
+        for declaration in declarations[1:]
+        if isinstance(declaration, InterfaceDeclarationNode)
+        and not declaration.type_parameters
+        and not declaration.base_types
+        and reference_counts[declaration.name] == 1
+    }
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+import weakref
+from typing_extensions import Any, Generic, TypeVar
+
+from typechat._internal.cache import CacheStats
+
+V = TypeVar("V")
+
+class TypeCache(Generic[V]):
+    """
+    A process-wide cache of values derived from Python types (e.g. validators and TypeScript schemas),
+    keyed by the type plus any options that affect the derived value.
+
+    Cached values often reference their type (a validator does), so a cached type stays alive until its entries are
+    dropped. To keep that bounded when types are created at runtime, the cache holds at most `max_entries` entries,
+    evicting the least recently used one first; `clear_type_caches` drops entries explicitly. Entries are also dropped
+    when their type is garbage collected, which happens right away for values that don't reference the type.
+    Types that can't be weakly referenced (such as `A | B` unions) are not cached.
+    """
+
+    name: str
+    stats: CacheStats
+    max_entries: int
+    _entries: OrderedDict[tuple[int, Hashable], tuple[weakref.ref[object], V]]
+    _watched_type_ids: set[int]
+
+    def __init__(self, name: str, max_entries: int = 256):
+        super().__init__()
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.name = name
+        self.stats = CacheStats()
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._watched_type_ids = set()
+        _all_type_caches.append(self)
+
+    def get_or_create(self, py_type: object, options: Hashable, create: Callable[[], V]) -> V:
+        """
+        Returns the value cached for `py_type` and `options`, calling `create` to produce it on a miss.
+        """
+        try:
+            type_ref = weakref.ref(py_type)
+            key = (id(py_type), options)
+            entry = self._entries.get(key)
+        except TypeError:
+            # Not weakly referenceable (or not hashable).
+            self.stats.misses += 1
+            return create()
+
+        if entry is not None and entry[0]() is py_type:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+        self.stats.misses += 1
+        value = create()
+        self._entries[key] = (type_ref, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if key[0] not in self._watched_type_ids:
+            self._watched_type_ids.add(key[0])
+            weakref.finalize(py_type, self._forget_type_id, key[0])
+        return value
+
+    def invalidate(self, py_type: object | None = None) -> None:
+        "Drops the values cached for `py_type`, or for every type if `py_type` is `None`."
+        if py_type is None:
+            self._entries.clear()
+            return
+        type_id = id(py_type)
+        for key in [key for key, (type_ref, _) in self._entries.items() if key[0] == type_id and type_ref() is py_type]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _forget_type_id(self, type_id: int) -> None:
+        "Drops the entries of a type that has been garbage collected (before its id can be reused)."
+        self._watched_type_ids.discard(type_id)
+        for key in [key for key in self._entries if key[0] == type_id]:
+            del self._entries[key]
+
+_all_type_caches: list[TypeCache[Any]] = []
+
+def clear_type_caches(py_type: object | None = None) -> None:
+    """
+    Drops the validators and TypeScript schemas that TypeChat has cached for `py_type`,
+    or everything cached if `py_type` is `None`. Use this after redefining a type at runtime.
+    """
+    for type_cache in _all_type_caches:
+        type_cache.invalidate(py_type)
+
+def type_cache_stats() -> dict[str, CacheStats]:
+    "Returns the hit and miss counts of each of TypeChat's process-wide type caches, by name."
+    return {type_cache.name: type_cache.stats for type_cache in _all_type_caches}
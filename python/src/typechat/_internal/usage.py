@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+@dataclass
+class CompletionUsage:
+    """
+    Token counts and latency of one or more completions, as reported by the model endpoint.
+
+    `HttpxLanguageModel` attaches the usage of each completion to its `Success` (see `Success.usage`), and
+    `TypeChatJsonTranslator` adds up the usage of all the completions made for a translation, including repairs.
+    """
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    "Prompt tokens (included in `prompt_tokens`) that the provider served from its prompt cache."
+    latency_seconds: float = 0.0
+    "The time spent waiting for the completions, including any retries."
+    completions: int = 0
+    "The number of completions counted."
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, other: "CompletionUsage") -> None:
+        "Adds the counts of `other` to this usage."
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_prompt_tokens += other.cached_prompt_tokens
+        self.latency_seconds += other.latency_seconds
+        self.completions += other.completions
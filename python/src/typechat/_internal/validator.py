@@ -1,10 +1,15 @@
+import collections.abc
 import json
-from typing_extensions import Generic, TypeVar
+from dataclasses import dataclass, is_dataclass
+from typing_extensions import Annotated, Any, Generic, LiteralString, NotRequired, Required, TypeVar, cast, get_args, get_origin, get_type_hints, is_typeddict
 
 import pydantic
 import pydantic_core
+from pydantic_core import core_schema
 
 from typechat._internal.result import Failure, Result, Success
+from typechat._internal.tracing import start_span
+from typechat._internal.type_cache import TypeCache
 
 T = TypeVar("T", covariant=True)
 
@@ -13,7 +18,10 @@ class TypeChatValidator(Generic[T]):
     Validates an object against a given Python type.
     """
 
+    _py_type: type[T]
     _adapted_type: pydantic.TypeAdapter[T]
+    _validator: pydantic_core.SchemaValidator
+    _property_adapters: "dict[str, _PropertyAdapters] | None"
 
     def __init__(self, py_type: type[T]):
         """
@@ -22,39 +30,235 @@ class TypeChatValidator(Generic[T]):
             py_type: The schema type to validate against.
         """
         super().__init__()
-        self._adapted_type = pydantic.TypeAdapter(py_type)
+        self._py_type = py_type
+        self._adapted_type, self._validator = _validator_cache.get_or_create(py_type, None, lambda: _create_validators(py_type))
+        self._property_adapters = None
 
     def validate_object(self, obj: object) -> Result[T]:
         """
         Validates the given Python object according to the associated schema type.
 
+        The object is expected to be JSON data (as produced by `json.loads` or `pydantic_core.from_json`), and is
+        validated as strictly as its JSON text would be - e.g. a string is never coerced into a number, and a datetime
+        is only read from a complete ISO 8601 datetime string - except that types which JSON can only represent
+        indirectly (dataclasses, tuples and so on) accept those representations.
+
         Returns a `Success[T]` object containing the object if validation was successful.
         Otherwise, returns a `Failure` object with a `message` property describing the error.
         """
+        with start_span("typechat.validate_object") as span:
+            try:
+                result: Result[T] = Success(self._validator.validate_python(obj))
+            except pydantic.ValidationError as validation_error:
+                result = _handle_error(validation_error)
+            span.set_attribute("typechat.valid", isinstance(result, Success))
+            return result
+
+    def validate_json_text(self, json_text: str | bytes | bytearray) -> Result[T]:
+        """
+        Parses and validates JSON text according to the associated schema type in a single pass,
+        without first materializing the parsed JSON as Python objects.
+
+        Returns a `Success[T]` object containing the object if validation was successful.
+        Otherwise, returns a `Failure` object with a `message` property describing the error
+        (including where parsing failed, if the text is not well-formed JSON). `NaN` and `Infinity`
+        are not JSON, so text containing them outside of strings is reported as malformed.
+
+        If a subclass overrides `validate_object`, the text is parsed first and passed to it instead,
+        so that its validation rules still apply.
+        """
+        if type(self).validate_object is not TypeChatValidator[Any].validate_object:
+            parsed = _parse_json(json_text)
+            return parsed if isinstance(parsed, Failure) else self.validate_object(parsed)
+
+        with start_span("typechat.validate_json") as span:
+            # pydantic's own parser accepts non-finite numbers, so text that may contain them is parsed separately.
+            if _may_contain_non_finite_numbers(json_text):
+                parsed = _parse_json(json_text)
+                if isinstance(parsed, Failure):
+                    span.set_attribute("typechat.valid", False)
+                    return parsed
+                validate = lambda: self._validator.validate_python(parsed)
+            else:
+                validate = lambda: self._validator.validate_json(json_text, strict=True)
+            try:
+                result: Result[T] = Success(validate())
+            except pydantic.ValidationError as validation_error:
+                result = _handle_error(validation_error)
+            span.set_attribute("typechat.valid", isinstance(result, Success))
+            return result
+
+    def json_schema(self) -> dict[str, Any]:
+        """
+        Returns a JSON Schema describing the associated schema type, as generated by pydantic.
+        """
+        return self._adapted_type.json_schema()
+
+    def validate_property_json(self, name: str, value_json: str, element_index: int | None = None) -> Failure | None:
+        """
+        Validates a single property of a JSON object of the associated schema type, before the rest of the object
+        is available (e.g. while a completion is still being streamed). If `element_index` is given, `value_json`
+        is instead one element of the array that is the property's value.
+
+        Returns a `Failure` if the value can never be part of a valid object, and `None` otherwise. Properties that
+        can't be checked in isolation (e.g. when the schema type is not a `TypedDict` or dataclass, or the property
+        is not declared on it) are never reported as failures; the complete object must still be validated.
+        """
+        adapters = self._get_property_adapters().get(name)
+        if adapters is None:
+            return None
+        loc_prefix: tuple[str | int, ...]
+        if element_index is None:
+            adapter, loc_prefix = adapters.value, (name,)
+        elif adapters.element is not None:
+            adapter, loc_prefix = adapters.element, (name, element_index)
+        else:
+            return None
+
         try:
-            # TODO: Switch to `validate_python` when validation modes are exposed.
-            # https://github.com/pydantic/pydantic-core/issues/712
-            # We'd prefer to keep `validate_object` as the core method and
-            # allow translators to concern themselves with the JSON instead.
-            # However, under Pydantic's `strict` mode, a `dict` isn't considered compatible
-            # with a dataclass. So for now, jump back to JSON and validate the string.
-            json_str = pydantic_core.to_json(obj)
-            typed_dict = self._adapted_type.validate_json(json_str, strict=True)
-            return Success(typed_dict)
+            adapter.validate_json(value_json, strict=True)
         except pydantic.ValidationError as validation_error:
-            return _handle_error(validation_error)
+            return _handle_error(validation_error, loc_prefix)
+        return None
+
+    def _get_property_adapters(self) -> "dict[str, _PropertyAdapters]":
+        if self._property_adapters is None:
+            py_type = self._py_type
+            self._property_adapters = _property_adapter_cache.get_or_create(py_type, None, lambda: _create_property_adapters(py_type))
+        return self._property_adapters
 
 
-def _handle_error(validation_error: pydantic.ValidationError) -> Failure:
+def _create_validators(py_type: type[Any]) -> tuple[pydantic.TypeAdapter[Any], pydantic_core.SchemaValidator]:
+    adapted_type = pydantic.TypeAdapter[Any](py_type)
+    return adapted_type, pydantic_core.SchemaValidator(_to_json_data_schema(adapted_type.core_schema))
+
+def _parse_json(json_text: str | bytes | bytearray) -> object | Failure:
+    try:
+        return pydantic_core.from_json(json_text, allow_inf_nan=False)
+    except ValueError as e:
+        text = json_text if isinstance(json_text, str) else json_text.decode(errors="replace")
+        return Failure(f"Error: {e}\n\nAttempted to parse:\n\n{text}")
+
+def _may_contain_non_finite_numbers(json_text: str | bytes | bytearray) -> bool:
+    if isinstance(json_text, str):
+        return "NaN" in json_text or "Infinity" in json_text
+    return b"NaN" in json_text or b"Infinity" in json_text
+
+# Core schema types whose strict mode only accepts the Python types that JSON data is parsed into.
+# Strict mode on other types (e.g. dataclasses and tuples) would reject their JSON representations.
+_STRICT_JSON_DATA_SCHEMA_TYPES = {"str", "int", "float", "bool", "list", "dict", "literal"}
+# Core schema types that JSON represents as strings (or, for decimals, numbers) which are parsed more strictly
+# from JSON text than from Python data - e.g. a datetime is never read from a number or a date-only string.
+_JSON_ENCODED_SCHEMA_TYPES = {"datetime", "date", "time", "timedelta", "uuid", "decimal"}
+
+def _to_json_data_schema(schema: object) -> Any:
+    """
+    Returns a copy of a core schema that validates Python JSON data (as produced by `from_json`) the way the
+    schema validates JSON text in strict mode: scalars and collections are strict, non-finite floats
+    (which aren't valid JSON) are rejected, and values of types that JSON encodes as strings are validated
+    from their JSON encoding.
+    """
+    if isinstance(schema, dict):
+        result: dict[str, Any] = {key: _to_json_data_schema(value) for key, value in cast(dict[str, Any], schema).items()}
+        # Note that a dictionary of fields may itself contain a field named "type".
+        schema_type = result.get("type")
+        if not isinstance(schema_type, str):
+            return result
+        if schema_type in _STRICT_JSON_DATA_SCHEMA_TYPES:
+            result["strict"] = True
+        if schema_type == "float":
+            result["allow_inf_nan"] = False
+        if schema_type in _JSON_ENCODED_SCHEMA_TYPES:
+            ref = result.pop("ref", None)
+            wrapper = core_schema.no_info_plain_validator_function(_JsonEncodedValidator(result))
+            if ref is not None:
+                wrapper["ref"] = ref
+            return wrapper
+        return result
+    if isinstance(schema, list):
+        return [_to_json_data_schema(item) for item in cast(list[Any], schema)]
+    return schema
+
+class _JsonEncodedValidator:
+    "Validates a value the way its JSON encoding would be validated in strict mode."
+
+    _validator: pydantic_core.SchemaValidator
+
+    def __init__(self, schema: Any) -> None:
+        super().__init__()
+        self._validator = pydantic_core.SchemaValidator(schema)
+
+    def __call__(self, value: object) -> object:
+        try:
+            return self._validator.validate_json(pydantic_core.to_json(value), strict=True)
+        except pydantic.ValidationError as validation_error:
+            error = validation_error.errors()[0]
+            # The message is kept as is, since it can differ from the one for the same error on Python data.
+            raise pydantic_core.PydanticCustomError(cast(LiteralString, error["type"]), cast(LiteralString, error["msg"])) from None
+
+@dataclass
+class _PropertyAdapters:
+    value: pydantic.TypeAdapter[Any]
+    element: pydantic.TypeAdapter[Any] | None
+
+
+_SEQUENCE_TYPES: set[object] = {
+    list,
+    collections.abc.Sequence,
+    collections.abc.MutableSequence,
+}
+
+
+def _create_property_adapters(py_type: object) -> dict[str, _PropertyAdapters]:
+    """
+    Creates validators for each property of a `TypedDict` or dataclass type (and for the elements of its array-typed properties).
+    """
+    if not (is_typeddict(py_type) or is_dataclass(py_type)):
+        return {}
+
+    try:
+        type_hints = get_type_hints(py_type, include_extras=True)
+    except Exception:
+        return {}
+
+    result: dict[str, _PropertyAdapters] = {}
+    for name, type_hint in type_hints.items():
+        while get_origin(type_hint) in (Required, NotRequired):
+            type_hint = get_args(type_hint)[0]
+        try:
+            value_adapter = pydantic.TypeAdapter[Any](type_hint)
+            element_adapter: pydantic.TypeAdapter[Any] | None = None
+            unannotated_type = _skip_annotated(type_hint)
+            if get_origin(unannotated_type) in _SEQUENCE_TYPES and len(get_args(unannotated_type)) == 1:
+                element_adapter = pydantic.TypeAdapter[Any](get_args(unannotated_type)[0])
+        except Exception:
+            # This property will only be checked as part of the whole object.
+            continue
+        result[name] = _PropertyAdapters(value_adapter, element_adapter)
+    return result
+
+
+def _skip_annotated(py_type: object) -> object:
+    while get_origin(py_type) is Annotated:
+        py_type = get_args(py_type)[0]
+    return py_type
+
+
+def _handle_error(validation_error: pydantic.ValidationError, loc_prefix: tuple[str | int, ...] = ()) -> Failure:
     error_strings: list[str] = []
     for error in validation_error.errors(include_url=False):
         error_string = ""
-        loc_path = error["loc"]
+        loc_path = (*loc_prefix, *error["loc"])
         if loc_path:
             error_string += f"Validation path `{'.'.join(map(str, loc_path))}` "
         else:
             error_string += "Root validation "
         input = error["input"]
+        if error["type"] == "json_invalid":
+            if isinstance(input, bytes | bytearray):
+                input = input.decode(errors="replace")
+            error_strings.append(f"Error: {error.get('ctx', {}).get('error', error['msg'])}\n\nAttempted to parse:\n\n{input}")
+            continue
         error_string += f"failed for value `{json.dumps(input)}` because:\n  {error['msg']}"
         error_strings.append(error_string)
 
@@ -65,3 +269,7 @@ def _handle_error(validation_error: pydantic.ValidationError) -> Failure:
     failure_message += "\n".join(error_strings)
 
     return Failure(failure_message)
+
+
+_validator_cache = TypeCache[tuple[pydantic.TypeAdapter[Any], pydantic_core.SchemaValidator]]("validators")
+_property_adapter_cache = TypeCache[dict[str, _PropertyAdapters]]("property_validators")
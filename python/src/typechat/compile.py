@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: Microsoft Corporation
+#
+# SPDX-License-Identifier: MIT
+"""
+Precompiles the TypeScript schemas of Python types, so that `TypeChatJsonTranslator` can load them
+at startup instead of converting the types.
+
+Usage:
+
+    python -m typechat.compile my_app.schema:Cart [more.types:Type ...] [--cache-dir DIR]
+
+Artifacts are written to `DIR`, which defaults to the `TYPECHAT_SCHEMA_CACHE_DIR` environment variable
+or `~/.cache/typechat/schemas`. Translators load from the same default location.
+"""
+
+import argparse
+import importlib
+import sys
+from typing_extensions import Any
+
+from typechat._internal.precompiled import compile_schema, default_schema_cache_dir
+
+def _resolve_type(spec: str) -> Any:
+    module_name, separator, qualified_name = spec.partition(":")
+    if not separator or not module_name or not qualified_name:
+        raise ValueError(f"Expected a type in the form 'module:Type', but got '{spec}'.")
+    result: Any = importlib.import_module(module_name)
+    for name in qualified_name.split("."):
+        result = getattr(result, name)
+    return result
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m typechat.compile", description="Precompile TypeChat schemas.")
+    parser.add_argument("types", nargs="+", metavar="module:Type", help="The types to precompile.")
+    parser.add_argument("--cache-dir", default=None, help=f"The artifact directory (default: {default_schema_cache_dir()}).")
+    args = parser.parse_args(argv)
+
+    exit_code = 0
+    for spec in args.types:
+        try:
+            artifact_path = compile_schema(_resolve_type(spec), args.cache_dir)
+        except Exception as e:
+            print(f"{spec}: {e}", file=sys.stderr)
+            exit_code = 1
+        else:
+            print(f"{spec}: {artifact_path}")
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
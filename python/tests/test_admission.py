@@ -0,0 +1,87 @@
+import asyncio
+from typing_extensions import override
+
+import typechat
+
+class GatedModel(typechat.TypeChatLanguageModel):
+    "A model whose completions wait until the gate is opened, recording the order in which they started."
+
+    started: list[str]
+    gate: asyncio.Event
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = []
+        self.gate = asyncio.Event()
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        assert isinstance(prompt, str)
+        self.started.append(prompt)
+        await self.gate.wait()
+        return typechat.Success(prompt)
+
+def test_caps_concurrency_and_admits_by_priority():
+    async def run() -> tuple[list[str], list[typechat.Result[str]], typechat.AdmissionQueue]:
+        inner = GatedModel()
+        queue = typechat.AdmissionQueue(max_concurrency=1)
+        interactive = typechat.AdmissionControlledLanguageModel(inner, queue, priority=0)
+        batch = typechat.AdmissionControlledLanguageModel(inner, queue, priority=10)
+
+        tasks = [asyncio.create_task(batch.complete("batch 1"))]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(batch.complete("batch 2")), asyncio.create_task(interactive.complete("interactive"))]
+        await asyncio.sleep(0.01)
+        assert inner.started == ["batch 1"]
+        assert queue.in_flight == 1
+        assert queue.queued == 2
+
+        inner.gate.set()
+        results = await asyncio.gather(*tasks)
+        return inner.started, results, queue
+
+    started, results, queue = asyncio.run(run())
+    assert started == ["batch 1", "interactive", "batch 2"]
+    assert results == [typechat.Success("batch 1"), typechat.Success("batch 2"), typechat.Success("interactive")]
+    assert queue.in_flight == 0
+    assert queue.stats.admitted == 3
+    assert queue.stats.max_wait_seconds > 0
+
+def test_fails_after_max_wait():
+    async def run() -> tuple[typechat.Result[str], typechat.AdmissionQueue]:
+        inner = GatedModel()
+        queue = typechat.AdmissionQueue(max_concurrency=1)
+        model = typechat.AdmissionControlledLanguageModel(inner, queue)
+        model.max_wait_seconds = 0.01
+
+        first = asyncio.create_task(model.complete("first"))
+        await asyncio.sleep(0)
+        result = await model.complete("second")
+        inner.gate.set()
+        await first
+        return result, queue
+
+    result, queue = asyncio.run(run())
+    assert isinstance(result, typechat.AdmissionTimeoutFailure)
+    assert queue.stats.timed_out == 1
+    assert queue.stats.admitted == 1
+    assert queue.in_flight == 0 and queue.queued == 0
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def run() -> list[str]:
+        inner = GatedModel()
+        queue = typechat.AdmissionQueue(max_concurrency=1)
+        model = typechat.AdmissionControlledLanguageModel(inner, queue)
+
+        first = asyncio.create_task(model.complete("first"))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(model.complete("cancelled"))
+        last = asyncio.create_task(model.complete("last"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        inner.gate.set()
+        await asyncio.gather(first, last)
+        assert queue.in_flight == 0
+        return inner.started
+
+    assert asyncio.run(run()) == ["first", "last"]
@@ -0,0 +1,96 @@
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+import time
+
+import pytest
+
+import typechat
+from .test_translator import ExampleABC, FixedModel, v
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = typechat.LRUTranslationCache(max_entries=2)
+    cache.set("a", typechat.Success(1))
+    cache.set("b", typechat.Success(2))
+    assert cache.get("a") == typechat.Success(1)
+    cache.set("c", typechat.Success(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == typechat.Success(1)
+    assert cache.get("c") == typechat.Success(3)
+    assert cache.stats == typechat.CacheStats(hits=3, misses=1)
+
+def test_lru_cache_expires_entries():
+    cache = typechat.LRUTranslationCache(ttl_seconds=0.01)
+    cache.set("a", typechat.Success(1))
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+def test_sqlite_cache_survives_reopening(tmp_path: Path):
+    path = tmp_path / "cache.sqlite"
+    cache = typechat.SqliteTranslationCache(path)
+    cache.set("a", typechat.Success(ExampleABC(a="hello", b=True, c=1)))
+    cache.close()
+
+    reopened = typechat.LRUTranslationCache(backend=typechat.SqliteTranslationCache(path))
+    assert reopened.get("a") == typechat.Success(ExampleABC(a="hello", b=True, c=1))
+    assert len(reopened) == 1
+
+def test_translator_answers_repeated_requests_from_cache():
+    m = FixedModel([
+        '{ "a": "hello", "b": true, "c": 1234 }',
+        '{ "a": "goodbye", "b": false, "c": 0 }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    t.cache = typechat.LRUTranslationCache()
+
+    first = asyncio.run(t.translate("Get me stuff."))
+    second = asyncio.run(t.translate("Get me stuff."))
+    other = asyncio.run(t.translate("Get me other stuff."))
+
+    assert first == second == typechat.Success(ExampleABC(a="hello", b=True, c=1234))
+    assert other == typechat.Success(ExampleABC(a="goodbye", b=False, c=0))
+    assert len(m.conversation) == 4
+    assert t.cache.stats == typechat.CacheStats(hits=1, misses=2)
+
+def test_modifying_a_result_does_not_modify_the_cache():
+    m = FixedModel([
+        '{ "a": "hello", "b": true, "c": 1234 }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    t.cache = typechat.LRUTranslationCache()
+
+    first = asyncio.run(t.translate("Get me stuff."))
+    assert isinstance(first, typechat.Success)
+    first.value.a = "mutated"
+    second = asyncio.run(t.translate("Get me stuff."))
+    assert isinstance(second, typechat.Success)
+    second.value.c = 0
+    assert asyncio.run(t.translate("Get me stuff.")) == typechat.Success(ExampleABC(a="hello", b=True, c=1234))
+
+def test_results_of_unpicklable_types_are_cached_in_memory_only(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    @dataclass
+    class LocalABC:
+        a: str
+        b: bool
+        c: int
+
+    m = FixedModel([
+        '{ "a": "hello", "b": true, "c": 1234 }',
+        '{ "a": "hello", "b": true, "c": 1234 }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(LocalABC), LocalABC)
+    backend = typechat.SqliteTranslationCache(tmp_path / "cache.sqlite")
+    t.cache = typechat.LRUTranslationCache(backend=backend)
+
+    first = asyncio.run(t.translate("Get me stuff."))
+    second = asyncio.run(t.translate("Get me stuff."))
+    assert first == second == typechat.Success(LocalABC(a="hello", b=True, c=1234))
+    assert len(m.conversation) == 2
+    assert "can't be pickled" in caplog.text
+
+    # The persistent backend didn't store the result, so a new in-memory cache misses.
+    t.cache = typechat.LRUTranslationCache(backend=backend)
+    assert asyncio.run(t.translate("Get me stuff.")) == first
+    assert len(m.conversation) == 4
+    backend.close()
@@ -0,0 +1,96 @@
+import asyncio
+from typing_extensions import override
+
+import typechat
+
+class SwitchableModel(typechat.TypeChatLanguageModel):
+    result: typechat.Result[str]
+    calls: int
+
+    def __init__(self, result: typechat.Result[str]) -> None:
+        super().__init__()
+        self.result = result
+        self.calls = 0
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        self.calls += 1
+        return self.result
+
+def create_breaker(inner: SwitchableModel) -> typechat.CircuitBreakerLanguageModel:
+    breaker = typechat.CircuitBreakerLanguageModel(inner)
+    breaker.minimum_calls = 4
+    breaker.failure_rate_threshold = 0.5
+    breaker.open_seconds = 0.05
+    return breaker
+
+def test_opens_after_failure_rate_and_fails_fast():
+    inner = SwitchableModel(typechat.HttpStatusFailure("REST API error 503", 503))
+    breaker = create_breaker(inner)
+
+    async def run() -> list[typechat.Result[str]]:
+        return [await breaker.complete("hi") for _ in range(6)]
+
+    results = asyncio.run(run())
+    assert inner.calls == 4
+    assert breaker.state == "open"
+    assert all(isinstance(result, typechat.CircuitOpenFailure) for result in results[4:])
+    assert not isinstance(results[3], typechat.CircuitOpenFailure)
+
+def test_client_errors_do_not_open_circuit():
+    inner = SwitchableModel(typechat.HttpStatusFailure("REST API error 400", 400))
+    breaker = create_breaker(inner)
+
+    async def run():
+        for _ in range(10):
+            await breaker.complete("hi")
+
+    asyncio.run(run())
+    assert breaker.state == "closed"
+    assert inner.calls == 10
+
+def test_half_open_trial_closes_or_reopens_circuit():
+    inner = SwitchableModel(typechat.Failure("Connection refused"))
+    breaker = create_breaker(inner)
+
+    async def run():
+        for _ in range(4):
+            await breaker.complete("hi")
+        assert breaker.state == "open"
+
+        # A failed trial reopens the circuit.
+        await asyncio.sleep(0.06)
+        assert breaker.state == "half_open"
+        assert await breaker.complete("hi") == typechat.Failure("Connection refused")
+        assert breaker.state == "open"
+
+        # A successful trial closes it.
+        inner.result = typechat.Success("hello")
+        await asyncio.sleep(0.06)
+        assert await breaker.complete("hi") == typechat.Success("hello")
+        assert breaker.state == "closed"
+
+    asyncio.run(run())
+    assert inner.calls == 6
+
+def test_half_open_limits_concurrent_trials():
+    class SlowModel(SwitchableModel):
+        @override
+        async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+            await asyncio.sleep(0.01)
+            return await super().complete(prompt)
+
+    inner = SlowModel(typechat.Failure("Connection refused"))
+    breaker = create_breaker(inner)
+
+    async def run() -> list[typechat.Result[str]]:
+        for _ in range(4):
+            await breaker.complete("hi")
+        inner.result = typechat.Success("hello")
+        await asyncio.sleep(0.06)
+        return await asyncio.gather(*(breaker.complete("hi") for _ in range(3)))
+
+    results = asyncio.run(run())
+    assert results[0] == typechat.Success("hello")
+    assert all(isinstance(result, typechat.CircuitOpenFailure) for result in results[1:])
+    assert breaker.state == "closed"
@@ -0,0 +1,50 @@
+from typing_extensions import Literal, NotRequired, TypedDict, Annotated, Doc
+
+from typechat import TypeScriptEmitOptions, python_type_to_typescript_schema
+from .test_coffeeshop import Cart
+
+class Address(TypedDict):
+    """
+    A postal address.
+    Only used for deliveries.
+    """
+
+    street: str
+    city: Annotated[str, Doc("The city,\nwithout the postal code")]
+
+class Contact(TypedDict):
+    name: str
+    kind: Literal["person", "company"]
+
+class Order(TypedDict):
+    contact: Contact
+    billing: NotRequired[Contact]
+    address: Address
+    note: str | None
+
+
+def test_default_options_are_unchanged():
+    assert python_type_to_typescript_schema(Order) == python_type_to_typescript_schema(Order, TypeScriptEmitOptions())
+
+
+def test_compact_schema():
+    result = python_type_to_typescript_schema(Order, TypeScriptEmitOptions.compact())
+    assert result.typescript_schema_str == (
+        'interface Order{contact:Contact;billing?:Contact;address:/*A postal address.*/{street:string;/*The city,*/city:string;};note:string|null;}\n'
+        'interface Contact{name:string;kind:"person"|"company";}\n'
+    )
+    assert result.typescript_type_reference == "Order"
+
+
+def test_compact_schema_without_comments():
+    result = python_type_to_typescript_schema(Order, TypeScriptEmitOptions(minify=True, comments="none"))
+    assert "/*" not in result.typescript_schema_str
+    assert "interface Address{street:string;city:string;}\n" in result.typescript_schema_str
+
+
+def test_compact_schema_uses_fewer_tokens():
+    default_result = python_type_to_typescript_schema(Cart)
+    compact_result = python_type_to_typescript_schema(Cart, TypeScriptEmitOptions.compact())
+    assert 0 < compact_result.estimated_token_count < default_result.estimated_token_count * 0.8
+    # Interfaces used in several places are still declared once.
+    assert compact_result.typescript_schema_str.count("interface UnknownText{") == 1
@@ -0,0 +1,71 @@
+import asyncio
+from typing_extensions import override
+
+import typechat
+
+class DelayedModel(typechat.TypeChatLanguageModel):
+    "A model whose completions take the given number of seconds, one after another."
+
+    delays: list[float]
+    calls: int
+    cancelled: int
+
+    def __init__(self, delays: list[float]) -> None:
+        super().__init__()
+        self.delays = delays
+        self.calls = 0
+        self.cancelled = 0
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        call = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delays[call])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return typechat.Success(f"response {call}")
+
+def test_fast_completion_is_not_hedged():
+    inner = DelayedModel([0.0])
+    model = typechat.HedgedLanguageModel(inner)
+    assert asyncio.run(model.complete("hi")) == typechat.Success("response 0")
+    assert inner.calls == 1
+    assert model.stats == typechat.HedgingStats(requests=1, hedged_requests=0, hedge_wins=0)
+
+def test_slow_completion_is_hedged_and_loser_cancelled():
+    inner = DelayedModel([10.0, 0.0])
+    model = typechat.HedgedLanguageModel(inner)
+    model.initial_hedge_delay_seconds = 0.01
+    assert asyncio.run(model.complete("hi")) == typechat.Success("response 1")
+    assert inner.calls == 2
+    assert inner.cancelled == 1
+    assert model.stats == typechat.HedgingStats(requests=1, hedged_requests=1, hedge_wins=1)
+
+def test_hedge_delay_follows_latency_percentile():
+    model = typechat.HedgedLanguageModel(DelayedModel([]))
+    model.min_samples = 10
+    model.hedge_percentile = 90
+    assert model.hedge_delay_seconds == model.initial_hedge_delay_seconds
+    for latency in range(1, 11):
+        model._record_latency(latency / 100)  # pyright: ignore[reportPrivateUsage]
+    assert model.hedge_delay_seconds == 0.09
+    model.window_size = 10
+    model._record_latency(1.0)  # pyright: ignore[reportPrivateUsage]
+    assert model.hedge_delay_seconds == 0.1
+
+def test_failure_waits_for_other_requests():
+    class FailingThenSlowModel(DelayedModel):
+        @override
+        async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+            if self.calls == 0:
+                self.calls += 1
+                await asyncio.sleep(0.05)
+                return typechat.Failure("Upstream error")
+            return await super().complete(prompt)
+
+    inner = FailingThenSlowModel([0.0, 0.1])
+    model = typechat.HedgedLanguageModel(inner)
+    model.initial_hedge_delay_seconds = 0.01
+    assert asyncio.run(model.complete("hi")) == typechat.Success("response 1")
@@ -0,0 +1,81 @@
+import time
+
+from typechat._internal.json_scanner import IncrementalJsonScanner, find_json_value
+
+def scan(text: str, chunk_size: int) -> str | None:
+    scanner = IncrementalJsonScanner()
+    for i in range(0, len(text), chunk_size):
+        if scanner.feed(text[i:i + chunk_size]):
+            break
+    if scanner.start is None or scanner.end is None:
+        return None
+    return text[scanner.start:scanner.end]
+
+def test_finds_object_regardless_of_chunking():
+    text = 'Sure! {"a": "x}\\"{", "b": [1, {"c": "\\\\"}]} and {more} text'
+    for chunk_size in (1, 2, 3, 7, len(text)):
+        assert scan(text, chunk_size) == '{"a": "x}\\"{", "b": [1, {"c": "\\\\"}]}'
+
+def test_incomplete_object():
+    scanner = IncrementalJsonScanner()
+    assert not scanner.feed('prose { "a": "}')
+    assert scanner.start == 6
+    assert scanner.end is None
+
+def find(text: str, allow_arrays: bool = False) -> str | None:
+    span = find_json_value(text, allow_arrays=allow_arrays)
+    return None if span is None else text[span[0]:span[1]]
+
+def test_find_json_value_skips_prose_with_braces():
+    text = 'Fill in {name} and {count} like so: {"name": "a}", "count": {"n": 1}} - see {docs}.'
+    assert find(text) == '{"name": "a}", "count": {"n": 1}}'
+
+def test_find_json_value_handles_escapes():
+    assert find(r'{"a": "\"}\\", "b": []} trailing }') == r'{"a": "\"}\\", "b": []}'
+
+def test_find_json_value_prefers_fenced_block():
+    text = 'Given {"example": 1}, the answer is:\n```json\n{"answer": 2}\n```\n'
+    assert find(text) == '{"answer": 2}'
+    assert find('```\n[1, 2]\n```', allow_arrays=True) == "[1, 2]"
+    # A fence without JSON in it is ignored.
+    assert find('```json\nnothing\n```\n{"a": 1}') == '{"a": 1}'
+
+def test_find_json_value_arrays():
+    text = 'Items [see below]: [{"a": 1}, {"a": 2}]'
+    assert find(text, allow_arrays=True) == '[{"a": 1}, {"a": 2}]'
+    assert find(text) == '{"a": 1}'
+    assert find("[ ]", allow_arrays=True) == "[ ]"
+
+def test_find_json_value_unterminated_or_missing():
+    assert find('Here: {"a": [1, 2') == '{"a": [1, 2'
+    assert find("No JSON {here}.") is None
+    assert find("") is None
+
+def test_find_json_value_lenient():
+    text = "Here are [the] results: {items: ['a',], /* none */}"
+    span = find_json_value(text, allow_arrays=True, lenient=True)
+    assert span is not None and text[span[0]:span[1]] == "{items: ['a',], /* none */}"
+    assert find_json_value("Fill in {name} and {count}.", lenient=True) is None
+    assert find(text) is None
+
+def test_scanner_skips_implausible_starts_regardless_of_chunking():
+    text = 'Fill in {name} [here] {\n  "a": [1, {"b": "}"}] } and {more}'
+    for chunk_size in (1, 2, 3, 7, len(text)):
+        assert scan(text, chunk_size) == '{\n  "a": [1, {"b": "}"}] }'
+
+def test_scanner_arrays():
+    text = 'Items [see below]: [{"a": 1}, {"a": 2}] done'
+    for chunk_size in (1, 3, len(text)):
+        scanner = IncrementalJsonScanner(allow_arrays=True)
+        for i in range(0, len(text), chunk_size):
+            if scanner.feed(text[i:i + chunk_size]):
+                break
+        assert scanner.start is not None and scanner.end is not None
+        assert text[scanner.start:scanner.end] == '[{"a": 1}, {"a": 2}]'
+        assert scanner.completed_spans == []
+
+def test_find_json_value_is_linear_in_rejected_candidates():
+    text = "{x " * 320_000 + '{"a": 1}'
+    started_at = time.perf_counter()
+    assert find(text, allow_arrays=True) == '{"a": 1}'
+    assert time.perf_counter() - started_at < 1.5
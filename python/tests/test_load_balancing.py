@@ -0,0 +1,99 @@
+import asyncio
+from typing_extensions import override
+
+import typechat
+
+class ScriptedModel(typechat.TypeChatLanguageModel):
+    "A model that responds with a series of results, repeating the last one."
+
+    results: list[typechat.Result[str]]
+    calls: int
+
+    def __init__(self, *results: typechat.Result[str]) -> None:
+        super().__init__()
+        self.results = list(results)
+        self.calls = 0
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        result = self.results[min(self.calls, len(self.results) - 1)]
+        self.calls += 1
+        await asyncio.sleep(0)
+        return result
+
+def test_fails_over_to_another_endpoint():
+    down = ScriptedModel(typechat.HttpStatusFailure("REST API error 503: Service Unavailable", 503))
+    up = ScriptedModel(typechat.Success("hello"))
+    model = typechat.LoadBalancedLanguageModel([
+        typechat.LanguageModelEndpoint(down, weight=1000),
+        typechat.LanguageModelEndpoint(up, weight=1),
+    ])
+    assert asyncio.run(model.complete("hi")) == typechat.Success("hello")
+    assert down.calls == 1 and up.calls == 1
+
+def test_client_errors_are_not_retried():
+    failure = typechat.HttpStatusFailure("REST API error 400: Bad Request", 400)
+    first, second = ScriptedModel(failure), ScriptedModel(failure)
+    model = typechat.LoadBalancedLanguageModel([
+        typechat.LanguageModelEndpoint(first),
+        typechat.LanguageModelEndpoint(second),
+    ])
+    assert asyncio.run(model.complete("hi")) == failure
+    assert first.calls + second.calls == 1
+
+def test_reports_all_failures():
+    model = typechat.LoadBalancedLanguageModel([
+        typechat.LanguageModelEndpoint(ScriptedModel(typechat.Failure("timed out")), name="east"),
+        typechat.LanguageModelEndpoint(ScriptedModel(typechat.HttpStatusFailure("REST API error 429", 429)), name="west"),
+    ])
+    result = asyncio.run(model.complete("hi"))
+    assert isinstance(result, typechat.Failure)
+    assert "east: timed out" in result.message
+    assert "west: REST API error 429" in result.message
+
+def test_ejects_failing_endpoint():
+    flaky = ScriptedModel(typechat.HttpStatusFailure("REST API error 500", 500))
+    healthy = ScriptedModel(typechat.Success("hello"))
+    model = typechat.LoadBalancedLanguageModel([
+        typechat.LanguageModelEndpoint(flaky, weight=1000),
+        typechat.LanguageModelEndpoint(healthy, weight=1),
+    ])
+    model.eject_after_failures = 2
+
+    async def run():
+        for _ in range(5):
+            assert await model.complete("hi") == typechat.Success("hello")
+
+    asyncio.run(run())
+    assert flaky.calls == 2
+    assert model.is_ejected(0) and not model.is_ejected(1)
+
+def test_least_outstanding_spreads_concurrent_requests():
+    models = [ScriptedModel(typechat.Success(str(index))) for index in range(3)]
+    model = typechat.LoadBalancedLanguageModel([typechat.LanguageModelEndpoint(m) for m in models])
+
+    async def run():
+        return await asyncio.gather(*(model.complete("hi") for _ in range(6)))
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, typechat.Success) for result in results)
+    assert [m.calls for m in models] == [2, 2, 2]
+
+def test_latency_ewma_prefers_faster_endpoint():
+    class SlowModel(ScriptedModel):
+        @override
+        async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+            await asyncio.sleep(0.02)
+            return await super().complete(prompt)
+
+    slow, fast = SlowModel(typechat.Success("slow")), ScriptedModel(typechat.Success("fast"))
+    model = typechat.LoadBalancedLanguageModel([typechat.LanguageModelEndpoint(slow), typechat.LanguageModelEndpoint(fast)])
+    model.routing = "latency_ewma"
+
+    async def run():
+        for _ in range(10):
+            await model.complete("hi")
+
+    asyncio.run(run())
+    assert slow.calls == 1
+    assert fast.calls == 9
@@ -0,0 +1,86 @@
+import asyncio
+from dataclasses import dataclass
+from typing_extensions import Literal, NotRequired, TypedDict
+
+import typechat
+from .test_translator import FixedModel
+
+class Drink(TypedDict):
+    type: Literal["Drink"]
+    size: Literal["small", "medium", "large"]
+    quantity: int
+
+class Snack(TypedDict):
+    type: Literal["Snack"]
+    name: str
+
+class Order(TypedDict):
+    items: list[Drink | Snack]
+    note: NotRequired[str]
+
+@dataclass
+class Reminder:
+    text: str
+    minutes: int | None
+
+def test_lenient_syntax():
+    repaired = typechat.LenientJsonRepair().repair(
+        "Sure! {items: [{'type': 'Snack', 'name': 'crisps',},], /* no note */}",
+        Order,
+    )
+    assert repaired == {"items": [{"type": "Snack", "name": "crisps"}]}
+
+def test_lax_coercion_and_nearest_literals():
+    repaired = typechat.LenientJsonRepair().repair(
+        '{"items": [{"type": "drink", "size": "Large", "quantity": "2"}, {"type": "Snack", "name": "nuts"}]}',
+        Order,
+    )
+    assert repaired == {"items": [{"type": "Drink", "size": "large", "quantity": 2}, {"type": "Snack", "name": "nuts"}]}
+
+def test_missing_nullable_property():
+    assert typechat.LenientJsonRepair().repair('{"text": "stretch"}', Reminder) == {"text": "stretch", "minutes": None}
+
+def test_unrepairable_responses():
+    repair = typechat.LenientJsonRepair()
+    assert repair.repair("I don't know.", Order) is None
+    assert repair.repair('{"items": [{"type": "Drink", "size": "enormous", "quantity": 1}]}', Order) is None
+    assert repair.repair('{"items": [', Order) is None
+
+def test_translator_repairs_locally_before_asking_model():
+    m = FixedModel([
+        "{'items': [{'type': 'Drink', 'size': 'Small', 'quantity': 1},]}",
+    ])
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Order), Order)
+    t.local_repair = typechat.LenientJsonRepair()
+    result = asyncio.run(t.translate("One small drink"))
+    assert result == typechat.Success({"items": [{"type": "Drink", "size": "small", "quantity": 1}]})
+    assert len(m.conversation) == 2
+    assert t.local_repair_stats == typechat.LocalRepairStats(attempts=1, successes=1)
+
+def test_translator_falls_back_to_model_repair():
+    m = FixedModel([
+        '{"items": [{"type": "Drink", "size": "huge", "quantity": 1}]}',
+        '{"items": [{"type": "Drink", "size": "large", "quantity": 1}]}',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Order), Order)
+    t.local_repair = typechat.LenientJsonRepair()
+    result = asyncio.run(t.translate("One huge drink"))
+    assert result == typechat.Success({"items": [{"type": "Drink", "size": "large", "quantity": 1}]})
+    assert len(m.conversation) == 4
+    assert t.local_repair_stats == typechat.LocalRepairStats(attempts=1, successes=0)
+
+def test_finds_the_same_value_as_the_translator():
+    repair = typechat.LenientJsonRepair()
+    assert repair.repair("Here are [the] results: {text: 'stretch', minutes: '5'}", Reminder) == {"text": "stretch", "minutes": 5}
+    assert repair.repair("Fill in {name}: {'text': 'stretch'}", Reminder) == {"text": "stretch", "minutes": None}
+    assert repair.repair("Reminders [see below]: [{text: 'stretch', minutes: 5,},]", list[Reminder]) == [{"text": "stretch", "minutes": 5}]
+
+def test_deeply_nested_responses_are_not_repaired():
+    assert typechat.LenientJsonRepair().repair('{"items": ' + "[" * 3000 + "]" * 3000 + "}", Order) is None
+
+def test_translator_fails_on_deeply_nested_response():
+    response = '{"items": ' + "[" * 3000 + "]" * 3000 + "}"
+    m = FixedModel([response, response])
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Order), Order)
+    t.local_repair = typechat.LenientJsonRepair()
+    assert isinstance(asyncio.run(t.translate("Nothing")), typechat.Failure)
@@ -1,15 +1,18 @@
 """
-Tests for HttpxLanguageModel response-size limiting (DoS hardening).
+Tests for HttpxLanguageModel (response-size limiting, rate limiting, and retries).
 
 These use httpx.MockTransport to drive HttpxLanguageModel.complete without a real endpoint.
 """
 
 import asyncio
+import json
+import time
 from collections.abc import Callable
 
 import httpx
+from typing_extensions import Any, override
 import typechat
-from typechat._internal.model import HttpxLanguageModel
+from typechat._internal.model import HttpxLanguageModel, current_deadline_var
 
 
 class _MockHttpxLanguageModel(HttpxLanguageModel):
@@ -81,3 +84,245 @@ def test_size_limit_disabled_allows_large_response():
     result = asyncio.run(model.complete("hi"))
     assert isinstance(result, typechat.Success)
     assert result.value == big_content
+
+
+def test_rate_limiter_is_consulted_with_estimated_prompt_tokens():
+    acquired: list[int] = []
+
+    class _RecordingRateLimiter(typechat.TokenBucketRateLimiter):
+        @override
+        async def acquire(self, tokens: int = 0) -> None:
+            acquired.append(tokens)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=_completion_payload("Hello!"))
+
+    model = _make_model(handler)
+    model.rate_limiter = _RecordingRateLimiter(requests_per_minute=60)
+    result = asyncio.run(model.complete("x" * 400))
+    assert isinstance(result, typechat.Success)
+    assert len(acquired) == 1
+    assert acquired[0] > 100
+
+
+def test_token_bucket_waits_once_tokens_are_exhausted():
+    # 600 tokens per minute refills at 10 tokens per second.
+    limiter = typechat.TokenBucketRateLimiter(tokens_per_minute=600)
+
+    async def run() -> float:
+        await limiter.acquire(600)
+        start = time.monotonic()
+        await limiter.acquire(1)
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.05 <= elapsed < 1.0
+
+
+def test_retry_policy_honors_retry_after_on_429():
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(503, headers={"x-ratelimit-reset-requests": "20ms"}),
+        httpx.Response(200, json=_completion_payload("Hello!")),
+    ])
+    delays: list[float | None] = []
+
+    class _RecordingRetryPolicy(typechat.ExponentialBackoffRetryPolicy):
+        @override
+        def next_delay(self, **kwargs: Any) -> float | None:
+            delay = super().next_delay(**kwargs)
+            delays.append(delay)
+            return delay
+
+    model = _make_model(lambda request: next(responses))
+    model.retry_policy = _RecordingRetryPolicy(base_delay_seconds=60)
+    result = asyncio.run(model.complete("hi"))
+    assert isinstance(result, typechat.Success)
+    assert delays == [0.0, 0.02]
+
+
+def test_retry_policy_gives_up_on_non_transient_errors():
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400)
+
+    model = _make_model(handler)
+    model.retry_policy = typechat.ExponentialBackoffRetryPolicy(base_delay_seconds=0)
+    result = asyncio.run(model.complete("hi"))
+    assert isinstance(result, typechat.Failure)
+    assert "REST API error 400" in result.message
+    assert len(calls) == 1
+
+
+def test_exponential_backoff_is_capped_and_respects_deadline():
+    policy = typechat.ExponentialBackoffRetryPolicy(max_attempts=10, base_delay_seconds=1, max_delay_seconds=4, deadline_seconds=10)
+    for attempt in range(1, 11):
+        delay = policy.next_delay(attempt=attempt, elapsed_seconds=0, status_code=500, headers=None)
+        assert delay is not None
+        assert 0 <= delay <= min(4, 2 ** (attempt - 1))
+    assert policy.next_delay(attempt=11, elapsed_seconds=0, status_code=500, headers=None) is None
+    assert policy.next_delay(attempt=1, elapsed_seconds=0, status_code=429, headers={"retry-after": "30"}) is None
+
+
+def _sse_body(*deltas: str) -> bytes:
+    events = [
+        json.dumps({"choices": [{"delta": {"content": delta}}]})
+        for delta in deltas
+    ]
+    return "".join(f"data: {event}\n\n" for event in [*events, "[DONE]"]).encode()
+
+
+def test_complete_stream_yields_deltas():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=_sse_body('{ "a":', ' 1 }', " Done!"))
+
+    model = _make_model(handler)
+
+    async def run() -> list[typechat.Result[str]]:
+        return [chunk async for chunk in model.complete_stream("hi")]
+
+    chunks = asyncio.run(run())
+    assert chunks == [typechat.Success('{ "a":'), typechat.Success(' 1 }'), typechat.Success(" Done!")]
+    assert json.loads(requests[0].content)["stream"] is True
+
+
+def test_complete_stream_reports_errors_as_failure():
+    model = _make_model(lambda request: httpx.Response(401))
+
+    async def run() -> list[typechat.Result[str]]:
+        return [chunk async for chunk in model.complete_stream("hi")]
+
+    chunks = asyncio.run(run())
+    assert len(chunks) == 1
+    assert isinstance(chunks[0], typechat.Failure)
+    assert "REST API error 401" in chunks[0].message
+
+
+def test_completion_options_are_sent():
+    bodies: list[dict[str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json=_completion_payload("{}"))
+
+    model = _make_model(handler)
+    asyncio.run(model.complete("hi"))
+    asyncio.run(model.complete("hi", options={"response_format": {"type": "json_object"}}))
+    assert "response_format" not in bodies[0]
+    assert bodies[1]["response_format"] == {"type": "json_object"}
+
+
+def test_complete_choices_requests_n_samples():
+    bodies: list[dict[str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [
+            {"message": {"role": "assistant", "content": "one"}},
+            {"message": {"role": "assistant", "content": "two"}},
+        ]})
+
+    model = _make_model(handler)
+    result = asyncio.run(model.complete_choices("hi", 2))
+    assert result == typechat.Success(["one", "two"])
+    assert bodies[0]["n"] == 2
+    assert bodies[0]["temperature"] == 1.0
+    assert asyncio.run(model.complete("hi", options={"temperature": 0.5})) == typechat.Success("one")
+    assert bodies[1]["n"] == 1
+    assert bodies[1]["temperature"] == 0.5
+
+
+def test_passed_in_client_is_shared_and_left_open():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "HEAD":
+            return httpx.Response(405)
+        return httpx.Response(200, json=_completion_payload("Hello!"))
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    first = HttpxLanguageModel(url="https://example.invalid/a", headers={}, default_params={}, client=client)
+    second = HttpxLanguageModel(url="https://example.invalid/b", headers={}, default_params={}, client=client)
+
+    async def run():
+        assert await first.warm_up() == typechat.Success(None)
+        async with first:
+            assert await first.complete("hi") == typechat.Success("Hello!")
+        assert not client.is_closed
+        assert await second.complete("hi") == typechat.Success("Hello!")
+        await client.aclose()
+
+    asyncio.run(run())
+    assert [(request.method, request.url.path) for request in requests] == [("HEAD", "/a"), ("POST", "/a"), ("POST", "/b")]
+
+
+def test_shared_clients_are_reused_per_options():
+    options = typechat.HttpClientOptions(max_connections=4, keepalive_expiry_seconds=60.0)
+
+    async def run():
+        client = typechat.get_shared_client(options)
+        assert typechat.get_shared_client(typechat.HttpClientOptions(max_connections=4, keepalive_expiry_seconds=60.0)) is client
+        assert typechat.get_shared_client() is not client
+        await typechat.close_shared_clients()
+        assert client.is_closed
+        assert typechat.get_shared_client(options) is not client
+        await typechat.close_shared_clients()
+
+    asyncio.run(run())
+
+
+def test_retries_stop_at_the_current_deadline():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    model = _make_model(handler)
+    model.retry_pause_seconds = 1.0
+
+    async def run() -> typechat.Result[str]:
+        token = current_deadline_var.set(time.monotonic() + 0.5)
+        try:
+            return await model.complete("hi")
+        finally:
+            current_deadline_var.reset(token)
+
+    started_at = time.monotonic()
+    result = asyncio.run(run())
+    assert isinstance(result, typechat.HttpStatusFailure)
+    assert calls == 1
+    assert time.monotonic() - started_at < 0.5
+
+
+def test_usage_is_reported_with_completion():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={
+            **_completion_payload("Hello!"),
+            "usage": {"prompt_tokens": 120, "completion_tokens": 7, "prompt_tokens_details": {"cached_tokens": 64}},
+        })
+
+    result = asyncio.run(_make_model(handler).complete("hi"))
+    assert result == typechat.Success("Hello!")
+    assert isinstance(result, typechat.Success) and result.usage is not None
+    assert (result.usage.prompt_tokens, result.usage.completion_tokens, result.usage.cached_prompt_tokens) == (120, 7, 64)
+    assert result.usage.total_tokens == 127
+    assert result.usage.completions == 1
+    assert result.usage.latency_seconds >= 0
+
+
+def test_missing_usage_counts_as_zero():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=_completion_payload("Hello!"))
+
+    result = asyncio.run(_make_model(handler).complete("hi"))
+    assert isinstance(result, typechat.Success) and result.usage is not None
+    assert result.usage.total_tokens == 0
+    assert result.usage.completions == 1
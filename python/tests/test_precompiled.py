@@ -0,0 +1,54 @@
+import importlib
+from pathlib import Path
+import sys
+
+import pytest
+import typechat
+from typechat.compile import main
+
+_SCHEMA_MODULE = '''
+from typing_extensions import Literal, TypedDict
+from schema_dependency import Item
+
+class Order(TypedDict):
+    type: Literal["Order"]
+    items: list[Item]
+'''
+
+_DEPENDENCY_MODULE = '''
+from typing_extensions import TypedDict
+
+class Item(TypedDict):
+    name: str
+'''
+
+@pytest.fixture
+def schema_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "precompiled_schema.py").write_text(_SCHEMA_MODULE)
+    (source_dir / "schema_dependency.py").write_text(_DEPENDENCY_MODULE)
+    monkeypatch.setattr(sys, "path", [str(source_dir), *sys.path])
+    importlib.invalidate_caches()
+    yield importlib.import_module("precompiled_schema")
+    for name in ("precompiled_schema", "schema_dependency"):
+        sys.modules.pop(name, None)
+
+def test_compiled_schema_round_trips_until_a_source_file_changes(schema_module: object, tmp_path: Path):
+    cache_dir = tmp_path / "cache"
+    order_type = getattr(schema_module, "Order")
+    assert main(["precompiled_schema:Order", "--cache-dir", str(cache_dir)]) == 0
+
+    loaded = typechat.load_compiled_schema(order_type, cache_dir)
+    assert loaded == typechat.python_type_to_typescript_schema(order_type)
+
+    dependency_path = tmp_path / "src" / "schema_dependency.py"
+    dependency_path.write_text(_DEPENDENCY_MODULE + "\n# changed\n")
+    assert typechat.load_compiled_schema(order_type, cache_dir) is None
+
+def test_missing_artifact_directory(schema_module: object, tmp_path: Path):
+    assert typechat.load_compiled_schema(getattr(schema_module, "Order"), tmp_path / "nothing-here") is None
+
+def test_compile_reports_bad_type_specs(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    assert main(["no_colon_here", "--cache-dir", str(tmp_path)]) == 1
+    assert "module:Type" in capsys.readouterr().err
@@ -0,0 +1,48 @@
+from typing_extensions import Literal, TypedDict
+
+from typechat._internal.ts_conversion.python_type_to_ts_nodes import python_type_to_typescript_nodes
+from typechat._internal.ts_conversion.schema_pruning import SchemaPruner
+from typechat import python_type_to_typescript_schema
+from .test_coffeeshop import Cart
+
+def create_pruner(py_type: type) -> SchemaPruner:
+    return SchemaPruner(python_type_to_typescript_nodes(py_type).type_declarations)
+
+def test_full_schema_matches_conversion():
+    assert create_pruner(Cart).full_schema_str == python_type_to_typescript_schema(Cart).typescript_schema_str
+
+def test_prune_keeps_mentioned_alternatives_and_their_dependencies():
+    schema = create_pruner(Cart).prune("a blueberry muffin, warmed")
+    assert "interface BakeryProduct {" in schema
+    assert "interface BakeryPreparation {" in schema
+    assert "product: BakeryProduct;" in schema
+    assert "interface LatteDrink {" not in schema
+    assert "interface EspressoDrink {" not in schema
+    # Declarations that are always reachable are kept.
+    assert "interface UnknownText {" in schema
+
+def test_prune_matches_plurals_and_literals():
+    schema = create_pruner(Cart).prune("Two cappuccinos and a mocha")
+    assert "interface LatteDrink {" in schema
+    assert "interface BakeryProduct {" not in schema
+
+def test_prune_keeps_full_schema_when_nothing_matches():
+    pruner = create_pruner(Cart)
+    assert pruner.prune("I'd like something nice") == pruner.full_schema_str
+
+class Move(TypedDict):
+    "move the piece to another square"
+    kind: Literal["move"]
+    square: str
+
+class Resign(TypedDict):
+    "give up the game"
+    kind: Literal["resign"]
+
+class Turn(TypedDict):
+    action: Move | Resign
+
+def test_prune_single_remaining_alternative():
+    schema = create_pruner(Turn).prune("I resign")
+    assert "action: Resign;" in schema
+    assert "Move" not in schema
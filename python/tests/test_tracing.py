@@ -0,0 +1,155 @@
+import asyncio
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import httpx
+from typing_extensions import override
+import pytest
+
+import typechat
+from typechat._internal.tracing import AttributeValue
+
+@dataclass
+class RecordedSpan(typechat.Span):
+    name: str
+    attributes: dict[str, AttributeValue]
+    parent: "RecordedSpan | None"
+    events: list[str] = field(default_factory=list[str])
+
+    @override
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+    @override
+    def add_event(self, name: str, attributes: Mapping[str, AttributeValue] | None = None) -> None:
+        self.events.append(name)
+
+class RecordingTracer(typechat.Tracer):
+    "Records spans in the order they were started. Only suitable for code without concurrent spans."
+
+    spans: list[RecordedSpan]
+    _open_spans: list[RecordedSpan]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.spans = []
+        self._open_spans = []
+
+    @override
+    def start_span(self, name: str, attributes: Mapping[str, AttributeValue] | None = None):
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name: str, attributes: Mapping[str, AttributeValue] | None) -> Generator[typechat.Span, None, None]:
+        span = RecordedSpan(name, dict(attributes or {}), self._open_spans[-1] if self._open_spans else None)
+        self.spans.append(span)
+        self._open_spans.append(span)
+        try:
+            yield span
+        finally:
+            self._open_spans.pop()
+
+    def named(self, name: str) -> list[RecordedSpan]:
+        return [span for span in self.spans if span.name == name]
+
+@contextmanager
+def tracing() -> Generator[RecordingTracer, None, None]:
+    tracer = RecordingTracer()
+    typechat.set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        typechat.set_tracer(None)
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+def _completion_response(content: str) -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+def test_translate_emits_nested_spans():
+    responses = iter([
+        httpx.Response(503),
+        _completion_response('{ "x": 1 }'),
+        _completion_response('{ "x": 1, "y": 2 }'),
+    ])
+    model = typechat.create_openai_language_model("key", "gpt-test", "https://example.invalid/v1/chat/completions")
+    model.retry_pause_seconds = 0.0
+    model._async_client = httpx.AsyncClient(transport=httpx.MockTransport(lambda _: next(responses)))  # pyright: ignore[reportPrivateUsage]
+
+    with tracing() as tracer:
+        translator = typechat.TypeChatJsonTranslator(model, typechat.TypeChatValidator(Point), Point)
+        result = asyncio.run(translator.translate("one two"))
+
+    assert result == typechat.Success(Point(1, 2))
+    assert [span.name for span in tracer.spans if span.name != "typechat.schema_conversion"] == [
+        "typechat.translate",
+        "typechat.translate.attempt",
+        "typechat.model.complete",
+        "typechat.model.complete",
+        "typechat.extract_json",
+        "typechat.validate_json",
+        "typechat.translate.attempt",
+        "typechat.model.complete",
+        "typechat.extract_json",
+        "typechat.validate_json",
+    ]
+
+    translate_span = tracer.named("typechat.translate")[0]
+    assert translate_span.attributes["typechat.type_name"] == "Point"
+    assert isinstance(translate_span.attributes["typechat.schema_hash"], str)
+    assert [span.attributes["typechat.attempt"] for span in tracer.named("typechat.translate.attempt")] == [1, 2]
+
+    first_request, second_request, repair_request = tracer.named("typechat.model.complete")
+    assert first_request.parent is tracer.named("typechat.translate.attempt")[0]
+    assert first_request.attributes == {"typechat.attempt": 1, "http.status_code": 503}
+    assert first_request.events == ["typechat.retry"]
+    assert second_request.attributes["typechat.attempt"] == 2
+    assert isinstance(second_request.attributes["typechat.response_bytes"], int)
+    assert repair_request.attributes["typechat.attempt"] == 1
+    assert [span.attributes["typechat.valid"] for span in tracer.named("typechat.validate_json")] == [False, True]
+
+def test_local_repair_is_recorded_as_event():
+    class FixedModel(typechat.TypeChatLanguageModel):
+        @override
+        async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+            return typechat.Success("{ x: 1, y: 2, }")
+
+    with tracing() as tracer:
+        translator = typechat.TypeChatJsonTranslator(FixedModel(), typechat.TypeChatValidator(Point), Point)
+        translator.local_repair = typechat.LenientJsonRepair()
+        assert asyncio.run(translator.translate("one two")) == typechat.Success(Point(1, 2))
+
+    assert tracer.named("typechat.translate.attempt")[0].events == ["typechat.local_repair"]
+    assert tracer.named("typechat.validate_object")[0].attributes["typechat.valid"] is True
+
+def test_no_spans_without_tracer():
+    assert typechat.get_tracer() is None
+    validator = typechat.TypeChatValidator(Point)
+    assert validator.validate_object({"x": 1, "y": 2}) == typechat.Success(Point(1, 2))
+
+def test_open_telemetry_tracer_uses_given_tracer():
+    started: list[tuple[str, Mapping[str, AttributeValue] | None]] = []
+
+    class FakeOpenTelemetryTracer:
+        @contextmanager
+        def start_as_current_span(self, name: str, attributes: Mapping[str, AttributeValue] | None = None) -> Generator[RecordedSpan, None, None]:
+            started.append((name, attributes))
+            yield RecordedSpan(name, {}, None)
+
+    tracer = typechat.OpenTelemetryTracer(FakeOpenTelemetryTracer())
+    with tracer.start_span("typechat.test", {"typechat.attempt": 1}) as span:
+        span.set_attribute("typechat.valid", True)
+    assert started == [("typechat.test", {"typechat.attempt": 1})]
+
+def test_open_telemetry_tracer_requires_package():
+    try:
+        import opentelemetry.trace  # pyright: ignore  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match="opentelemetry-api"):
+            typechat.OpenTelemetryTracer()
+    else:
+        assert isinstance(typechat.OpenTelemetryTracer(), typechat.OpenTelemetryTracer)
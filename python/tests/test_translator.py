@@ -1,7 +1,9 @@
 
 import asyncio
+import time
 from dataclasses import dataclass
-from typing_extensions import Any, Iterator, Literal, TypedDict, override
+from typing_extensions import Any, AsyncGenerator, Iterator, Literal, NotRequired, TypeAliasType, TypedDict, override
+import pytest
 import typechat
 
 class ConvoRecord(TypedDict):
@@ -93,3 +95,578 @@ def test_translator_with_single_failure_and_list_preamble_1(snapshot: Any):
     
     assert m.conversation == snapshot
 
+
+class EchoModel(typechat.TypeChatLanguageModel):
+    "A model which answers each request after a delay, tracking how many requests are in flight."
+    in_flight: int
+    max_in_flight: int
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        assert isinstance(prompt, list)
+        request = prompt[-1]["content"].split("'''")[1].strip()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Later requests finish first so that completion order differs from input order.
+        await asyncio.sleep(0.01 * (10 - int(request)))
+        self.in_flight -= 1
+        if request == "3":
+            raise RuntimeError("model exploded")
+        return typechat.Success(f'{{ "a": "{request}", "b": true, "c": {request} }}')
+
+def test_translate_many_bounds_concurrency_and_reports_indices():
+    m = EchoModel()
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+
+    async def run():
+        return [item async for item in t.translate_many(map(str, range(6)), max_concurrency=2, return_exceptions=True)]
+
+    results = asyncio.run(run())
+
+    assert m.max_in_flight == 2
+    assert sorted(index for index, _ in results) == list(range(6))
+    for index, result in results:
+        if index == 3:
+            assert result == typechat.Failure("model exploded")
+        else:
+            assert result == typechat.Success(ExampleABC(a=str(index), b=True, c=index))
+
+def test_translate_many_propagates_exceptions():
+    t = typechat.TypeChatJsonTranslator(EchoModel(), v, ExampleABC)
+
+    async def run():
+        return [item async for item in t.translate_many(["3", "4"])]
+
+    with pytest.raises(RuntimeError, match="model exploded"):
+        asyncio.run(run())
+
+class LegacyTranslator(typechat.TypeChatJsonTranslator[ExampleABC]):
+    "A translator overriding `translate` with the signature it had before timeouts were added."
+
+    @override
+    async def translate(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, input: str, *, prompt_preamble: str | list[typechat.PromptSection] | None = None
+    ) -> typechat.Result[ExampleABC]:
+        return await super().translate(input, prompt_preamble=prompt_preamble)
+
+def test_translate_many_works_with_legacy_translate_override():
+    t = LegacyTranslator(EchoModel(), v, ExampleABC)
+
+    async def run():
+        return [item async for item in t.translate_many(["1", "2"])]
+
+    results = sorted(asyncio.run(run()), key=lambda item: item[0])
+    assert results == [
+        (0, typechat.Success(ExampleABC(a="1", b=True, c=1))),
+        (1, typechat.Success(ExampleABC(a="2", b=True, c=2))),
+    ]
+
+class StreamingModel(typechat.TypeChatStreamingLanguageModel):
+    "A model which streams each of a series of responses in small pieces, recording how much of each was consumed."
+    responses: Iterator[str]
+    conversation: list[ConvoRecord]
+    chunks_sent: int
+    closed: bool
+
+    def __init__(self, responses: list[str]) -> None:
+        super().__init__()
+        self.responses = iter(responses)
+        self.conversation = []
+        self.chunks_sent = 0
+        self.closed = False
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        raise AssertionError("expected a streamed completion")
+
+    @override
+    async def complete_stream(self, prompt: str | list[typechat.PromptSection]) -> AsyncGenerator[typechat.Result[str], None]:
+        if isinstance(prompt, list):
+            prompt = prompt.copy()
+        self.conversation.append({ "kind": "CLIENT REQUEST", "payload": prompt })
+        response = next(self.responses)
+        self.chunks_sent = 0
+        self.closed = False
+        try:
+            for i in range(0, len(response), 4):
+                self.chunks_sent += 1
+                yield typechat.Success(response[i:i + 4])
+        finally:
+            self.closed = True
+
+def test_translator_stops_streaming_after_json_object():
+    response = 'Here you go: { "a": "{hello}", "b": true, "c": 1234 } I hope that helps! {"a": "unrelated"}'
+    m = StreamingModel([response])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    t.stream_completions = True
+    result = asyncio.run(t.translate("Get me stuff."))
+
+    assert result == typechat.Success(ExampleABC(a="{hello}", b=True, c=1234))
+    assert m.closed
+    assert m.chunks_sent * 4 < len(response)
+
+def test_translator_streaming_skips_braces_in_prose():
+    response = 'Here is your {result}: { "a": "x", "b": true, "c": 1 } Anything {else}?' + " padding" * 50
+    m = StreamingModel([response])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    t.stream_completions = True
+    result = asyncio.run(t.translate("Get me stuff."))
+
+    assert result == typechat.Success(ExampleABC(a="x", b=True, c=1))
+    assert m.chunks_sent * 4 < len(response)
+
+class Item(TypedDict):
+    type: Literal["Item"]
+    name: str
+
+class Cart(TypedDict):
+    type: Literal["Cart"]
+    items: list[Item]
+    note: NotRequired[str]
+
+def test_translator_abandons_stream_at_first_invalid_property():
+    invalid_response = '{ "type": "Cart", "items": [{ "type": "Item", "name": "latte" }, { "type": "Unknwn", "name": "x" }' + ", {}" * 100 + "] }"
+    m = StreamingModel([
+        invalid_response,
+        '{ "type": "Cart", "items": [{ "type": "Item", "name": "latte" }] }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Cart), Cart)
+    t.stream_completions = True
+    result = asyncio.run(t.translate("One latte."))
+
+    assert result == typechat.Success({"type": "Cart", "items": [{"type": "Item", "name": "latte"}]})
+    repair_request = m.conversation[-1]["payload"]
+    assert isinstance(repair_request, list)
+    partial_response = repair_request[-2]["content"]
+    assert '"name": "x" }' in partial_response
+    assert len(partial_response) < len(invalid_response) / 2
+    assert "Validation path `items.1.type`" in repair_request[-1]["content"]
+
+class SlowModel(typechat.TypeChatLanguageModel):
+    "A model which answers every request the same way after a short delay, counting the requests."
+    calls: int
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return typechat.Success('{ "a": "hello", "b": true, "c": 1234 }')
+
+def test_single_flight_coalesces_concurrent_identical_requests():
+    m = SlowModel()
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    t.single_flight = typechat.SingleFlight()
+
+    async def run():
+        return await asyncio.gather(
+            t.translate("Get me stuff."),
+            t.translate("Get me stuff."),
+            t.translate("Get me stuff."),
+            t.translate("Get me other stuff."),
+        )
+
+    results = asyncio.run(run())
+    assert all(result == typechat.Success(ExampleABC(a="hello", b=True, c=1234)) for result in results)
+    assert m.calls == 2
+    assert t.single_flight.coalesced_calls == 2
+    assert len(t.single_flight) == 0
+
+def test_single_flight_callers_get_their_own_results():
+    t = typechat.TypeChatJsonTranslator(SlowModel(), v, ExampleABC)
+    t.single_flight = typechat.SingleFlight()
+
+    async def translate_and_mutate():
+        result = await t.translate("Get me stuff.")
+        assert isinstance(result, typechat.Success)
+        result.value.a = "mutated"
+        return result
+
+    async def run():
+        return await asyncio.gather(translate_and_mutate(), t.translate("Get me stuff."))
+
+    mutated, other = asyncio.run(run())
+    assert mutated == typechat.Success(ExampleABC(a="mutated", b=True, c=1234))
+    assert other == typechat.Success(ExampleABC(a="hello", b=True, c=1234))
+    assert t.single_flight.coalesced_calls == 1
+
+def test_translator_sends_compact_schema():
+    m = FixedModel([
+        '{ "a": "hello", "b": true, "c": 1234 }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC, schema_options=typechat.TypeScriptEmitOptions.compact())
+    assert t.schema_str == "interface ExampleABC{a:string;b:boolean;c:number;}\n"
+    asyncio.run(t.translate("Get me stuff."))
+    prompt = m.conversation[0]["payload"]
+    assert isinstance(prompt, list) and t.schema_str in prompt[0]["content"]
+    # Translators for the same type with the default options are unaffected.
+    assert typechat.TypeChatJsonTranslator(m, v, ExampleABC).schema_str.startswith("interface ExampleABC {\n")
+
+class Move(TypedDict):
+    "move the piece to another square"
+    kind: Literal["move"]
+    square: str
+
+class Resign(TypedDict):
+    "give up the game"
+    kind: Literal["resign"]
+
+class Turn(TypedDict):
+    action: Move | Resign
+
+def test_translator_prunes_schema_and_widens_on_repair():
+    m = FixedModel([
+        '{ "action": { "kind": "quit" } }',
+        '{ "action": { "kind": "resign" } }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Turn), Turn, prune_schema=True)
+    result = asyncio.run(t.translate("I resign"))
+    assert result == typechat.Success({"action": {"kind": "resign"}})
+
+    first_prompt = m.conversation[0]["payload"]
+    repair_prompt = m.conversation[2]["payload"]
+    assert isinstance(first_prompt, list) and isinstance(repair_prompt, list)
+    assert "interface Move" not in first_prompt[0]["content"]
+    assert t.schema_str in repair_prompt[0]["content"]
+    assert "interface Move" in repair_prompt[0]["content"]
+
+class CustomPromptTranslator(typechat.TypeChatJsonTranslator[Turn]):
+    @override
+    def _create_request_prompt(self, intent: str) -> str:
+        return f"Custom prompt for: {intent}"
+
+def test_pruning_works_with_overridden_request_prompt():
+    m = FixedModel(['{ "action": { "kind": "resign" } }'])
+    t = CustomPromptTranslator(m, typechat.TypeChatValidator(Turn), Turn, prune_schema=True)
+    assert asyncio.run(t.translate("I resign")) == typechat.Success({"action": {"kind": "resign"}})
+    first_prompt = m.conversation[0]["payload"]
+    assert isinstance(first_prompt, list) and first_prompt[0]["content"] == "Custom prompt for: I resign"
+
+def test_prefix_layout_keeps_request_at_the_tail():
+    m = FixedModel([
+        '{ "a": "hello", "b": true, "c": 1234 }',
+        '{ "a": "bye", "b": false, "c": 0 }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    t.prompt_layout = "prefix"
+
+    async def run():
+        await t.translate("Get me stuff.", prompt_preamble="Be helpful.")
+        await t.translate("Get me other stuff.")
+
+    asyncio.run(run())
+    first_prompt = m.conversation[0]["payload"]
+    second_prompt = m.conversation[2]["payload"]
+    assert isinstance(first_prompt, list) and isinstance(second_prompt, list)
+    assert [section["role"] for section in first_prompt] == ["system", "user", "user"]
+    assert first_prompt[0] == second_prompt[0]
+    assert t.schema_str in first_prompt[0]["content"]
+    assert "Get me stuff." not in first_prompt[0]["content"]
+    assert first_prompt[1]["content"] == "Be helpful."
+    assert "Get me stuff." in first_prompt[2]["content"]
+    assert "Get me other stuff." in second_prompt[-1]["content"]
+
+def test_prompt_prefix_hash_depends_on_schema():
+    t1 = typechat.TypeChatJsonTranslator(FixedModel([]), v, ExampleABC)
+    t2 = typechat.TypeChatJsonTranslator(FixedModel([]), v, ExampleABC)
+    t3 = typechat.TypeChatJsonTranslator(FixedModel([]), typechat.TypeChatValidator(Turn), Turn)
+    assert t1.prompt_prefix_hash == t2.prompt_prefix_hash
+    assert t1.prompt_prefix_hash != t3.prompt_prefix_hash
+
+def test_translator_extracts_json_from_prose():
+    m = FixedModel([
+        'Here is {your} result:\n```json\n{ "a": "{hello}", "b": true, "c": 1234 }\n```\nLet me know {if} that helps.',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    assert asyncio.run(t.translate("Get me stuff.")) == typechat.Success(ExampleABC(a="{hello}", b=True, c=1234))
+
+Items = TypeAliasType("Items", list[Item])
+
+def test_translator_extracts_top_level_array():
+    m = FixedModel([
+        'The items [in order]: [{ "type": "Item", "name": "apple" }, { "type": "Item", "name": "pear" }]',
+    ])
+    t = typechat.TypeChatJsonTranslator[list[Item]](m, typechat.TypeChatValidator(Items), Items)  # type: ignore
+    result = asyncio.run(t.translate("An apple and a pear"))
+    assert result == typechat.Success([{"type": "Item", "name": "apple"}, {"type": "Item", "name": "pear"}])
+
+def test_translator_streams_top_level_array():
+    response = 'The items [in order]: [{ "type": "Item", "name": "apple" }, { "type": "Item", "name": "pear" }]' + " padding" * 50
+    m = StreamingModel([response])
+    t = typechat.TypeChatJsonTranslator[list[Item]](m, typechat.TypeChatValidator(Items), Items)  # type: ignore
+    t.stream_completions = True
+    result = asyncio.run(t.translate("An apple and a pear"))
+
+    assert result == typechat.Success([{"type": "Item", "name": "apple"}, {"type": "Item", "name": "pear"}])
+    assert m.chunks_sent * 4 < len(response)
+
+class OptionsModel(typechat.TypeChatLanguageModel):
+    "A model that accepts completion options, and records them."
+
+    options: list[typechat.CompletionOptions | None]
+    prompts: list[str | list[typechat.PromptSection]]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.options = []
+        self.prompts = []
+
+    @override
+    async def complete(
+        self,
+        prompt: str | list[typechat.PromptSection],
+        *,
+        options: typechat.CompletionOptions | None = None,
+    ) -> typechat.Result[str]:
+        self.options.append(options)
+        self.prompts.append(prompt)
+        return typechat.Success('{ "action": { "kind": "move", "square": "e4" } }')
+
+def test_translator_requests_json_schema_response_format():
+    m = OptionsModel()
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Turn), Turn)
+    t.response_format = "json_schema"
+    result = asyncio.run(t.translate("Pawn to e4"))
+    assert result == typechat.Success({"action": {"kind": "move", "square": "e4"}})
+
+    options = m.options[0]
+    assert options is not None and "response_format" in options
+    response_format = options["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["name"] == "Turn"
+    assert response_format["json_schema"]["strict"] is True
+    schema = response_format["json_schema"]["schema"]
+    assert schema["additionalProperties"] is False
+    assert schema["$defs"]["Move"]["additionalProperties"] is False
+    # The TypeScript schema isn't needed in the prompt.
+    assert "interface" not in str(m.prompts[0])
+
+def test_translator_builds_json_schema_response_format_once():
+    m = OptionsModel()
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Turn), Turn)
+    t.response_format = "json_schema"
+    asyncio.run(t.translate("Pawn to e4"))
+    asyncio.run(t.translate("Pawn to d4"))
+    assert m.options[0] is m.options[1]
+
+def test_translator_json_schema_not_strict_with_optional_properties():
+    m = OptionsModel()
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Cart), Cart)
+    t.response_format = "json_schema"
+    asyncio.run(t.translate("Nothing"))
+    options = m.options[0]
+    assert options is not None and "response_format" in options
+    assert options["response_format"]["json_schema"]["strict"] is False
+
+class Inventory(TypedDict):
+    counts: dict[str, int]
+
+def test_translator_json_schema_not_strict_with_dict_properties():
+    m = OptionsModel()
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Inventory), Inventory)
+    t.response_format = "json_schema"
+    asyncio.run(t.translate("Nothing"))
+    options = m.options[0]
+    assert options is not None and "response_format" in options
+    json_schema = options["response_format"]["json_schema"]
+    assert json_schema["schema"]["properties"]["counts"]["additionalProperties"] == {"type": "integer"}
+    assert json_schema["strict"] is False
+
+def test_translator_text_response_format_sends_no_options():
+    m = OptionsModel()
+    t = typechat.TypeChatJsonTranslator(m, typechat.TypeChatValidator(Turn), Turn)
+    asyncio.run(t.translate("Pawn to e4"))
+    t.response_format = "json_object"
+    asyncio.run(t.translate("Pawn to e4"))
+    assert m.options == [None, {"response_format": {"type": "json_object"}}]
+
+class MultiChoiceModel(typechat.TypeChatMultiChoiceLanguageModel):
+    choices: list[str]
+    requested: list[int]
+
+    def __init__(self, choices: list[str]) -> None:
+        super().__init__()
+        self.choices = choices
+        self.requested = []
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        raise AssertionError("Expected complete_choices to be used.")
+
+    @override
+    async def complete_choices(
+        self,
+        prompt: str | list[typechat.PromptSection],
+        n: int,
+        *,
+        options: typechat.CompletionOptions | None = None,
+    ) -> typechat.Result[list[str]]:
+        self.requested.append(n)
+        return typechat.Success(self.choices[:n])
+
+def test_speculative_sampling_uses_first_valid_choice():
+    m = MultiChoiceModel([
+        '{ "a": "hello", "b": true }',
+        '{ "a": "second", "b": true, "c": 2 }',
+        '{ "a": "third", "b": true, "c": 3 }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    t.speculative_samples = 3
+    assert asyncio.run(t.translate("Get me stuff.")) == typechat.Success(ExampleABC(a="second", b=True, c=2))
+    assert m.requested == [3]
+
+class TemperatureModel(typechat.TypeChatLanguageModel):
+    "A model whose completions are valid only at some temperatures, and arrive faster at higher ones."
+
+    temperatures: list[float]
+    cancelled: int
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.temperatures = []
+        self.cancelled = 0
+
+    @override
+    async def complete(
+        self,
+        prompt: str | list[typechat.PromptSection],
+        *,
+        options: typechat.CompletionOptions | None = None,
+    ) -> typechat.Result[str]:
+        temperature = options.get("temperature", 0.0) if options else 0.0
+        self.temperatures.append(temperature)
+        try:
+            await asyncio.sleep(0.05 * (1 - temperature))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if temperature < 0.5:
+            return typechat.Success(f'{{ "a": "{temperature}", "b": true, "c": 1 }}')
+        return typechat.Success("Sorry.")
+
+def test_speculative_sampling_in_parallel_cancels_the_rest():
+    m = TemperatureModel()
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    t.speculative_samples = 3
+    t.speculative_temperature_step = 0.3
+    result = asyncio.run(t.translate("Get me stuff."))
+    # The sample at 0.6 arrives first but is invalid, so the one at 0.3 wins.
+    assert result == typechat.Success(ExampleABC(a="0.3", b=True, c=1))
+    assert sorted(m.temperatures) == [0.0, 0.3, 0.6]
+    assert m.cancelled == 1
+
+class DeadlineModel(typechat.TypeChatLanguageModel):
+    "A model that takes a while to respond, recording the deadline it was given and whether it was cancelled."
+
+    delay_seconds: float
+    deadlines: list[float | None]
+    cancelled: bool
+
+    def __init__(self, delay_seconds: float) -> None:
+        super().__init__()
+        self.delay_seconds = delay_seconds
+        self.deadlines = []
+        self.cancelled = False
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        self.deadlines.append(typechat.current_deadline())
+        try:
+            await asyncio.sleep(self.delay_seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return typechat.Success('{ "a": "hello", "b": true, "c": 1234 }')
+
+def test_translate_timeout_cancels_the_model_call():
+    m = DeadlineModel(10.0)
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    result = asyncio.run(t.translate("Get me stuff.", timeout_seconds=0.01))
+    assert isinstance(result, typechat.Failure)
+    assert "deadline" in result.message
+    assert m.cancelled
+    assert m.deadlines[0] is not None
+    assert typechat.current_deadline() is None
+
+def test_single_flight_callers_keep_their_own_deadlines():
+    m = DeadlineModel(0.1)
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    t.single_flight = typechat.SingleFlight()
+
+    async def run():
+        return await asyncio.gather(
+            t.translate("Get me stuff.", timeout_seconds=0.02),
+            t.translate("Get me stuff."),
+        )
+
+    hurried, patient = asyncio.run(run())
+    assert isinstance(hurried, typechat.Failure) and "deadline" in hurried.message
+    assert patient == typechat.Success(ExampleABC(a="hello", b=True, c=1234))
+    assert m.deadlines == [None]
+    assert not m.cancelled
+    assert t.single_flight.coalesced_calls == 1
+
+def test_translate_within_deadline_passes_it_to_the_model():
+    m = DeadlineModel(0.0)
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+
+    async def run() -> typechat.Result[ExampleABC]:
+        deadline = time.monotonic() + 5.0
+        result = await t.translate("Get me stuff.", deadline=deadline, timeout_seconds=60.0)
+        assert m.deadlines == [deadline]
+        return result
+
+    assert asyncio.run(run()) == typechat.Success(ExampleABC("hello", True, 1234))
+    assert asyncio.run(t.translate("Get me stuff.")) == typechat.Success(ExampleABC("hello", True, 1234))
+    assert m.deadlines[-1] is None
+
+class UsageModel(FixedModel):
+    "A model that reports the same usage with every response."
+
+    @override
+    async def complete(self, prompt: str | list[typechat.PromptSection]) -> typechat.Result[str]:
+        result = await super().complete(prompt)
+        assert isinstance(result, typechat.Success)
+        return typechat.Success(result.value, usage=typechat.CompletionUsage(100, 10, 50, 0.5, 1))
+
+def test_translator_adds_up_usage_across_repairs():
+    m = UsageModel([
+        '{ "a": "hello", "b": true }',
+        '{ "a": "hello", "b": true, "c": 1234 }',
+        '{ "a": "hello", "b": true, "c": 1234 }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    result = asyncio.run(t.translate("Get me stuff."))
+    assert isinstance(result, typechat.Success)
+    assert result.usage == typechat.CompletionUsage(200, 20, 100, 1.0, 2)
+
+    asyncio.run(t.translate("Get me stuff."))
+    assert t.usage_stats == typechat.CompletionUsage(300, 30, 150, 1.5, 3)
+
+def test_translator_without_usage_reports_none():
+    m = FixedModel(['{ "a": "hello", "b": true, "c": 1234 }'])
+    t = typechat.TypeChatJsonTranslator(m, v, ExampleABC)
+    result = asyncio.run(t.translate("Get me stuff."))
+    assert isinstance(result, typechat.Success) and result.usage is None
+    assert t.usage_stats == typechat.CompletionUsage()
+
+class RejectingValidator(typechat.TypeChatValidator[ExampleABC]):
+    @override
+    def validate_object(self, obj: object) -> typechat.Result[ExampleABC]:
+        return typechat.Failure("Rejected by a custom rule.")
+
+def test_translator_uses_overridden_validate_object():
+    m = FixedModel([
+        '{ "a": "hello", "b": true, "c": 1234 }',
+        '{ "a": "hello", "b": true, "c": 1234 }',
+    ])
+    t = typechat.TypeChatJsonTranslator(m, RejectingValidator(ExampleABC), ExampleABC)
+    assert asyncio.run(t.translate("Get me stuff.")) == typechat.Failure("Rejected by a custom rule.")
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+import gc
+import weakref
+from typing_extensions import TypedDict
+
+import typechat
+from typechat._internal.type_cache import TypeCache
+from .test_translator import FixedModel
+
+@dataclass
+class Cached:
+    a: str
+
+def test_validators_and_schemas_are_shared_between_instances():
+    typechat.clear_type_caches(Cached)
+    before = {name: (stats.hits, stats.misses) for name, stats in typechat.type_cache_stats().items()}
+
+    translators = [
+        typechat.TypeChatJsonTranslator(FixedModel([]), typechat.TypeChatValidator(Cached), Cached)
+        for _ in range(3)
+    ]
+    assert translators[0].schema_str is translators[2].schema_str
+
+    after = typechat.type_cache_stats()
+    for name in ("validators", "typescript_schemas"):
+        hits, misses = before[name]
+        assert (after[name].hits - hits, after[name].misses - misses) == (2, 1)
+
+def test_type_cache_invalidation_and_uncacheable_types():
+    cache = TypeCache[int]("test")
+    created: list[object] = []
+
+    def create(py_type: object) -> int:
+        created.append(py_type)
+        return len(created)
+
+    assert cache.get_or_create(Cached, "options", lambda: create(Cached)) == 1
+    assert cache.get_or_create(Cached, "options", lambda: create(Cached)) == 1
+    assert cache.get_or_create(Cached, "other options", lambda: create(Cached)) == 2
+    cache.invalidate(Cached)
+    assert cache.get_or_create(Cached, "options", lambda: create(Cached)) == 3
+
+    # `X | Y` unions can't be weakly referenced, so they are recreated each time.
+    assert cache.get_or_create(Cached | None, None, lambda: create(Cached | None)) == 4
+    assert cache.get_or_create(Cached | None, None, lambda: create(Cached | None)) == 5
+    assert (cache.stats.hits, cache.stats.misses) == (1, 5)
+
+def test_cached_types_can_be_collected():
+    cache = TypeCache[object]("test", max_entries=1)
+
+    # A value that doesn't reference its type doesn't keep it alive.
+    Plain = type("Plain", (), {})
+    cache.get_or_create(Plain, None, lambda: "value")
+    plain_ref = weakref.ref(Plain)
+    del Plain
+    gc.collect()
+    assert plain_ref() is None
+    assert len(cache) == 0
+
+    # A value that does is kept until it is evicted.
+    First = type("First", (), {})
+    cache.get_or_create(First, None, lambda: First)
+    first_ref = weakref.ref(First)
+    del First
+    gc.collect()
+    assert first_ref() is not None
+    Second = type("Second", (), {})
+    cache.get_or_create(Second, None, lambda: Second)
+    gc.collect()
+    assert first_ref() is None
+    assert len(cache) == 1
+
+def test_runtime_typed_dicts_can_be_collected_after_clearing():
+    Tenant = TypedDict("Tenant", {"name": str})
+    validator = typechat.TypeChatValidator(Tenant)
+    assert validator.validate_object({"name": "a"}) == typechat.Success({"name": "a"})
+    tenant_ref = weakref.ref(Tenant)
+    del Tenant, validator
+    typechat.clear_type_caches(tenant_ref())
+    gc.collect()
+    assert tenant_ref() is None
@@ -1,5 +1,10 @@
 
 from dataclasses import dataclass
+import datetime
+import json
+from decimal import Decimal
+import uuid
+from typing_extensions import Any, override
 import typechat
 
 @dataclass
@@ -13,4 +18,90 @@ v = typechat.TypeChatValidator(Example)
 def test_dict_valid_as_dataclass():
     r = v.validate_object({"a": "hello!", "b": 42, "c": True})
     assert r == typechat.Success(Example(a="hello!", b=42, c=True))
-    
\ No newline at end of file
+    
+@dataclass
+class Container:
+    name: str
+    examples: list[Example]
+
+def test_validate_property_json():
+    v = typechat.TypeChatValidator(Container)
+    assert v.validate_property_json("name", '"box"') is None
+    assert v.validate_property_json("examples", '{"a": "hello!", "b": 42, "c": true}', element_index=0) is None
+    assert v.validate_property_json("undeclared", '"anything"') is None
+
+    failure = v.validate_property_json("examples", '{"a": "hello!", "b": "42", "c": true}', element_index=3)
+    assert failure is not None
+    assert failure.message.startswith("Validation path `examples.3.b` failed")
+
+def test_validate_json_text():
+    r = v.validate_json_text('{"a": "hello!", "b": 42, "c": true}')
+    assert r == typechat.Success(Example(a="hello!", b=42, c=True))
+
+def test_validate_json_text_reports_parse_errors():
+    r = v.validate_json_text('{"a": "hello!" "b": 42}')
+    assert isinstance(r, typechat.Failure)
+    assert r.message.startswith("Error: expected `,` or `}` at line 1 column 16\n\nAttempted to parse:")
+
+@dataclass
+class Point:
+    coordinates: tuple[float, float]
+    label: str
+
+def test_object_validation_is_as_strict_as_json():
+    p = typechat.TypeChatValidator(Point)
+    assert p.validate_object({"coordinates": [1, 2.5], "label": "x"}) == typechat.Success(Point((1, 2.5), "x"))
+    assert isinstance(p.validate_object({"coordinates": ["1", 2.5], "label": "x"}), typechat.Failure)
+    assert isinstance(p.validate_object({"coordinates": [float("nan"), 2.5], "label": "x"}), typechat.Failure)
+    assert isinstance(v.validate_object({"a": "hello!", "b": 42, "c": 1}), typechat.Failure)
+
+@dataclass
+class Appointment:
+    starts_at: datetime.datetime
+    day: datetime.date
+    duration: datetime.timedelta
+    id: uuid.UUID
+    price: Decimal
+
+def test_encoded_values_are_validated_as_json():
+    a = typechat.TypeChatValidator(Appointment)
+    data = {
+        "starts_at": "2024-05-01T09:30:00",
+        "day": "2024-05-01",
+        "duration": "PT30M",
+        "id": "12345678-1234-5678-1234-567812345678",
+        "price": 9.5,
+    }
+    expected = typechat.Success(Appointment(
+        datetime.datetime(2024, 5, 1, 9, 30),
+        datetime.date(2024, 5, 1),
+        datetime.timedelta(minutes=30),
+        uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        Decimal("9.5"),
+    ))
+    assert a.validate_object(data) == expected
+    assert a.validate_json_text(json.dumps(data)) == expected
+    for name, value in [("starts_at", 0), ("starts_at", "2024-05-01"), ("day", 0), ("duration", 1800), ("id", 1)]:
+        invalid = {**data, name: value}
+        object_result = a.validate_object(invalid)
+        assert isinstance(object_result, typechat.Failure)
+        assert object_result.message.startswith(f"Validation path `{name}` failed")
+        assert object_result == a.validate_json_text(json.dumps(invalid))
+
+def test_non_finite_numbers_are_not_json():
+    d = typechat.TypeChatValidator(dict[str, Any])
+    for text in ('{"a": NaN}', '{"a": -Infinity}', b'{"a": Infinity}'):
+        r = d.validate_json_text(text)
+        assert isinstance(r, typechat.Failure) and r.message.startswith("Error: ") and "Attempted to parse" in r.message
+    assert d.validate_json_text('{"NaN": "Infinity"}') == typechat.Success({"NaN": "Infinity"})
+
+class RejectingValidator(typechat.TypeChatValidator[Example]):
+    @override
+    def validate_object(self, obj: object) -> typechat.Result[Example]:
+        return typechat.Failure("Rejected by a custom rule.")
+
+def test_validate_json_text_uses_overridden_validate_object():
+    validator = RejectingValidator(Example)
+    assert validator.validate_json_text('{"a": "hello!", "b": 42, "c": true}') == typechat.Failure("Rejected by a custom rule.")
+    r = validator.validate_json_text('{"a": ')
+    assert isinstance(r, typechat.Failure) and "Attempted to parse" in r.message